@@ -12,6 +12,39 @@
 #define LED_SENDER       12  // externer Sender-Indikator
 #define LED_RECEIVER     13  // externer Receiver-Indikator
 
+// Binärprotokoll (Gegenstück: communication/binary_protocol.py)
+#define FRAME_SYNC       0xA5
+#define FRAME_VERSION    1
+#define FLAG_ENGINE      0x01
+#define FLAG_GAS         0x02
+#define KIND_CAN         0x10
+
+struct __attribute__((packed)) StatusFrame {
+  uint8_t  sync;
+  uint8_t  version;
+  uint8_t  seq;
+  uint8_t  flags;
+  uint32_t millis;
+  uint16_t rpm;
+  uint16_t speed;
+  uint8_t  gear;
+  uint8_t  throttle;
+  uint8_t  status;
+  uint16_t crc;      // CRC-16/CCITT-FALSE über version..status
+};
+
+// Weitergeleiteter CAN-Frame vom Receiver (CAN1)
+struct __attribute__((packed)) CanFrame {
+  uint8_t  sync;
+  uint8_t  kind;     // KIND_CAN statt Version
+  uint16_t can_id;
+  uint8_t  dlc;
+  uint8_t  data[8];
+  uint16_t crc;      // CRC-16/CCITT-FALSE über kind..data
+};
+
+const char* const STATUS_TEXT[] = {"OK", "SHIFT_UP", "SHIFT_DOWN", "HIGH", "REDLINE"};
+
 MCP_CAN CAN0(SENDER_CS_PIN);
 MCP_CAN CAN1(RECEIVER_CS_PIN);
 
@@ -25,6 +58,10 @@ int throttle = 0;
 bool gas_pressed = false;
 bool brake_pressed = false;
 
+// Protokoll
+bool binary_mode = false;
+uint8_t frame_seq = 0;
+
 // Timing
 unsigned long last_rpm_update  = 0;
 unsigned long last_status_send = 0;
@@ -60,14 +97,17 @@ void loop() {
 
   processCommands();
 
+  // CAN-Empfang im Binärmodus an den Host weiterreichen
+  if (binary_mode) forwardCan();
+
   // RPM-Updates alle 20 ms
   if (now - last_rpm_update >= 20) {
     updateRPM();
     last_rpm_update = now;
   }
 
-  // Status alle 100 ms
-  if (now - last_status_send >= 100) {
+  // Status alle 100 ms (binär alle 10 ms)
+  if (now - last_status_send >= (binary_mode ? 10 : 100)) {
     sendStatus();
     last_status_send = now;
   }
@@ -78,7 +118,7 @@ void loop() {
     Serial.println(">>> Gas losgelassen (Timeout)");
   }
 
-  delay(10);
+  delay(binary_mode ? 2 : 10);
 }
 
 void processCommands() {
@@ -91,6 +131,8 @@ void processCommands() {
     else if (cmd == "BRAKE")     handleBrake();
     else if (cmd == "SHIFT_UP")  shiftUp();
     else if (cmd == "SHIFT_DOWN")shiftDown();
+    else if (cmd == "PROTO_BINARY") { binary_mode = true;  Serial.println("PROTO:BINARY:1"); }
+    else if (cmd == "PROTO_TEXT")   { binary_mode = false; Serial.println("PROTO:TEXT"); }
   }
 }
 
@@ -174,14 +216,62 @@ void updateRPM() {
   if (!gas_pressed) throttle = max(0, throttle - 5);
 }
 
+uint8_t rpmStatusCode() {
+  if (rpm > 6500) return 4;                           // REDLINE
+  if (rpm > 5000) return 3;                           // HIGH
+  if (gear < 5 && rpm > (2000 + gear * 800)) return 1; // SHIFT_UP
+  return 0;                                           // OK
+}
+
+uint16_t crc16(const uint8_t* data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++)
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+  }
+  return crc;
+}
+
+void sendStatusFrame() {
+  StatusFrame f;
+  f.sync     = FRAME_SYNC;
+  f.version  = FRAME_VERSION;
+  f.seq      = frame_seq++;
+  f.flags    = (engine_on ? FLAG_ENGINE : 0) | (gas_pressed ? FLAG_GAS : 0);
+  f.millis   = millis();
+  f.rpm      = rpm;
+  f.speed    = speed;
+  f.gear     = gear;
+  f.throttle = throttle;
+  f.status   = rpmStatusCode();
+  f.crc      = crc16((const uint8_t*)&f + 1, sizeof(f) - 3);
+  Serial.write((const uint8_t*)&f, sizeof(f));
+}
+
+void forwardCan() {
+  while (CAN1.checkReceive() == CAN_MSGAVAIL) {
+    unsigned long id; byte len; byte buf[8];
+    if (CAN1.readMsgBuf(&id, &len, buf) != CAN_OK) return;
+    CanFrame f;
+    f.sync   = FRAME_SYNC;
+    f.kind   = KIND_CAN;
+    f.can_id = id & 0x7FF;
+    f.dlc    = min(len, (byte)8);
+    memset(f.data, 0, sizeof(f.data));
+    memcpy(f.data, buf, f.dlc);
+    f.crc    = crc16((const uint8_t*)&f + 1, sizeof(f) - 3);
+    Serial.write((const uint8_t*)&f, sizeof(f));
+  }
+}
+
 void sendStatus() {
-  Serial.println("ENGINE_RUNNING:" + String(engine_on ? "1":"0"));
-  Serial.println("RPM:" + String(rpm));
-  Serial.println("SPEED:" + String(speed));
-  Serial.println("GEAR:" + String(gear));
-  Serial.println("THROTTLE:" + String(throttle));
-  String rs="OK"; if(rpm>6500) rs="REDLINE"; else if(rpm>5000) rs="HIGH";
-  else if(gear<5&&rpm>(2000+gear*800)) rs="SHIFT_UP";
-  Serial.println("RPM_STATUS:" + rs);
+  if (binary_mode) { sendStatusFrame(); return; }
+  Serial.print(F("ENGINE_RUNNING:")); Serial.println(engine_on ? 1 : 0);
+  Serial.print(F("RPM:"));            Serial.println(rpm);
+  Serial.print(F("SPEED:"));          Serial.println(speed);
+  Serial.print(F("GEAR:"));           Serial.println(gear);
+  Serial.print(F("THROTTLE:"));       Serial.println(throttle);
+  Serial.print(F("RPM_STATUS:"));     Serial.println(STATUS_TEXT[rpmStatusCode()]);
   Serial.println();
 }
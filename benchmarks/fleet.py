@@ -0,0 +1,59 @@
+"""
+Benchmark: Flotten-Simulation
+Fahrzeug-Schritte pro Millisekunde ohne Eingaben und mit zufälligen Befehlen in jedem Schritt
+"""
+
+from benchmarks.measure import best_rate, result, skipped
+
+# Ziel für den reinen Takt: 100k Fahrzeug-Schritte/ms auf einem Kern. Mit Befehlen
+# kommt je Befehl ein voller Durchlauf über alle Fahrzeuge dazu - dort nur Baseline-Vergleich
+BUDGET_STEPS_PER_MS = 100_000
+# Anteil der Fahrzeuge mit Gas, Bremse, Hoch-, Runterschalten je Schritt
+INPUT_RATES = (0.4, 0.05, 0.03, 0.02)
+# Vorberechnete Eingabesätze - der Zufallsgenerator gehört nicht in die Messung
+INPUT_SETS = 8
+
+
+def _fleet(count):
+    import numpy as np
+    from simulator.fleet import FleetSimulator
+    fleet = FleetSimulator(count)
+    fleet.toggle_engine(np.ones(count, dtype=bool))
+    return fleet
+
+
+def bench_idle(count, steps, repeat):
+    fleet = _fleet(count)
+
+    def run():
+        for _ in range(steps):
+            fleet.step()
+    rate = best_rate(run, count * steps, repeat) / 1000.0
+    return result(rate, "Fahrzeug-Schritte/ms", budget=BUDGET_STEPS_PER_MS, vehicles=count)
+
+
+def bench_inputs(count, steps, repeat):
+    import numpy as np
+    rng = np.random.default_rng(0)
+    inputs = [[rng.random(count) < p for p in INPUT_RATES] for _ in range(INPUT_SETS)]
+    fleet = _fleet(count)
+
+    def run():
+        for i in range(steps):
+            fleet.step(*inputs[i % INPUT_SETS])
+    rate = best_rate(run, count * steps, repeat) / 1000.0
+    return result(rate, "Fahrzeug-Schritte/ms", vehicles=count, input_rates=list(INPUT_RATES))
+
+
+def run(quick=False):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return {'fleet': skipped("NumPy nicht installiert")}
+    repeat = 3 if quick else 5
+    count = 200_000 if quick else 1_000_000
+    steps = 10 if quick else 50
+    return {
+        'fleet.idle': bench_idle(count, steps, repeat),
+        'fleet.inputs': bench_inputs(count, steps, repeat),
+    }
@@ -0,0 +1,127 @@
+"""
+Mess-Hilfen für die Benchmarks
+Zeitmessung (Bestwert aus mehreren Durchläufen), Ergebnisformat und Baseline-Vergleich
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+
+# Ergebnis-Format - bei inkompatiblen Änderungen hochzählen
+SCHEMA = 1
+
+
+def result(value, unit, higher_is_better=True, **extra):
+    """Ein Messwert mit Einheit und Richtung (für den Baseline-Vergleich)"""
+    entry = {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+    entry.update(extra)
+    return entry
+
+
+def skipped(reason):
+    return {'skipped': reason}
+
+
+def best_rate(func, items, repeat=5):
+    """Führt func() repeat-mal aus -> bester Durchsatz in items/s
+
+    Der schnellste Lauf ist der am wenigsten gestörte (GC, andere Prozesse).
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return items / best if best else float('inf')
+
+
+def environment():
+    """Rahmenbedingungen - Vergleiche sind nur auf derselben Maschine aussagekräftig"""
+    info = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    try:
+        import numpy
+        info['numpy'] = numpy.__version__
+    except ImportError:
+        info['numpy'] = None
+    return info
+
+
+def save(path, results):
+    document = {'schema': SCHEMA, 'environment': environment(), 'results': results}
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+
+def load(path):
+    with open(path) as f:
+        document = json.load(f)
+    if document.get('schema') != SCHEMA:
+        raise ValueError(f"{path}: Schema {document.get('schema')}, erwartet {SCHEMA}")
+    return document
+
+
+def compare(results, baseline, tolerance=0.10):
+    """Vergleicht mit einer Baseline -> Liste (name, baseline, aktuell, änderung, regression)
+
+    änderung > 0 heißt besser, egal ob der Wert steigen oder fallen soll.
+    """
+    rows = []
+    for name in sorted(results):
+        current, base = results[name], baseline.get(name)
+        if not base or 'value' not in current or 'value' not in base:
+            continue
+        if not base['value'] or not current['value']:
+            continue
+        ratio = current['value'] / base['value']
+        if not current.get('higher_is_better', True):
+            ratio = 1.0 / ratio
+        change = ratio - 1.0
+        rows.append((name, base['value'], current['value'], change, change < -tolerance))
+    return rows
+
+
+def over_budget(results):
+    """Messwerte mit Budget, die es reißen -> Liste (name, wert, budget)"""
+    rows = []
+    for name in sorted(results):
+        entry = results[name]
+        budget = entry.get('budget')
+        if budget is None or 'value' not in entry:
+            continue
+        exceeded = entry['value'] < budget if entry['higher_is_better'] else entry['value'] > budget
+        if exceeded:
+            rows.append((name, entry['value'], budget))
+    return rows
+
+
+def print_results(results, out=sys.stdout):
+    width = max(map(len, results), default=0)
+    for name in sorted(results):
+        entry = results[name]
+        if 'skipped' in entry:
+            print(f"{name:<{width}}  übersprungen: {entry['skipped']}", file=out)
+        else:
+            budget = f"  (Budget {entry['budget']:g})" if 'budget' in entry else ""
+            print(f"{name:<{width}}  {entry['value']:>14,.3f} {entry['unit']}{budget}", file=out)
+
+
+def print_comparison(rows, out=sys.stdout):
+    if not rows:
+        print("Keine vergleichbaren Messwerte in der Baseline", file=out)
+        return
+    width = max(len(row[0]) for row in rows)
+    for name, base, current, change, regression in rows:
+        mark = "  REGRESSION" if regression else ""
+        print(f"{name:<{width}}  {base:>14,.1f} -> {current:>14,.1f}  {change:+7.1%}{mark}", file=out)
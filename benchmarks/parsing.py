@@ -0,0 +1,136 @@
+"""
+Benchmark: Empfangsseite ohne I/O
+Zeilen/s durch Vehicle.update_from_data und den StreamDecoder (Text, Binär, OBD-II)
+"""
+
+from benchmarks.measure import best_rate, result, skipped
+from communication.stream_decoder import StreamDecoder
+from models.vehicle import Vehicle
+from simulator.vehicle_simulator import VehicleSimulator
+
+# Größe eines seriellen read() bei 115200 Baud und vollem Puffer
+CHUNK_SIZE = 64
+
+# Weitergeleitete OBD-II-Antworten: mindestens so viele Frames/s aus dem Puffer dekodieren
+BUDGET_OBD_FRAMES_PER_S = 1_000_000
+
+
+def drive_blocks(count, binary=False):
+    """Deterministische Status-Blöcke einer Fahrt (Gas, Schalten, Bremsen) wie sendStatus()
+
+    Gibt eine Liste mit den Bytes je Block zurück - ohne die übrigen Log-Zeilen.
+    """
+    sim = VehicleSimulator()
+    sim.binary_mode = binary
+    sim.send("ENGINE_TOGGLE")
+    blocks = []
+    step = 0
+    while len(blocks) < count:
+        phase = step % 300
+        if phase < 200:
+            sim.send("THROTTLE")
+        elif phase < 240:
+            sim.send("BRAKE")
+        if phase in (60, 120, 180):
+            sim.send("SHIFT_UP")
+        elif phase in (250, 270, 290):
+            sim.send("SHIFT_DOWN")
+        sim.run(50)
+        sim.read_output()
+        sim.send_status()
+        blocks.append(sim.read_output())
+        step += 1
+    return blocks
+
+
+def _chunks(data, size=CHUNK_SIZE):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def bench_update_from_data(blocks, repeat):
+    pairs = []
+    for block in blocks:
+        for line in block.decode().splitlines():
+            key, sep, value = line.partition(':')
+            if sep:
+                pairs.append((key, value))
+    vehicle = Vehicle(history=False)
+
+    def run():
+        update = vehicle.update_from_data
+        for key, value in pairs:
+            update(key, value)
+
+    return result(best_rate(run, len(pairs), repeat), "Zeilen/s")
+
+
+def bench_text_stream(blocks, repeat):
+    """Textprotokoll: Zeilen trennen, Blöcke zusammensetzen, Snapshots ausliefern"""
+    chunks = _chunks(b''.join(blocks))
+    lines = sum(block.count(b'\n') for block in blocks)
+    decoder = StreamDecoder()
+    decoder.on_line = lambda line: None
+    decoder.on_snapshot = lambda snapshot: None
+
+    def run():
+        feed = decoder.feed
+        for chunk in chunks:
+            feed(chunk)
+
+    return result(best_rate(run, lines, repeat), "Zeilen/s", blocks=len(blocks))
+
+
+def bench_binary_stream(blocks, repeat):
+    chunks = _chunks(b''.join(blocks))
+    decoder = StreamDecoder()
+    decoder.on_snapshot = lambda snapshot: None
+
+    def run():
+        feed = decoder.feed
+        for chunk in chunks:
+            feed(chunk)
+
+    return result(best_rate(run, len(blocks), repeat), "Frames/s")
+
+
+def bench_obd_decode(count, repeat):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return skipped("NumPy nicht installiert")
+    from communication.binary_protocol import encode_can_frame
+    from communication.obd_pids import (
+        PIDS, RESPONSE_ID_BASE, encode_value, decode_frames, frames_from_buffer
+    )
+
+    # Antworten mit ein bis drei PIDs, wie sie der Abfrageplaner anfordert
+    groups = ((0x0C,), (0x0C, 0x0D), (0x0D, 0x11, 0x05), (0x04, 0x05))
+    buffer = bytearray()
+    for i in range(count):
+        payload = bytes([0x41])
+        for pid in groups[i % len(groups)]:
+            spec = PIDS[pid]
+            payload += bytes([pid]) + encode_value(spec, (i * 7) % 100 * spec.scale * 2)
+        data = bytes([len(payload)]) + payload
+        buffer += encode_can_frame(RESPONSE_ID_BASE, data.ljust(8, b'\x00'))
+    buffer = bytes(buffer)
+
+    def run():
+        # Ende zu Ende: Puffer -> Frames -> Werte je Snapshot-Feld
+        decoded = decode_frames(frames_from_buffer(buffer))
+        return {PIDS[pid].field: values for pid, (_, values) in decoded.items()}
+
+    return result(best_rate(run, count, repeat), "Frames/s", budget=BUDGET_OBD_FRAMES_PER_S)
+
+
+def run(quick=False):
+    repeat = 3 if quick else 5
+    count = 2000 if quick else 20000
+    text = drive_blocks(count)
+    binary = drive_blocks(count, binary=True)
+    return {
+        'parse.update_from_data': bench_update_from_data(text, repeat),
+        'parse.text_stream': bench_text_stream(text, repeat),
+        'parse.binary_stream': bench_binary_stream(binary, repeat),
+        'parse.obd_decode': bench_obd_decode(count * 5, repeat),
+    }
@@ -0,0 +1,143 @@
+"""
+Benchmark: Kosten pro Frame im Dashboard
+Läuft unter Xvfb (wird bei Bedarf gestartet), ohne Anzeige wird übersprungen
+"""
+
+import os
+import select
+import shutil
+import subprocess
+import time
+
+from benchmarks.measure import result, skipped
+from benchmarks.parsing import drive_blocks
+from communication.stream_decoder import StreamDecoder
+from telemetry.latency import LatencyHistogram
+
+XVFB_SCREEN = '1280x1100x24'
+XVFB_TIMEOUT = 5.0         # s - bis Xvfb seine Display-Nummer meldet
+
+
+class _IdleSource:
+    """Datenquelle ohne Verbindung - die Benchmark füttert den Kanal selbst"""
+
+    def __init__(self):
+        self.on_data_received = None
+        self.on_snapshot = None
+        self.on_connection_changed = None
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def send_command(self, command):
+        return False
+
+
+def _start_xvfb():
+    """Startet Xvfb auf einer freien Display-Nummer -> Prozess (DISPLAY ist gesetzt)"""
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(
+        ['Xvfb', '-displayfd', str(write_fd), '-screen', '0', XVFB_SCREEN, '-nolisten', 'tcp'],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    try:
+        readable, _, _ = select.select([read_fd], [], [], XVFB_TIMEOUT)
+        number = os.read(read_fd, 16).decode().strip() if readable else ''
+    finally:
+        os.close(read_fd)
+    if not number:
+        proc.kill()
+        proc.wait()
+        return None
+    os.environ['DISPLAY'] = f':{number}'
+    return proc
+
+
+def _frames(count):
+    """(Zeilen, Snapshot) je Status-Block, wie sie der Serial-Thread liefert"""
+    frames = []
+    lines = []
+    decoder = StreamDecoder()
+    decoder.on_line = lines.append
+    decoder.on_snapshot = lambda snapshot: frames.append((list(lines), snapshot))
+    for block in drive_blocks(count):
+        lines.clear()
+        decoder.feed(block)
+    return frames
+
+
+def _measure(dashboard, frames):
+    frame_us = LatencyHistogram()
+    line_count = 0
+    line_s = 0.0
+
+    for lines, snapshot in frames:
+        # Log-Zeilen: process_serial_data + ein flush() wie im GUI-Tick
+        start = time.perf_counter()
+        for line in lines:
+            dashboard.process_serial_data(line)
+        dashboard.recv_view.flush()
+        line_s += time.perf_counter() - start
+        line_count += len(lines)
+
+        # Ein Frame: Kanal leeren, Widgets setzen, bis zum X-Server abarbeiten
+        dashboard.channel.post_snapshot(snapshot)
+        start = time.perf_counter()
+        dashboard.update_display()
+        dashboard.update_idletasks()
+        frame_us.record((time.perf_counter() - start) * 1e6)
+
+    return frame_us, line_count / line_s if line_s else 0.0
+
+
+def run(quick=False):
+    xvfb = None
+    if not os.environ.get('DISPLAY'):
+        if not shutil.which('Xvfb'):
+            return {'render': skipped("kein DISPLAY und kein Xvfb")}
+        xvfb = _start_xvfb()
+        if xvfb is None:
+            return {'render': skipped("Xvfb nicht gestartet")}
+
+    try:
+        try:
+            import tkinter
+            from gui.dashboard import CarDashboard
+        except ImportError as e:
+            return {'render': skipped(f"tkinter fehlt: {e}")}
+
+        frames = _frames(300 if quick else 3000)
+        try:
+            dashboard = CarDashboard(source=_IdleSource())
+        except tkinter.TclError as e:
+            return {'render': skipped(f"Tk nicht verfügbar: {e}")}
+        # Kein Scheduler - die Benchmark bestimmt den Takt
+        dashboard.scheduler.stop()
+        dashboard.keyboard_handler.stop()
+        dashboard.update()
+
+        # Erste Frames füllen Caches und Verlauf - nicht mitzählen
+        _measure(dashboard, frames[:50])
+        frame_us, lines_per_s = _measure(dashboard, frames[50:])
+        stats = dashboard.renderer.stats()
+        dashboard.destroy()
+
+        summary = frame_us.summary()
+        return {
+            'render.update_display': result(
+                summary['mean_ms'], "ms/Frame", higher_is_better=False,
+                p50_ms=summary['p50_ms'], p99_ms=summary['p99_ms'],
+                tk_calls_per_frame=stats['calls'] / max(1, stats['frames'])
+            ),
+            'render.update_display_p99': result(summary['p99_ms'], "ms/Frame", higher_is_better=False),
+            'render.process_serial_data': result(lines_per_s, "Zeilen/s"),
+        }
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+            del os.environ['DISPLAY']
@@ -0,0 +1,86 @@
+"""
+Benchmark-Lauf
+Führt die Benchmarks aus, schreibt JSON und vergleicht mit einer gespeicherten Baseline
+
+    python -m benchmarks.run                          # alles, Vergleich mit baseline.json
+    python -m benchmarks.run --only parse --quick     # nur die Parser, kurz
+    python -m benchmarks.run --save-baseline          # aktuelles Ergebnis als Baseline
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+from benchmarks.measure import (
+    compare, load, over_budget, print_comparison, print_results, save
+)
+
+# Gruppe -> Modul mit run(quick)
+SUITES = {
+    'parse': 'benchmarks.parsing',
+    'serial': 'benchmarks.serial_io',
+    'render': 'benchmarks.rendering',
+    'startup': 'benchmarks.startup',
+    'fleet': 'benchmarks.fleet',
+}
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def run_suites(names, quick=False):
+    results = {}
+    for name in names:
+        print(f"== {name}", file=sys.stderr)
+        # Erst hier importieren - render braucht tkinter, serial pyserial
+        module = importlib.import_module(SUITES[name])
+        results.update(module.run(quick=quick))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks für Parser, Serial-I/O und Rendering")
+    parser.add_argument('--only', default=','.join(SUITES),
+                        help=f"Gruppen, kommagetrennt ({', '.join(SUITES)})")
+    parser.add_argument('--quick', action='store_true', help="kürzere Läufe (ungenauer)")
+    parser.add_argument('--output', metavar='DATEI', help="Ergebnis als JSON schreiben")
+    parser.add_argument('--baseline', metavar='DATEI', default=DEFAULT_BASELINE,
+                        help="Vergleichswerte (Standard: benchmarks/baseline.json)")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Ergebnis als neue Baseline speichern")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="erlaubte Verschlechterung, bevor es als Regression zählt (0.10 = 10 %%)")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"unbekannte Gruppe: {', '.join(unknown)}")
+
+    results = run_suites(names, quick=args.quick)
+    print_results(results)
+
+    # Feste Budgets (z.B. Startzeit) gelten unabhängig von der Baseline
+    exceeded = over_budget(results)
+    for name, value, budget in exceeded:
+        print(f"BUDGET ÜBERSCHRITTEN: {name} = {value:.3f} (Budget {budget:g})")
+
+    if args.output:
+        save(args.output, results)
+    if args.save_baseline:
+        save(args.baseline, results)
+        print(f"Baseline gespeichert: {args.baseline}")
+        return 1 if exceeded else 0
+
+    regression = False
+    if os.path.exists(args.baseline):
+        baseline = load(args.baseline)
+        rows = compare(results, baseline['results'], args.tolerance)
+        print(f"\nVergleich mit {args.baseline}:")
+        print_comparison(rows)
+        regression = any(row[4] for row in rows)
+    return 1 if exceeded or regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Benchmark: SerialHandler gegen ein Pseudo-Terminal
+Ein Sender schreibt sendStatus()-Blöcke mit fester Rate, gemessen werden Durchsatz,
+Verluste und die Latenz write() -> Snapshot im Serial-Thread
+"""
+
+import os
+import tempfile
+import threading
+import time
+import tty
+
+from benchmarks.measure import result, skipped
+from benchmarks.parsing import drive_blocks
+from communication.serial_handler import SerialHandler
+from telemetry.latency import LatencyHistogram
+
+RATES = (10, 100, 1000)        # Status-Blöcke/s
+CONNECT_TIMEOUT = 10.0         # s - Port-Suche inkl. Probe
+SETTLE_S = 0.3                 # s - Pause zwischen Aufwärmen und Messung
+
+
+class StatusEmitter:
+    """Schreibt Status-Blöcke mit fester Rate in ein Pseudo-Terminal
+
+    Bis measure() läuft ein langsamer Aufwärm-Strom, damit die Port-Suche
+    eine Status-Zeile findet. Die Sendezeitpunkte der Messung landen in sent_ns.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = blocks
+        self.sent_ns = []
+        self.port = None
+        self._master = None
+        self._slave = None
+        self._stop = threading.Event()
+        self._measuring = threading.Event()
+        self._warmup = True
+        self._rate = 10
+
+    def start(self):
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def end_warmup(self):
+        self._warmup = False
+
+    def measure(self, rate, seconds):
+        """Sendet seconds lang mit rate Blöcken/s, blockiert bis zum Ende"""
+        self.sent_ns = []
+        self._rate = rate
+        self._count = int(rate * seconds)
+        self._done = threading.Event()
+        self._measuring.set()
+        self._done.wait()
+        self._measuring.clear()
+
+    def stop(self):
+        self._stop.set()
+        self._measuring.set()
+        self.thread.join(timeout=2.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self):
+        blocks = self.blocks
+        index = 0
+        while not self._stop.is_set():
+            if not self._measuring.wait(0.1):
+                # Aufwärmen: 10 Hz, bis der Empfänger verbunden ist
+                if self._warmup:
+                    os.write(self._master, blocks[index % len(blocks)])
+                    index += 1
+                continue
+            if self._stop.is_set():
+                break
+
+            # Feste Sendezeitpunkte - wer zu spät ist, holt ohne Pause auf
+            interval_ns = 1_000_000_000 // self._rate
+            start = time.monotonic_ns()
+            for i in range(self._count):
+                delay = start + i * interval_ns - time.monotonic_ns()
+                if delay > 0:
+                    time.sleep(delay / 1e9)
+                block = blocks[index % len(blocks)]
+                index += 1
+                self.sent_ns.append(time.monotonic_ns())
+                os.write(self._master, block)
+            self._done.set()
+            self._measuring.clear()
+
+
+def _measure_rate(handler, emitter, rate, seconds):
+    # Ruhe vor der Messung - alles Gepufferte ist dann gelesen
+    time.sleep(SETTLE_S)
+    received = []
+    handler.on_snapshot = lambda snapshot: received.append(snapshot.timestamp_ns)
+    bytes_per_block = sum(map(len, emitter.blocks)) / len(emitter.blocks)
+
+    cpu = time.process_time()
+    emitter.measure(rate, seconds)
+    # Letzte Blöcke noch abholen lassen
+    deadline = time.monotonic() + 1.0
+    while len(received) < len(emitter.sent_ns) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    cpu = time.process_time() - cpu
+    handler.on_snapshot = None
+
+    sent = emitter.sent_ns
+    latency = LatencyHistogram()
+    for sent_ns, received_ns in zip(sent, received):
+        latency.record((received_ns - sent_ns) // 1000)
+    # n Sendezeitpunkte umspannen n-1 Intervalle
+    duration = (sent[-1] - sent[0]) / 1e9 * len(sent) / (len(sent) - 1) if len(sent) > 1 else seconds
+    summary = latency.summary()
+
+    prefix = f'serial.{rate}hz'
+    return {
+        f'{prefix}.throughput': result(
+            len(received) / duration, "Snapshots/s",
+            bytes_per_s=round(len(received) * bytes_per_block / duration),
+            sent=len(sent), lost=len(sent) - len(received)
+        ),
+        f'{prefix}.latency_p50': result(summary.get('p50_ms', 0.0), "ms", higher_is_better=False),
+        f'{prefix}.latency_p99': result(summary.get('p99_ms', 0.0), "ms", higher_is_better=False),
+        # Prozess-CPU inkl. Sender-Thread - Obergrenze für den Empfang
+        f'{prefix}.cpu': result(
+            100.0 * cpu / duration, "% CPU", higher_is_better=False
+        ),
+    }
+
+
+def run(quick=False):
+    if os.name != 'posix':
+        return {'serial': skipped("Pseudo-Terminals nur unter POSIX")}
+
+    seconds = 1.0 if quick else 5.0
+    emitter = StatusEmitter(drive_blocks(1000))
+    handler = SerialHandler(emitter.start(), binary=False)
+    # Keine Spuren im Cache des echten Arduinos hinterlassen
+    cache = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+    cache.close()
+    handler.discovery.cache_file = cache.name
+    connected = threading.Event()
+    handler.on_snapshot = lambda snapshot: connected.set()
+
+    results = {}
+    try:
+        handler.start()
+        if not connected.wait(CONNECT_TIMEOUT):
+            return {'serial': skipped("Pseudo-Terminal nicht verbunden")}
+        emitter.end_warmup()
+        for rate in RATES:
+            results.update(_measure_rate(handler, emitter, rate, seconds))
+    finally:
+        handler.stop()
+        emitter.stop()
+        os.unlink(cache.name)
+    return results
@@ -0,0 +1,163 @@
+"""
+Benchmark: Startzeit mit Budget
+Jeder Lauf ist ein frischer Interpreter - gemessen wird, was der Benutzer wartet:
+Prozessstart bis zum ersten Snapshot (ohne GUI) bzw. bis zum ersten Fenster und ersten Frame
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.measure import result, skipped
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in Sekunden (Median aus RUNS Läufen)
+BUDGET_IMPORT_HEADLESS = 0.3    # main + Headless-Pfad importiert
+BUDGET_HEADLESS_READY = 3.0     # Prozessstart -> erster Snapshot vom virtuellen Arduino
+BUDGET_GUI_WINDOW = 1.5         # Prozessstart -> Fenster mit Anzeigen steht
+BUDGET_GUI_FIRST_FRAME = 4.0    # Prozessstart -> erster Snapshot gerendert
+RUNS = 3
+RUN_TIMEOUT = 30.0
+
+# Kind-Prozess: ohne GUI. Meldet "READY" beim ersten Snapshot, danach die Messwerte
+_HEADLESS_CHILD = r'''
+import asyncio, json, sys, tempfile, time
+t0 = time.perf_counter()
+import config.settings
+config.settings.PORT_CACHE_FILE = tempfile.mktemp(suffix='.json')
+import main
+from telemetry.headless import HeadlessRunner
+from communication.async_link import AsyncSerialLink
+imported = time.perf_counter() - t0
+
+from simulator.fake_arduino import FakeArduino
+port = FakeArduino().start()
+
+async def run():
+    runner = HeadlessRunner(AsyncSerialLink(port), interval=0)
+    await runner.start()
+    while runner.link.latest is None:
+        await asyncio.sleep(0.005)
+    print("READY", flush=True)
+    await runner.close()
+
+asyncio.run(run())
+print(json.dumps({'import_s': imported, 'tkinter': 'tkinter' in sys.modules}), flush=True)
+'''
+
+# Kind-Prozess: GUI. "WINDOW" sobald das Fenster gezeichnet ist, "FRAME" beim ersten Snapshot
+_GUI_CHILD = r'''
+import os, sys, tempfile, time
+import config.settings
+config.settings.PORT_CACHE_FILE = tempfile.mktemp(suffix='.json')
+import main
+from simulator.fake_arduino import FakeArduino
+from gui.dashboard import CarDashboard
+port = FakeArduino().start()
+app = CarDashboard(port=port, record=False)
+app.update()
+print("WINDOW", flush=True)
+deadline = time.monotonic() + 20
+# Der leere Start-Snapshot hat timestamp_ns 0 - erst ein Snapshot vom Arduino zählt
+while True:
+    snap = app._rendered_snapshot
+    if app.renderer.frames and snap is not None and snap.timestamp_ns:
+        break
+    if time.monotonic() > deadline:
+        sys.exit(1)
+    app.update()
+    time.sleep(0.002)
+app.update()
+print("FRAME", flush=True)
+app.scheduler.stop()
+app.serial_handler.stop()
+app.destroy()
+os._exit(0)
+'''
+
+
+def _run_child(code, markers):
+    """Startet den Kind-Prozess -> (Sekunden bis zu jedem Marker, letzte Zeile)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, text=True
+    )
+    times = {}
+    last = ''
+    try:
+        for line in proc.stdout:
+            line = line.strip()
+            if line in markers:
+                times[line] = time.perf_counter() - start
+            elif line:
+                last = line
+        proc.wait(RUN_TIMEOUT)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    if len(times) != len(markers):
+        raise RuntimeError(f"Kind-Prozess ohne {set(markers) - set(times)}")
+    return times, last
+
+
+def _median_result(values, budget):
+    value = statistics.median(values)
+    return result(value, "s", higher_is_better=False, budget=budget, runs=len(values))
+
+
+def bench_headless(runs):
+    imports, ready = [], []
+    for _ in range(runs):
+        times, last = _run_child(_HEADLESS_CHILD, ('READY',))
+        info = json.loads(last)
+        if info['tkinter']:
+            # Anforderung, nicht Geschwindigkeit - hart abbrechen
+            raise RuntimeError("--headless hat tkinter importiert")
+        imports.append(info['import_s'])
+        ready.append(times['READY'])
+    return {
+        'startup.headless_import': _median_result(imports, BUDGET_IMPORT_HEADLESS),
+        'startup.headless_first_snapshot': _median_result(ready, BUDGET_HEADLESS_READY),
+    }
+
+
+def bench_gui(runs):
+    from benchmarks.rendering import _start_xvfb
+    xvfb = None
+    if not os.environ.get('DISPLAY'):
+        if not shutil.which('Xvfb'):
+            return {'startup.gui': skipped("kein DISPLAY und kein Xvfb")}
+        xvfb = _start_xvfb()
+        if xvfb is None:
+            return {'startup.gui': skipped("Xvfb nicht gestartet")}
+    try:
+        window, frame = [], []
+        for _ in range(runs):
+            times, _ = _run_child(_GUI_CHILD, ('WINDOW', 'FRAME'))
+            window.append(times['WINDOW'])
+            frame.append(times['FRAME'])
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+            del os.environ['DISPLAY']
+    return {
+        'startup.gui_window': _median_result(window, BUDGET_GUI_WINDOW),
+        'startup.gui_first_frame': _median_result(frame, BUDGET_GUI_FIRST_FRAME),
+    }
+
+
+def run(quick=False):
+    if os.name != 'posix':
+        return {'startup': skipped("virtuelles Arduino nur unter POSIX")}
+    runs = 1 if quick else RUNS
+    results = bench_headless(runs)
+    results.update(bench_gui(runs))
+    return results
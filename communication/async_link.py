@@ -0,0 +1,267 @@
+"""
+asyncio-Anbindung des Arduinos
+Gleiches Protokoll wie SerialHandler, aber ohne eigene Threads und ohne Tk
+Nicht blockierende Datei-Deskriptoren (add_reader, os.write) gibt es nur unter POSIX -
+sonst (Windows) liest ein Executor-Thread, geschrieben wird ebenfalls im Executor
+"""
+
+import asyncio
+import os
+from collections import deque
+
+import serial
+from serial.tools.list_ports_common import ListPortInfo
+
+from communication.port_discovery import PortDiscovery
+from communication.stream_decoder import StreamDecoder, protocol_message
+from communication.binary_protocol import BINARY_COMMAND
+from config.settings import (
+    SERIAL_PORT, SERIAL_RECONNECT_INTERVAL, SERIAL_BINARY_PROTOCOL, SUBSCRIBER_QUEUE_SIZE,
+    SERIAL_READ_TIMEOUT
+)
+
+# Serieller Port als nicht blockierender fd in der Event-Loop (nur POSIX)
+NONBLOCKING_FD = os.name == 'posix'
+
+
+def _read_available(ser):
+    # Blockiert bis ein Byte da ist (höchstens ser.timeout), danach alles Gepufferte
+    return ser.read(ser.in_waiting or 1)
+
+
+class Subscription:
+    """Async-Iterator über Snapshots - ein eigener, begrenzter Puffer pro Abonnent"""
+
+    def __init__(self, link, maxlen):
+        self._link = link
+        self._queue = deque(maxlen=maxlen)
+        self._event = asyncio.Event()
+        self.closed = False
+        self.dropped = 0
+
+    def _push(self, snapshot):
+        # Snapshots sind unveränderlich - alle Abonnenten teilen dieselbe Referenz
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(snapshot)
+        self._event.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._queue:
+            if self.closed:
+                raise StopAsyncIteration
+            self._event.clear()
+            await self._event.wait()
+        return self._queue.popleft()
+
+    def close(self):
+        self._link._subscribers.discard(self)
+        self.closed = True
+        self._event.set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncSerialLink:
+    def __init__(self, port=SERIAL_PORT, binary=SERIAL_BINARY_PROTOCOL, discovery=None):
+        # Fester Port oder None für automatische Suche
+        self.port = port
+        self.binary_requested = binary
+        self.discovery = discovery or PortDiscovery()
+        self.nonblocking = NONBLOCKING_FD
+        self.decoder = StreamDecoder()
+        self.decoder.on_line = self._on_line
+        self.decoder.on_snapshot = self._on_snapshot
+        self.decoder.on_protocol_changed = self._on_protocol_changed
+
+        self.serial = None
+        self.running = False
+        self.connected = False
+        self.latest = None
+
+        self._subscribers = set()
+        self._task = None
+        self._lost = None
+        self._write_lock = None
+        self._stopped = None
+
+        # Callbacks (laufen in der Event-Loop)
+        self.on_data_received = None
+        self.on_connection_changed = None
+
+    # --- Abonnenten ---
+
+    def subscribe(self, maxlen=SUBSCRIBER_QUEUE_SIZE):
+        """Neuer Abonnent - bei Rückstand fallen die ältesten Snapshots heraus"""
+        subscription = Subscription(self, maxlen)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def __aiter__(self):
+        return self.subscribe()
+
+    # --- Lebenszyklus ---
+
+    def start(self):
+        """Startet Verbindungsaufbau und Empfang als Task der laufenden Loop"""
+        self.running = True
+        self._write_lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def close(self):
+        self.running = False
+        if self._stopped:
+            self._stopped.set()
+        self._connection_lost(None)
+        if self._task:
+            await self._task
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+    async def send(self, command):
+        """Schreibt einen Befehl - wartet nur auf den Port, nie auf einen Thread"""
+        ser = self.serial
+        if ser is None:
+            return False
+        data = (command + "\n").encode()
+        async with self._write_lock:
+            if not self.nonblocking:
+                return await self._send_in_executor(ser, data)
+            view = memoryview(data)
+            while view:
+                try:
+                    written = os.write(ser.fileno(), view)
+                except BlockingIOError:
+                    await self._writable(ser.fileno())
+                    continue
+                except OSError as e:
+                    self._connection_lost(e)
+                    return False
+                view = view[written:]
+        return True
+
+    async def _send_in_executor(self, ser, data):
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, ser.write, data)
+        except (serial.SerialException, OSError) as e:
+            self._connection_lost(e)
+            return False
+        return True
+
+    async def _writable(self, fd):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        loop.add_writer(fd, ready.set_result, None)
+        try:
+            await ready
+        finally:
+            loop.remove_writer(fd)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            self._notify(False, "Suche Arduino...")
+            ports = [ListPortInfo(self.port)] if self.port else None
+            # Portsuche blockiert (Reset + Handshake) - einmalig im Executor
+            found = await loop.run_in_executor(None, self.discovery.find, ports)
+            if found is None:
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), SERIAL_RECONNECT_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            ser, port = found
+            if not self.running:
+                ser.close()
+                break
+            self.discovery.remember(port)
+            await self._serve(ser, port)
+
+    async def _serve(self, ser, port):
+        loop = asyncio.get_running_loop()
+        self.decoder.reset()
+        self._lost = loop.create_future()
+        self.serial = ser
+        self.connected = True
+        reader = None
+        if self.nonblocking:
+            ser.timeout = 0
+            fd = ser.fileno()
+            os.set_blocking(fd, False)
+            loop.add_reader(fd, self._on_readable)
+        else:
+            ser.timeout = SERIAL_READ_TIMEOUT
+            reader = asyncio.ensure_future(self._read_in_executor(ser))
+        self._notify(True, f"Verbunden: {port.device}")
+        try:
+            if self.binary_requested:
+                await self.send(BINARY_COMMAND)
+            error = await self._lost
+        finally:
+            if reader is None:
+                loop.remove_reader(fd)
+            else:
+                # Laufendes read() im Thread aufwecken und abwarten - erst dann schließen
+                if hasattr(ser, 'cancel_read'):
+                    ser.cancel_read()
+                await asyncio.gather(reader, return_exceptions=True)
+            self.serial = None
+            self.connected = False
+            try:
+                ser.close()
+            except Exception:
+                pass
+        if self.running:
+            self._notify(False, f"Verbindung verloren: {error}")
+
+    async def _read_in_executor(self, ser):
+        """Ohne nicht blockierende fds: read() mit Timeout im Executor, dekodiert in der Loop"""
+        loop = asyncio.get_running_loop()
+        while not self._lost.done():
+            try:
+                data = await loop.run_in_executor(None, _read_available, ser)
+            except (serial.SerialException, OSError) as e:
+                self._connection_lost(e)
+                return
+            if data:
+                self.decoder.feed(data)
+
+    def _on_readable(self):
+        try:
+            data = self.serial.read(self.serial.in_waiting or 1)
+        except (serial.SerialException, OSError) as e:
+            self._connection_lost(e)
+            return
+        if data:
+            self.decoder.feed(data)
+
+    def _connection_lost(self, error):
+        if self._lost and not self._lost.done():
+            self._lost.set_result(error)
+
+    # --- Decoder-Callbacks ---
+
+    def _on_line(self, line):
+        if self.on_data_received:
+            self.on_data_received(line)
+
+    def _on_snapshot(self, snapshot):
+        self.latest = snapshot
+        for subscription in self._subscribers:
+            subscription._push(snapshot)
+
+    def _on_protocol_changed(self, binary):
+        self._notify(True, protocol_message(binary))
+
+    def _notify(self, connected, message):
+        if self.on_connection_changed:
+            self.on_connection_changed(connected, message)
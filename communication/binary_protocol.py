@@ -0,0 +1,84 @@
+"""
+Binäres Status-Protokoll
+Ein Status-Block als Frame fester Länge mit Sync-Byte, Version und CRC-16
+"""
+
+import struct
+from binascii import crc_hqx
+
+# Handshake (Host -> Sketch) und Bestätigung (Sketch -> Host, als Textzeile)
+BINARY_COMMAND = "PROTO_BINARY"
+TEXT_COMMAND = "PROTO_TEXT"
+ACK_PREFIX = "PROTO:"
+
+SYNC = 0xA5
+VERSION = 1
+
+# sync, version, seq, flags, millis, rpm, speed, gear, throttle, status, crc
+FRAME = struct.Struct('<BBBBIHHBBBH')
+
+# Weitergeleiteter CAN-Frame (Receiver CAN1): statt der Version steht KIND_CAN
+KIND_CAN = 0x10
+# sync, kind, can_id, dlc, data, crc
+CAN_FRAME = struct.Struct('<BBHB8sH')
+
+# Bits in flags
+FLAG_ENGINE_RUNNING = 0x01
+FLAG_GAS = 0x02
+
+# RPM_STATUS <-> Code (Reihenfolge wie im Sketch)
+STATUS_NAMES = ('OK', 'SHIFT_UP', 'SHIFT_DOWN', 'HIGH', 'REDLINE')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (Polynom 0x1021, Start 0xFFFF)"""
+    return crc_hqx(data, 0xFFFF)
+
+
+def encode_frame(seq, millis, engine_running, rpm, speed, gear, throttle,
+                 rpm_status, gas=False):
+    """Baut einen Frame - Gegenstück zu sendStatusFrame() im Sketch"""
+    flags = (FLAG_ENGINE_RUNNING if engine_running else 0) | (FLAG_GAS if gas else 0)
+    frame = bytearray(FRAME.pack(
+        SYNC, VERSION, seq & 0xFF, flags, millis & 0xFFFFFFFF, rpm, speed,
+        gear, throttle, STATUS_CODES.get(rpm_status, 0), 0
+    ))
+    struct.pack_into('<H', frame, FRAME.size - 2, crc16(frame[1:-2]))
+    return bytes(frame)
+
+
+def decode_frame(buf, offset=0):
+    """Frame ab offset -> Feld-Tupel ohne sync/crc, None bei Version/CRC-Fehler"""
+    fields = FRAME.unpack_from(buf, offset)
+    if fields[1] != VERSION:
+        return None
+    if crc16(buf[offset + 1:offset + FRAME.size - 2]) != fields[-1]:
+        return None
+    return fields[2:-1]
+
+
+def encode_can_frame(can_id, data):
+    """Baut einen CAN-Wire-Frame - Gegenstück zu sendCanFrame() im Sketch"""
+    frame = bytearray(CAN_FRAME.pack(SYNC, KIND_CAN, can_id, len(data), bytes(data), 0))
+    struct.pack_into('<H', frame, CAN_FRAME.size - 2, crc16(frame[1:-2]))
+    return bytes(frame)
+
+
+def can_frame_valid(buf, offset=0):
+    """CRC eines CAN-Wire-Frames prüfen"""
+    crc = struct.unpack_from('<H', buf, offset + CAN_FRAME.size - 2)[0]
+    return crc16(buf[offset + 1:offset + CAN_FRAME.size - 2]) == crc
+
+
+def can_frame_dtype():
+    """NumPy-Gegenstück zu CAN_FRAME für die Massen-Dekodierung"""
+    import numpy as np
+    return np.dtype([
+        ('sync', 'u1'), ('kind', 'u1'), ('can_id', '<u2'), ('dlc', 'u1'),
+        ('data', 'u1', (8,)), ('crc', '<u2'),
+    ])
+
+
+def status_name(code):
+    return STATUS_NAMES[code] if code < len(STATUS_NAMES) else "UNKNOWN"
@@ -0,0 +1,132 @@
+"""
+Befehls-Writer
+Eigener Thread für serial.write() - der Aufrufer (meist der Tk-Thread) blockiert nie
+"""
+
+import threading
+from collections import deque
+
+from config.settings import COMMAND_QUEUE_SIZE
+
+# Befehle des Sketches (ohne Protokoll-Umschaltung)
+VEHICLE_COMMANDS = frozenset(("ENGINE_TOGGLE", "THROTTLE", "BRAKE", "SHIFT_UP", "SHIFT_DOWN"))
+
+# Dauerbefehle (Taste gehalten) - mehrere direkt hintereinander sind einer
+REPEATING_COMMANDS = frozenset(("THROTTLE", "BRAKE"))
+
+
+class CommandWriter:
+    def __init__(self, get_serial, capacity=COMMAND_QUEUE_SIZE, repeating=REPEATING_COMMANDS):
+        # get_serial() -> offener Port oder None
+        self._get_serial = get_serial
+        self.capacity = capacity
+        self.repeating = repeating
+        self.running = False
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+
+        # Callback nach jedem erfolgreichen write() (Writer-Thread)
+        self.on_written = None   # (batch)
+
+        # Statistik
+        self.written = 0
+        self.batches = 0
+        self.coalesced = 0
+        self.rejected = 0       # nicht angenommen (submit() -> False)
+        self.dropped = 0        # angenommen, aber nie geschrieben
+        self.write_errors = 0
+        self.max_depth = 0
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify()
+
+    def submit(self, command):
+        """Reiht einen Befehl ein - False, wenn die Warteschlange voll ist"""
+        with self._cond:
+            pending = self._pending
+            if command in self.repeating and pending and pending[-1] == command:
+                # Noch nicht geschrieben - ein zweites Mal bringt nichts
+                self.coalesced += 1
+                return True
+            if len(pending) >= self.capacity and not self._make_room(command):
+                self.rejected += 1
+                return False
+            pending.append(command)
+            if len(pending) > self.max_depth:
+                self.max_depth = len(pending)
+            self._cond.notify()
+        return True
+
+    def _make_room(self, command):
+        """Volle Warteschlange: einmalige Befehle verdrängen den ältesten Dauerbefehl"""
+        if command in self.repeating:
+            return False
+        for i, queued in enumerate(self._pending):
+            if queued in self.repeating:
+                del self._pending[i]
+                # Schon angenommen, jetzt verworfen - zählt wie ein verlorener Befehl
+                self.dropped += 1
+                return True
+        return False
+
+    def clear(self):
+        """Verwirft Ausstehendes (z.B. bei Verbindungsverlust)"""
+        with self._cond:
+            self.dropped += len(self._pending)
+            self._pending.clear()
+
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self.running and not self._pending:
+                    self._cond.wait()
+                if not self.running:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+
+            ser = self._get_serial()
+            if ser is None:
+                with self._cond:
+                    self.dropped += len(batch)
+                continue
+            try:
+                # Alles Ausstehende in einem einzigen write()
+                ser.write("".join(command + "\n" for command in batch).encode())
+            except Exception as e:
+                with self._cond:
+                    self.write_errors += 1
+                    self.dropped += len(batch)
+                print(f"Serial Send Error: {e}")
+                continue
+            # Zähler nur unter der Sperre - submit()/clear() schreiben sie aus anderen Threads
+            with self._cond:
+                self.written += len(batch)
+                self.batches += 1
+            if self.on_written:
+                self.on_written(batch)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'depth': self.depth,
+                'max_depth': self.max_depth,
+                'written': self.written,
+                'batches': self.batches,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'dropped': self.dropped,
+                'write_errors': self.write_errors,
+            }
@@ -0,0 +1,46 @@
+"""
+Status-Frame Assembler
+Setzt die KEY:VALUE-Zeilen eines sendStatus()-Blocks zu einem Snapshot zusammen
+"""
+
+import time
+from models.vehicle import STATUS_FIELDS, VehicleSnapshot
+
+
+class FrameAssembler:
+    def __init__(self):
+        # Zuletzt veröffentlichter, vollständiger Zustand
+        self.latest = VehicleSnapshot()
+        self.frames = 0
+
+        self._pending = {}
+
+    def feed(self, line):
+        """Verarbeitet eine Zeile, gibt am Blockende den neuen Snapshot zurück"""
+        if not line:
+            # Leerzeile = Ende des Status-Blocks
+            return self._complete() if self._pending else None
+
+        key, sep, value = line.partition(':')
+        if sep:
+            entry = STATUS_FIELDS.get(key)
+            if entry is not None:
+                field, parser = entry
+                try:
+                    self._pending[field] = parser(value)
+                except ValueError:
+                    pass
+        return None
+
+    def reset(self):
+        """Verwirft einen angefangenen Block (z.B. nach Reconnect)"""
+        self._pending = {}
+
+    def _complete(self):
+        """Baut den Snapshot und veröffentlicht ihn per Referenz-Tausch"""
+        pending, self._pending = self._pending, {}
+        # Fehlende Felder behalten den letzten bekannten Wert
+        snapshot = self.latest.replace(timestamp_ns=time.monotonic_ns(), **pending)
+        self.latest = snapshot
+        self.frames += 1
+        return snapshot
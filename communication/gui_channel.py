@@ -0,0 +1,90 @@
+"""
+Übergabekanal Serial-Thread -> Tk-Mainloop
+Neuester Snapshot wird überschrieben, Logzeilen laufen durch einen Ringpuffer
+"""
+
+from collections import deque
+from config.settings import HANDOFF_LOG_CAPACITY
+
+
+class GuiChannel:
+    """Ein Produzent (I/O-Thread), ein Konsument (GUI-Thread), ohne Locks.
+
+    Alle Zähler haben genau einen Schreiber; Referenz-Tausch und
+    deque.append/popleft sind unter dem GIL atomar.
+    """
+
+    def __init__(self, log_capacity=HANDOFF_LOG_CAPACITY):
+        # Snapshot: nur der neueste zählt
+        self._snapshot = None
+        self._snapshots_posted = 0      # Schreiber: I/O-Thread
+        self._snapshots_taken = 0       # Schreiber: GUI-Thread
+        self._last_taken = None
+
+        # Logzeilen: Ringpuffer, älteste fallen heraus
+        self._lines = deque(maxlen=log_capacity)
+        self._lines_posted = 0
+        self._lines_taken = 0
+
+        # Verbindungs-Ereignisse (selten, aber keines darf verloren gehen) - ohne
+        # Obergrenze, sonst zeigt die GUI nach einem flatternden Port den falschen Zustand
+        self._events = deque()
+
+    # --- I/O-Thread ---
+
+    def post_snapshot(self, snapshot):
+        self._snapshot = snapshot
+        self._snapshots_posted += 1
+
+    def post_line(self, line):
+        self._lines.append(line)
+        self._lines_posted += 1
+
+    def post_connection(self, connected, message):
+        self._events.append((connected, message))
+
+    # --- GUI-Thread ---
+
+    def drain(self):
+        """Holt alles Angefallene in einem Rutsch: (snapshot|None, lines, events)"""
+        snapshot = self._snapshot
+        if snapshot is self._last_taken:
+            snapshot = None
+        else:
+            self._last_taken = snapshot
+            self._snapshots_taken += 1
+
+        lines = self._pop_all(self._lines)
+        self._lines_taken += len(lines)
+        events = self._pop_all(self._events)
+        return snapshot, lines, events
+
+    @staticmethod
+    def _pop_all(queue):
+        items = []
+        pop = queue.popleft
+        try:
+            for _ in range(len(queue)):
+                items.append(pop())
+        except IndexError:
+            pass
+        return items
+
+    @property
+    def coalesced(self):
+        """Snapshots, die nie angezeigt wurden, weil ein neuerer kam"""
+        return self._snapshots_posted - self._snapshots_taken - (
+            self._snapshot is not self._last_taken
+        )
+
+    @property
+    def dropped_lines(self):
+        """Logzeilen, die aus dem vollen Ringpuffer gefallen sind"""
+        return self._lines_posted - self._lines_taken - len(self._lines)
+
+    def stats(self):
+        return {
+            'coalesced': self.coalesced,
+            'dropped_lines': self.dropped_lines,
+            'pending_lines': len(self._lines),
+        }
@@ -0,0 +1,115 @@
+"""
+ISO-TP (ISO 15765-2) auf klassischem CAN
+Segmentierung und Zusammensetzen von Nachrichten über 7 Byte
+"""
+
+# Frame-Typen (oberes Nibble des ersten Bytes)
+SINGLE_FRAME = 0x0
+FIRST_FRAME = 0x1
+CONSECUTIVE_FRAME = 0x2
+FLOW_CONTROL = 0x3
+
+# Flow-Control-Status
+FC_CONTINUE = 0x0
+
+PADDING = 0x00
+
+
+def _pad(frame):
+    return bytes(frame) + bytes([PADDING]) * (8 - len(frame))
+
+
+def single_frame(payload):
+    if not 0 < len(payload) <= 7:
+        raise ValueError("Single Frame: 1-7 Byte Nutzdaten")
+    return _pad(bytes([len(payload)]) + bytes(payload))
+
+
+def segment(payload):
+    """Nachricht -> Liste von CAN-Datenfeldern (SF oder FF + CFs)"""
+    if len(payload) <= 7:
+        return [single_frame(payload)]
+    if len(payload) > 0xFFF:
+        raise ValueError("ISO-TP: höchstens 4095 Byte")
+    frames = [bytes([(FIRST_FRAME << 4) | (len(payload) >> 8), len(payload) & 0xFF]) + bytes(payload[:6])]
+    seq = 1
+    for pos in range(6, len(payload), 7):
+        frames.append(_pad(bytes([(CONSECUTIVE_FRAME << 4) | seq]) + bytes(payload[pos:pos + 7])))
+        seq = (seq + 1) & 0x0F
+    return frames
+
+
+def flow_control(block_size=0, st_min=0):
+    """FC 'weiter senden' - block_size 0 = alles ohne weitere FCs"""
+    return _pad(bytes([(FLOW_CONTROL << 4) | FC_CONTINUE, block_size, st_min]))
+
+
+class IsoTpReassembler:
+    """Setzt Antworten pro CAN-ID zusammen"""
+
+    def __init__(self, timeout_ms=1000):
+        # N_Cr: maximale Pause zwischen zwei Consecutive Frames
+        self.timeout_ms = timeout_ms
+        # can_id -> [länge, puffer, nächste seq, frist]
+        self._sessions = {}
+
+        # Sender muss nach einem First Frame eine Flow Control schicken
+        self.on_flow_control = None   # (can_id)
+
+        # Statistik
+        self.completed = 0
+        self.errors = 0
+
+    def feed(self, can_id, data, now_ms=0):
+        """Ein CAN-Datenfeld -> vollständige Nachricht oder None"""
+        kind = data[0] >> 4
+
+        if kind == SINGLE_FRAME:
+            length = data[0] & 0x0F
+            if not 0 < length <= min(7, len(data) - 1):
+                self.errors += 1
+                return None
+            self.completed += 1
+            return bytes(data[1:1 + length])
+
+        if kind == FIRST_FRAME:
+            length = ((data[0] & 0x0F) << 8) | data[1]
+            if length <= 7:
+                self.errors += 1
+                return None
+            if can_id in self._sessions:
+                # Neue Nachricht vor dem Ende der alten
+                self.errors += 1
+            self._sessions[can_id] = [length, bytearray(data[2:8]), 1, now_ms + self.timeout_ms]
+            if self.on_flow_control:
+                self.on_flow_control(can_id)
+            return None
+
+        if kind == CONSECUTIVE_FRAME:
+            session = self._sessions.get(can_id)
+            if session is None:
+                self.errors += 1
+                return None
+            length, buf, seq, deadline = session
+            if now_ms > deadline or data[0] & 0x0F != seq:
+                del self._sessions[can_id]
+                self.errors += 1
+                return None
+            buf += data[1:8]
+            if len(buf) >= length:
+                del self._sessions[can_id]
+                self.completed += 1
+                return bytes(buf[:length])
+            session[2] = (seq + 1) & 0x0F
+            session[3] = now_ms + self.timeout_ms
+            return None
+
+        # Flow Control ist für den Sender bestimmt
+        return None
+
+    def expire(self, now_ms):
+        """Verwirft abgelaufene, unvollständige Nachrichten"""
+        for can_id, session in list(self._sessions.items()):
+            if now_ms > session[3]:
+                del self._sessions[can_id]
+                self.errors += 1
@@ -0,0 +1,217 @@
+"""
+OBD-II Mode 01 Decoder
+PID-Tabelle mit vorkompilierten struct-Unpackern, Einzel- und Massen-Dekodierung
+"""
+
+import struct
+
+# Mode 01 (aktuelle Daten), Antwort = Mode + 0x40
+MODE_CURRENT_DATA = 0x01
+RESPONSE_OFFSET = 0x40
+
+# 11-Bit CAN-IDs: Funktionale Anfrage, Antworten der Steuergeräte 0x7E8-0x7EF
+REQUEST_ID = 0x7DF
+RESPONSE_ID_BASE = 0x7E8
+RESPONSE_ID_MASK = 0x7F8
+
+
+class PidSpec:
+    """Ein PID: Länge und Skalierung value = cast(raw * scale + offset)"""
+
+    __slots__ = ('pid', 'name', 'field', 'unpacker', 'size', 'scale', 'offset', 'cast', 'unit')
+
+    def __init__(self, pid, name, field, fmt, scale=1, offset=0, cast=int, unit=""):
+        self.pid = pid
+        self.name = name
+        self.field = field          # Feld im VehicleSnapshot oder None
+        self.unpacker = struct.Struct('>' + fmt)
+        self.size = self.unpacker.size
+        self.scale = scale
+        self.offset = offset
+        self.cast = cast
+        self.unit = unit
+
+    def decode(self, data, offset=0):
+        raw = self.unpacker.unpack_from(data, offset)[0]
+        return self.cast(raw * self.scale + self.offset)
+
+
+PIDS = {}
+
+# Lazy gebaute NumPy-Tabellen (nach register() neu)
+_bulk_tables = {}
+
+
+def register(spec):
+    """Nimmt einen PID in die Tabelle auf (überschreibt gleiche Nummer)"""
+    PIDS[spec.pid] = spec
+    _bulk_tables.clear()
+    return spec
+
+
+register(PidSpec(0x00, "Unterstützte PIDs 01-20", None, 'I'))
+register(PidSpec(0x04, "Motorlast", 'engine_load', 'B', 100 / 255, cast=float, unit="%"))
+register(PidSpec(0x05, "Kühlmitteltemperatur", 'coolant_temp', 'B', offset=-40, unit="°C"))
+register(PidSpec(0x0C, "Drehzahl", 'rpm', 'H', 0.25, cast=round, unit="U/min"))
+register(PidSpec(0x0D, "Geschwindigkeit", 'speed', 'B', unit="km/h"))
+register(PidSpec(0x11, "Drosselklappe", 'throttle', 'B', 100 / 255, cast=round, unit="%"))
+
+
+def encode_value(spec, value):
+    """Wert -> Rohbytes (Gegenstück zu decode, z.B. für ein emuliertes Steuergerät)"""
+    raw = int(round((value - spec.offset) / spec.scale))
+    limit = (1 << (8 * spec.size)) - 1
+    return spec.unpacker.pack(max(0, min(limit, raw)))
+
+
+def decode_response(payload):
+    """Mode-01-Antwort (ab 0x41, ohne ISO-TP-Header) -> {pid: wert}
+
+    Mehrere PIDs in einer Antwort sind erlaubt; ein unbekannter PID beendet die
+    Auswertung, weil seine Länge nicht bekannt ist.
+    """
+    values = {}
+    if not payload or payload[0] != MODE_CURRENT_DATA + RESPONSE_OFFSET:
+        return values
+    pos = 1
+    end = len(payload)
+    while pos < end:
+        spec = PIDS.get(payload[pos])
+        if spec is None or pos + 1 + spec.size > end:
+            break
+        values[spec.pid] = spec.decode(payload, pos + 1)
+        pos += 1 + spec.size
+    return values
+
+
+# Felder, die nur per OBD-II bekannt sind - der Status-Block des Sketches lässt sie leer
+OBD_ONLY_FIELDS = ('coolant_temp', 'engine_load')
+
+
+def snapshot_fields(values):
+    """{pid: wert} -> {snapshot_feld: wert}"""
+    fields = {}
+    for pid, value in values.items():
+        field = PIDS[pid].field
+        if field is not None:
+            fields[field] = value
+    return fields
+
+
+# --- Massen-Dekodierung weitergeleiteter CAN-Frames (NumPy) ---
+
+# Im Einzel-Frame stehen höchstens 7 Nutzbytes: 0x41 + 3 x (PID + 1 Byte)
+MAX_PIDS_PER_FRAME = 3
+
+
+def _tables():
+    import numpy as np
+    if not _bulk_tables:
+        lengths = np.zeros(256, dtype=np.intp)
+        for spec in PIDS.values():
+            lengths[spec.pid] = spec.size
+        _bulk_tables['lengths'] = lengths
+    return _bulk_tables
+
+
+def _cast(spec, values):
+    """spec.cast spaltenweise - dieselben Werte wie PidSpec.decode()"""
+    import numpy as np
+    if spec.cast is float:
+        return values.astype(np.float64)
+    if spec.cast is round:
+        # round() und rint() runden beide halbe Werte zur geraden Zahl
+        return np.rint(values).astype(np.int64)
+    if spec.cast is int:
+        if values.dtype.kind in 'iu':
+            return values
+        return np.trunc(values).astype(np.int64)
+    return np.array([spec.cast(value) for value in values.tolist()])
+
+
+def decode_frames(frames):
+    """CAN-Frames (Strukturarray mit 'can_id', 'data') -> {pid: (frame_index, werte)}
+
+    Alles spaltenweise: pro PID-Position im Frame ein Durchgang über alle Frames.
+    Die Werte sind wie bei PidSpec.decode() skaliert und umgewandelt.
+    """
+    import numpy as np
+    lengths = _tables()['lengths']
+    data = frames['data']
+    count = len(frames)
+
+    # Einzel-Frames (ISO-TP PCI 0x0L) mit Mode-01-Antwort eines Steuergeräts
+    pci = data[:, 0]
+    # Längenangabe über 7 (fehlerhafter Frame) nie über das Datenfeld hinaus lesen
+    end = np.minimum(1 + (pci & 0x0F).astype(np.intp), data.shape[1])
+    valid = (
+        ((frames['can_id'] & RESPONSE_ID_MASK) == RESPONSE_ID_BASE)
+        & ((pci >> 4) == 0)
+        & (data[:, 1] == MODE_CURRENT_DATA + RESPONSE_OFFSET)
+    )
+    rows = np.flatnonzero(valid)
+    pos = np.full(rows.size, 2, dtype=np.intp)
+    end = end[rows]
+
+    parts = {}
+    for _ in range(MAX_PIDS_PER_FRAME):
+        keep = pos < end
+        rows, pos, end = rows[keep], pos[keep], end[keep]
+        if not rows.size:
+            break
+        pid = data[rows, pos]
+        size = lengths[pid]
+        ok = (size > 0) & (pos + 1 + size <= end)
+        for spec in PIDS.values():
+            sel = np.flatnonzero(ok & (pid == spec.pid))
+            if not sel.size:
+                continue
+            r, p = rows[sel], pos[sel] + 1
+            raw = data[r, p].astype(np.int64)
+            for k in range(1, spec.size):
+                raw = (raw << 8) | data[r, p + k]
+            values = _cast(spec, raw * spec.scale + spec.offset)
+            parts.setdefault(spec.pid, []).append((r, values))
+        # Unbekannter PID -> Rest des Frames verwerfen
+        pos = np.where(ok, pos + 1 + size, end)
+
+    result = {}
+    for pid, chunks in parts.items():
+        if len(chunks) == 1:
+            result[pid] = chunks[0]
+            continue
+        index = np.concatenate([r for r, _ in chunks])
+        values = np.concatenate([v for _, v in chunks])
+        order = np.argsort(index, kind='stable')
+        result[pid] = (index[order], values[order])
+    return result
+
+
+def frames_from_buffer(buffer):
+    """Puffer aus CAN-Wire-Frames (binary_protocol.CAN_FRAME) -> Strukturarray ohne Kopie"""
+    import numpy as np
+    from communication.binary_protocol import CAN_FRAME, can_frame_dtype
+    return np.frombuffer(buffer, dtype=can_frame_dtype(), count=len(buffer) // CAN_FRAME.size)
+
+
+def apply_frames(snapshot, buffer):
+    """Übernimmt die jeweils letzten Werte aller Frames im Puffer in einen Snapshot"""
+    fields = snapshot_fields(latest_values(frames_from_buffer(buffer)))
+    return snapshot.replace(**fields) if fields else snapshot
+
+
+def carry_obd_fields(snapshot, previous):
+    """OBD-Werte des vorigen Snapshots behalten, die ein Status-Block nicht mitliefert"""
+    fields = {
+        name: getattr(previous, name) for name in OBD_ONLY_FIELDS
+        if getattr(snapshot, name) is None and getattr(previous, name) is not None
+    }
+    return snapshot.replace(**fields) if fields else snapshot
+
+
+def latest_values(frames):
+    """Jeweils der letzte dekodierte Wert pro PID -> {pid: wert}"""
+    return {
+        pid: values[-1].item()
+        for pid, (index, values) in decode_frames(frames).items()
+    }
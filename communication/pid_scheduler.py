@@ -0,0 +1,190 @@
+"""
+OBD-II PID-Abfrageplaner
+Fragt PIDs mit eigener Rate ab, bündelt bis zu 6 PIDs pro Anfrage und hält ein Buslast-Budget ein
+"""
+
+from collections import deque
+
+from communication.isotp import IsoTpReassembler, single_frame, flow_control
+from communication.obd_pids import (
+    PIDS, MODE_CURRENT_DATA, REQUEST_ID, RESPONSE_ID_BASE, RESPONSE_ID_MASK, decode_response
+)
+from config.settings import (
+    PID_POLL_RATES, OBD_MAX_PIDS_PER_REQUEST, OBD_MAX_IN_FLIGHT, OBD_REQUEST_TIMEOUT_MS,
+    OBD_BUS_BUDGET, CAN_BITRATE, CAN_FRAME_BITS
+)
+
+# Physikalische Adresse = Antwort-ID - 8 (0x7E8 -> 0x7E0)
+PHYSICAL_OFFSET = 8
+
+
+def frame_ms(bitrate=CAN_BITRATE):
+    """Busbelegung eines 8-Byte-Frames in ms"""
+    return CAN_FRAME_BITS / bitrate * 1000.0
+
+
+def response_frames(pids):
+    """Anzahl Bus-Frames für Anfrage + Antwort (inkl. Flow Control)"""
+    length = 1 + sum(1 + PIDS[pid].size for pid in pids)
+    if length <= 7:
+        return 2
+    consecutive = -(-(length - 6) // 7)
+    return 1 + 1 + 1 + consecutive
+
+
+class PidStats:
+    __slots__ = ('updates', 'last_ms', 'max_interval_ms', 'interval_sum_ms', 'latency_sum_ms')
+
+    def __init__(self):
+        self.updates = 0
+        self.last_ms = None
+        self.max_interval_ms = 0.0
+        self.interval_sum_ms = 0.0
+        self.latency_sum_ms = 0.0
+
+    def update(self, now_ms, latency_ms):
+        if self.last_ms is not None:
+            interval = now_ms - self.last_ms
+            self.interval_sum_ms += interval
+            if interval > self.max_interval_ms:
+                self.max_interval_ms = interval
+        self.last_ms = now_ms
+        self.updates += 1
+        self.latency_sum_ms += latency_ms
+
+
+class PidScheduler:
+    def __init__(self, send, rates=PID_POLL_RATES, max_pids=OBD_MAX_PIDS_PER_REQUEST,
+                 max_in_flight=OBD_MAX_IN_FLIGHT, timeout_ms=OBD_REQUEST_TIMEOUT_MS,
+                 bus_budget=OBD_BUS_BUDGET, bitrate=CAN_BITRATE):
+        # send(can_id, data) - legt einen Frame auf den Bus
+        self.send = send
+        self.periods = {pid: 1000.0 / hz for pid, hz in rates.items()}
+        self.max_pids = max_pids
+        self.max_in_flight = max_in_flight
+        self.timeout_ms = timeout_ms
+        self.bus_budget = bus_budget
+        self.frame_ms = frame_ms(bitrate)
+
+        self.next_due = {pid: 0.0 for pid in rates}
+        self.pending = set()
+        self.in_flight = deque()     # (gesendet_ms, pids), älteste zuerst
+
+        self.reassembler = IsoTpReassembler()
+        self.reassembler.on_flow_control = self._send_flow_control
+
+        # Busbudget als Token-Bucket in ms Busbelegung
+        self._budget_ms = 0.0
+        self._budget_at = None
+
+        self.values = {}             # pid -> letzter Wert
+        self.stats = {pid: PidStats() for pid in rates}
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+        self.budget_waits = 0
+
+        self.on_values = None        # ({pid: wert}, now_ms)
+
+    def _send_flow_control(self, can_id):
+        self.send(can_id - PHYSICAL_OFFSET, flow_control())
+
+    def poll(self, now_ms):
+        """Verschickt fällige Anfragen - regelmäßig aufrufen (z.B. jede ms)"""
+        self._expire(now_ms)
+        self._refill(now_ms)
+
+        while len(self.in_flight) < self.max_in_flight:
+            due = [pid for pid, t in self.next_due.items() if t <= now_ms and pid not in self.pending]
+            if not due:
+                return
+            # Am längsten überfällig zuerst, Gleichstand: schnellere Rate zuerst
+            due.sort(key=lambda pid: (self.next_due[pid], self.periods[pid]))
+            batch = due[:self.max_pids]
+
+            cost = response_frames(batch) * self.frame_ms
+            if cost > self._budget_ms:
+                self.budget_waits += 1
+                return
+            self._budget_ms -= cost
+
+            self.send(REQUEST_ID, single_frame(bytes([MODE_CURRENT_DATA] + batch)))
+            self.requests += 1
+            self.in_flight.append((now_ms, batch))
+            for pid in batch:
+                self.pending.add(pid)
+                self.next_due[pid] = now_ms + self.periods[pid]
+
+    def receive(self, can_id, data, now_ms):
+        """Frame vom Bus - Antworten werden zusammengesetzt und dekodiert"""
+        if (can_id & RESPONSE_ID_MASK) != RESPONSE_ID_BASE:
+            return
+        payload = self.reassembler.feed(can_id, data, now_ms)
+        if payload is None:
+            return
+        values = decode_response(payload)
+        request = self._match(values)
+        if request is None:
+            return
+
+        sent_ms, batch = request
+        self.responses += 1
+        latency = now_ms - sent_ms
+        for pid in batch:
+            self.pending.discard(pid)
+        for pid, value in values.items():
+            self.values[pid] = value
+            stats = self.stats.get(pid)
+            if stats:
+                stats.update(now_ms, latency)
+        if self.on_values:
+            self.on_values(values, now_ms)
+
+    def _match(self, values):
+        """Älteste offene Anfrage, zu der die Antwort passt"""
+        for i, (sent_ms, batch) in enumerate(self.in_flight):
+            if values and all(pid in batch for pid in values):
+                del self.in_flight[i]
+                return sent_ms, batch
+        return None
+
+    def _expire(self, now_ms):
+        while self.in_flight and now_ms - self.in_flight[0][0] > self.timeout_ms:
+            _, batch = self.in_flight.popleft()
+            self.timeouts += 1
+            for pid in batch:
+                # Sofort erneut fällig
+                self.pending.discard(pid)
+                self.next_due[pid] = now_ms
+        self.reassembler.expire(now_ms)
+
+    def _refill(self, now_ms):
+        if self._budget_at is None:
+            self._budget_at = now_ms
+            self._budget_ms = 4 * self.frame_ms
+        # Höchstens ~10 ms Bus-Zeit ansparen
+        cap = max(10.0 * self.bus_budget, 8 * self.frame_ms)
+        self._budget_ms = min(cap, self._budget_ms + (now_ms - self._budget_at) * self.bus_budget)
+        self._budget_at = now_ms
+
+    def summary(self, duration_ms):
+        """Raten und Aktualität pro PID über duration_ms"""
+        seconds = duration_ms / 1000.0
+        per_pid = {}
+        for pid, stats in self.stats.items():
+            intervals = stats.updates - 1
+            per_pid[PIDS[pid].name] = {
+                'target_hz': 1000.0 / self.periods[pid],
+                'actual_hz': stats.updates / seconds if seconds else 0.0,
+                'mean_interval_ms': stats.interval_sum_ms / intervals if intervals > 0 else None,
+                'max_interval_ms': stats.max_interval_ms,
+                'mean_latency_ms': stats.latency_sum_ms / stats.updates if stats.updates else None,
+            }
+        return {
+            'requests_per_s': self.requests / seconds if seconds else 0.0,
+            'responses': self.responses,
+            'timeouts': self.timeouts,
+            'budget_waits': self.budget_waits,
+            'isotp_errors': self.reassembler.errors,
+            'pids': per_pid,
+        }
@@ -0,0 +1,150 @@
+"""
+Arduino-Portsuche
+Prüft alle Ports parallel und merkt sich den zuletzt erfolgreichen
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import serial
+import serial.tools.list_ports
+
+from models.vehicle import STATUS_FIELDS
+from communication.binary_protocol import TEXT_COMMAND
+from config.settings import (
+    SERIAL_BAUDRATE, SERIAL_TIMEOUT, PORT_CACHE_FILE, DISCOVERY_MAX_WORKERS
+)
+
+# Lesetimeout während der Suche - so oft wird auf Abbruch geprüft
+_PROBE_READ_TIMEOUT = 0.1
+
+
+def is_status_line(raw):
+    """True, wenn die Zeile eine gültige Status-Zeile des Sketches ist"""
+    key, sep, value = raw.decode(errors='ignore').strip().partition(':')
+    entry = STATUS_FIELDS.get(key) if sep else None
+    if entry is None:
+        return False
+    try:
+        entry[1](value)
+    except ValueError:
+        return False
+    return True
+
+
+class PortDiscovery:
+    def __init__(self, cache_file=PORT_CACHE_FILE):
+        self.cache_file = cache_file
+
+    def find(self, ports=None):
+        """Gibt (serial, port_info) des ersten Arduinos zurück oder None"""
+        if ports is None:
+            ports = serial.tools.list_ports.comports()
+        ports = list(ports)
+        if not ports:
+            return None
+
+        # 1. Zuletzt erfolgreicher Port zuerst. Volle Handshake-Zeit: unter Linux
+        # hebt open() DTR trotz dtr=False an, der Arduino bootet dann neu
+        cached = self._load_cache()
+        for port in ports:
+            if self._matches(port, cached):
+                ser = self._probe(port.device, threading.Event(), reset=False)
+                if ser:
+                    return ser, port
+
+        # 2. Alle Ports gleichzeitig, der erste gültige Handshake gewinnt
+        return self._probe_parallel(ports)
+
+    def remember(self, port):
+        """Speichert den Port für den nächsten Verbindungsaufbau"""
+        data = {
+            'device': port.device,
+            'vid': getattr(port, 'vid', None),
+            'pid': getattr(port, 'pid', None),
+            'serial_number': getattr(port, 'serial_number', None),
+        }
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump(data, f)
+        except OSError:
+            pass
+
+    def _probe_parallel(self, ports):
+        cancel = threading.Event()
+        winner = []
+        lock = threading.Lock()
+        found = threading.Event()
+        remaining = [len(ports)]
+
+        def done(future, port):
+            ser = None if future.cancelled() or future.exception() else future.result()
+            with lock:
+                remaining[0] -= 1
+                if ser and not winner:
+                    winner.append((ser, port))
+                    cancel.set()
+                elif ser:
+                    # Zu spät - Port wieder freigeben
+                    ser.close()
+                if winner or remaining[0] == 0:
+                    found.set()
+
+        pool = ThreadPoolExecutor(max_workers=min(len(ports), DISCOVERY_MAX_WORKERS))
+        for port in ports:
+            future = pool.submit(self._probe, port.device, cancel)
+            future.add_done_callback(lambda f, p=port: done(f, p))
+        found.wait()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return winner[0] if winner else None
+
+    def _probe(self, device, cancel, reset=True):
+        """Öffnet den Port und wartet auf eine erkannte Status-Zeile"""
+        ser = serial.Serial()
+        ser.port = device
+        ser.baudrate = SERIAL_BAUDRATE
+        ser.timeout = _PROBE_READ_TIMEOUT
+        # Keine Hardware-Flusskontrolle - sonst steuert pyserial DTR/RTS selbst
+        ser.dsrdtr = False
+        ser.rtscts = False
+        if not reset:
+            # DTR vor open() aus -> kein Auto-Reset, wo der Treiber das zulässt
+            # (Windows, manche USB-Seriell-Wandler); sonst bootet der Sketch neu
+            ser.dtr = False
+        try:
+            ser.open()
+        except (serial.SerialException, OSError, ValueError):
+            return None
+
+        try:
+            # Ein Sketch im Binärmodus (ohne Reset) erst auf Text zurückholen
+            ser.write(f"{TEXT_COMMAND}\nSTATUS\n".encode())
+            deadline = time.monotonic() + SERIAL_TIMEOUT
+            while time.monotonic() < deadline and not cancel.is_set():
+                if is_status_line(ser.readline()):
+                    return ser
+        except (serial.SerialException, OSError):
+            pass
+        ser.close()
+        return None
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _matches(port, cached):
+        if not cached:
+            return False
+        if cached.get('serial_number') and getattr(port, 'serial_number', None):
+            return (
+                port.serial_number == cached['serial_number']
+                and getattr(port, 'vid', None) == cached.get('vid')
+                and getattr(port, 'pid', None) == cached.get('pid')
+            )
+        return port.device == cached.get('device')
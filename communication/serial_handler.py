@@ -3,93 +3,152 @@ Serial-Kommunikation Handler
 Verwaltet Arduino-Verbindung und Datenübertragung
 """
 
-import serial
-import serial.tools.list_ports
 import threading
-import time
-from datetime import datetime
-from config.settings import SERIAL_BAUDRATE, SERIAL_TIMEOUT, SERIAL_RECONNECT_INTERVAL
+from serial.tools.list_ports_common import ListPortInfo
+from communication.command_writer import CommandWriter
+from communication.port_discovery import PortDiscovery
+from communication.stream_decoder import StreamDecoder, protocol_message
+from communication.binary_protocol import BINARY_COMMAND
+from config.settings import (
+    SERIAL_PORT, SERIAL_RECONNECT_INTERVAL, SERIAL_READ_TIMEOUT,
+    SERIAL_BINARY_PROTOCOL, SERIAL_WRITE_TIMEOUT
+)
 
 class SerialHandler:
-    def __init__(self):
+    def __init__(self, port=SERIAL_PORT, binary=SERIAL_BINARY_PROTOCOL):
+        # Fester Port (z.B. virtuelles Arduino) oder None für automatische Suche
+        self.port = port
+        # Binärprotokoll anfragen - ohne Antwort bleibt es beim Textprotokoll
+        self.binary_requested = binary
         self.serial = None
         self.running = False
         self.connected = False
+        self.thread = None
+        self._stopped = threading.Event()
+
+        self.decoder = StreamDecoder()
+        self.decoder.on_line = self._on_line
+        self.decoder.on_snapshot = self._on_snapshot
+        self.decoder.on_protocol_changed = self._on_protocol_changed
+        self.decoder.on_can_frames = self._on_can_frames
+        self.discovery = PortDiscovery()
+        self.writer = CommandWriter(self._open_serial)
 
         # Callbacks
         self.on_data_received = None
+        self.on_snapshot = None
         self.on_connection_changed = None
+        self.on_can_frames = None
+
+    @property
+    def binary(self):
+        """True, sobald der Sketch Binär-Frames sendet"""
+        return self.decoder.binary
 
     def start(self):
         """Startet den Serial-Thread"""
         self.running = True
+        self._stopped.clear()
+        self.writer.start()
         self.thread = threading.Thread(target=self._serial_thread, daemon=True)
         self.thread.start()
 
     def stop(self):
-        """Stoppt die Serial-Kommunikation"""
+        """Stoppt die Serial-Kommunikation - kehrt erst zurück, wenn der Serial-Thread steht"""
         self.running = False
+        self._stopped.set()
+        self.writer.stop()
+        ser = self.serial
+        if ser and ser.is_open:
+            # Blockierendes read() im Serial-Thread sofort aufwecken
+            if hasattr(ser, 'cancel_read'):
+                ser.cancel_read()
+            ser.close()
+        # Danach laufen keine Callbacks mehr (z.B. record() in eine schon geschlossene Datei)
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        # Port, der kurz vor dem Stopp noch verbunden wurde
         if self.serial and self.serial.is_open:
             self.serial.close()
 
     def send_command(self, command):
-        """Sendet einen Befehl an Arduino"""
-        if self.serial and self.serial.is_open:
-            try:
-                self.serial.write((command + "\n").encode())
-                self.serial.flush()
-                return True
-            except Exception as e:
-                print(f"Serial Send Error: {e}")
-                return False
-        return False
+        """Reiht einen Befehl an Arduino ein - blockiert nie"""
+        if self._open_serial() is None:
+            return False
+        return self.writer.submit(command)
+
+    def _open_serial(self):
+        ser = self.serial
+        return ser if ser is not None and ser.is_open else None
 
     def _serial_thread(self):
         """Hauptthread für Serial-Kommunikation"""
         while self.running:
             if not self.serial or not self.serial.is_open:
-                self._try_connect()
-                time.sleep(SERIAL_RECONNECT_INTERVAL)
+                if not self._try_connect():
+                    self._stopped.wait(SERIAL_RECONNECT_INTERVAL)
             else:
                 self._read_data()
-            time.sleep(0.05)
 
     def _try_connect(self):
         if self.on_connection_changed:
             self.on_connection_changed(False, "Suche Arduino...")
 
-        for port in serial.tools.list_ports.comports():
-            try:
-                ser = serial.Serial(port.device, SERIAL_BAUDRATE, timeout=SERIAL_TIMEOUT)
-                time.sleep(3)  # Arduino Boot-Zeit
-
-                # Nur Test-Befehl: STATUS (oder leer)
-                ser.write(b"STATUS\n")
-                ser.flush()
-                time.sleep(0.5)
-
-                # Auf erste Antwort warten
-                if ser.in_waiting > 0:
-                    # Erfolg: Arduino gefunden
-                    self.serial = ser
-                    self.connected = True
-                    if self.on_connection_changed:
-                        self.on_connection_changed(True, f"Verbunden: {port.device}")
-                    return
-                ser.close()
-            except:
-                pass
+        ports = [ListPortInfo(self.port)] if self.port else None
+        found = self.discovery.find(ports)
+        if found is None:
+            return False
+
+        # Erfolg: Arduino gefunden
+        ser, port = found
+        if not self.running:
+            ser.close()
+            return False
+        self.discovery.remember(port)
+        ser.timeout = SERIAL_READ_TIMEOUT
+        ser.write_timeout = SERIAL_WRITE_TIMEOUT
+        self.writer.clear()
+        self.decoder.reset()
+        self.serial = ser
+        self.connected = True
+        if self.on_connection_changed:
+            self.on_connection_changed(True, f"Verbunden: {port.device}")
+        if self.binary_requested:
+            self.send_command(BINARY_COMMAND)
+        return True
 
     def _read_data(self):
-        """Liest Daten von Arduino"""
+        """Liest alle verfügbaren Bytes von Arduino"""
         try:
-            if self.serial.in_waiting > 0:
-                line = self.serial.readline().decode(errors='ignore').strip()
-                if line and self.on_data_received:
-                    self.on_data_received(line)
+            # Blockiert bis mindestens ein Byte da ist, danach alles
+            # bereits Gepufferte in einem einzigen read()
+            data = self.serial.read(self.serial.in_waiting or 1)
+            if data:
+                self.decoder.feed(data)
 
         except Exception as e:
-            self.serial = None
+            lost, self.serial = self.serial, None
             self.connected = False
-            if self.on_connection_changed:
+            self.writer.clear()
+            try:
+                lost.close()
+            except Exception:
+                pass
+            if self.running and self.on_connection_changed:
                 self.on_connection_changed(False, f"Verbindung verloren: {e}")
+
+    def _on_line(self, line):
+        if self.on_data_received:
+            self.on_data_received(line)
+
+    def _on_snapshot(self, snapshot):
+        if self.on_snapshot:
+            self.on_snapshot(snapshot)
+
+    def _on_can_frames(self, frames):
+        if self.on_can_frames:
+            self.on_can_frames(frames)
+
+    def _on_protocol_changed(self, binary):
+        if self.on_connection_changed:
+            self.on_connection_changed(True, protocol_message(binary))
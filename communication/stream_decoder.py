@@ -0,0 +1,140 @@
+"""
+Empfangs-Decoder
+Zerlegt den Byte-Strom des Sketches in Zeilen, Text-Status-Blöcke und Binär-Frames
+"""
+
+import time
+
+from communication.frame_assembler import FrameAssembler
+from communication.binary_protocol import (
+    ACK_PREFIX, SYNC, FRAME, FLAG_ENGINE_RUNNING, KIND_CAN, CAN_FRAME,
+    decode_frame, can_frame_valid, status_name
+)
+from models.vehicle import VehicleSnapshot
+from config.settings import SERIAL_RX_BUFFER_LIMIT
+
+
+class StreamDecoder:
+    def __init__(self):
+        # Empfangspuffer (wird wiederverwendet, nie neu angelegt)
+        self._rx_buffer = bytearray()
+        self.assembler = FrameAssembler()
+        self.binary = False
+        # Weitergeleitete CAN-Frames eines Durchlaufs - gesammelt ausgeliefert
+        self._can_batch = bytearray()
+
+        # Statistik Binärprotokoll
+        self.binary_frames = 0
+        self.can_frames = 0
+        self.frame_errors = 0
+        self.frames_lost = 0
+        self._last_seq = None
+
+        # Callbacks
+        self.on_line = None
+        self.on_snapshot = None
+        self.on_protocol_changed = None   # (binary)
+        self.on_can_frames = None         # (bytes aus CAN_FRAME-Einträgen)
+
+    def reset(self):
+        """Neue Verbindung - angefangene Daten verwerfen, Sketch spricht wieder Text"""
+        self._rx_buffer.clear()
+        self.assembler.reset()
+        self.binary = False
+        self._last_seq = None
+
+    def feed(self, data):
+        self._rx_buffer += data
+        self._process_buffer()
+
+    def _process_buffer(self):
+        """Liefert Binär-Frames und jede vollständige Zeile aus, Text-Blöcke werden zusammengesetzt"""
+        buf = self._rx_buffer
+        size = len(buf)
+        start = 0
+        while start < size:
+            if buf[start] == SYNC:
+                if size - start < 2:
+                    break
+                if buf[start + 1] == KIND_CAN:
+                    if size - start < CAN_FRAME.size:
+                        break
+                    if can_frame_valid(buf, start):
+                        self._can_batch += buf[start:start + CAN_FRAME.size]
+                        start += CAN_FRAME.size
+                    else:
+                        self.frame_errors += 1
+                        start += 1
+                    continue
+                if size - start < FRAME.size:
+                    break
+                fields = decode_frame(buf, start)
+                if fields is None:
+                    # Kein gültiger Frame - ein Byte weiter neu synchronisieren
+                    self.frame_errors += 1
+                    start += 1
+                    continue
+                start += FRAME.size
+                self._publish_frame(fields)
+                continue
+
+            end = buf.find(b'\n', start)
+            if end < 0:
+                break
+            if self.binary:
+                # Rest eines angeschnittenen Frames vor dem nächsten Sync verwerfen
+                sync = buf.find(SYNC, start, end)
+                if sync >= 0:
+                    start = sync
+                    continue
+            line = buf[start:end].decode(errors='ignore').strip()
+            start = end + 1
+            if line.startswith(ACK_PREFIX):
+                self._on_ack(line)
+            if line and self.on_line:
+                self.on_line(line)
+
+            snapshot = self.assembler.feed(line)
+            if snapshot is not None and self.on_snapshot:
+                self.on_snapshot(snapshot)
+
+        if self._can_batch:
+            self.can_frames += len(self._can_batch) // CAN_FRAME.size
+            if self.on_can_frames:
+                self.on_can_frames(bytes(self._can_batch))
+            self._can_batch.clear()
+
+        if start:
+            del buf[:start]
+        elif len(buf) > SERIAL_RX_BUFFER_LIMIT:
+            # Kein Zeilenende in Sicht - Müll verwerfen
+            buf.clear()
+
+    def _publish_frame(self, fields):
+        seq, flags, millis, rpm, speed, gear, throttle, status = fields
+        if not self.binary:
+            self._on_ack(ACK_PREFIX + "BINARY")
+        if self._last_seq is not None:
+            self.frames_lost += (seq - self._last_seq - 1) & 0xFF
+        self._last_seq = seq
+        self.binary_frames += 1
+        if self.on_snapshot:
+            self.on_snapshot(VehicleSnapshot(
+                engine_running=bool(flags & FLAG_ENGINE_RUNNING), rpm=rpm,
+                speed=speed, gear=gear, throttle=throttle,
+                rpm_status=status_name(status), timestamp_ns=time.monotonic_ns()
+            ))
+
+    def _on_ack(self, line):
+        """Protokollwechsel des Sketches übernehmen"""
+        binary = line.startswith(ACK_PREFIX + "BINARY")
+        if binary == self.binary:
+            return
+        self.binary = binary
+        self._last_seq = None
+        if self.on_protocol_changed:
+            self.on_protocol_changed(binary)
+
+
+def protocol_message(binary):
+    return "Binärprotokoll aktiv" if binary else "Textprotokoll aktiv"
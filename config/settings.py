@@ -2,15 +2,58 @@
 Konfiguration für den Fahrzeug-Simulator
 """
 
+import os
+
 # Serial Kommunikation
+SERIAL_PORT = None              # z.B. '/dev/ttyACM0' - None = automatisch suchen
 SERIAL_BAUDRATE = 115200
-SERIAL_TIMEOUT = 3
+SERIAL_TIMEOUT = 3              # s - Handshake nach Reset (Arduino Boot-Zeit)
 SERIAL_RECONNECT_INTERVAL = 2.0
+SERIAL_READ_TIMEOUT = 0.5       # s - max. Blockierzeit eines Lesevorgangs
+SERIAL_RX_BUFFER_LIMIT = 4096   # Bytes - Puffer ohne Zeilenende wird verworfen
+SERIAL_WRITE_TIMEOUT = 1.0      # s - hängender Port blockiert nur den Writer-Thread
+COMMAND_QUEUE_SIZE = 32         # ausstehende Befehle, danach Gegendruck
+SERIAL_BINARY_PROTOCOL = True   # Binär-Frames anfragen (Fallback: Textprotokoll)
+SUBSCRIBER_QUEUE_SIZE = 256     # Snapshots pro Abonnent, danach fallen die ältesten heraus
+
+# OBD-II Abfrage (communication/pid_scheduler.py)
+CAN_BITRATE = 500000
+CAN_FRAME_BITS = 125              # 11-Bit-Frame mit 8 Datenbytes inkl. Bit-Stuffing (ca.)
+PID_POLL_RATES = {                # PID -> Hz
+    0x0C: 50,                     # Drehzahl
+    0x0D: 20,                     # Geschwindigkeit
+    0x11: 20,                     # Drosselklappe
+    0x04: 10,                     # Motorlast
+    0x05: 1,                      # Kühlmittel
+}
+OBD_MAX_PIDS_PER_REQUEST = 6
+OBD_MAX_IN_FLIGHT = 2             # Anfragen ohne Antwort (Pipelining)
+OBD_REQUEST_TIMEOUT_MS = 50       # P2-Timeout des Steuergeräts
+OBD_BUS_BUDGET = 0.3              # Anteil der Bus-Zeit für die Abfrage
+ECU_RESPONSE_MS = 2.0             # Antwortzeit des emulierten Steuergeräts
+
+# Telemetrie-Verteiler (python -m telemetry.server)
+TELEMETRY_HOST = '127.0.0.1'
+TELEMETRY_PORT = 8765
+TELEMETRY_CLIENT_QUEUE = 512    # Nachrichten pro Client, danach fallen die ältesten heraus
+
+# Ohne GUI (python main.py --headless)
+HEADLESS_PRINT_INTERVAL = 1.0   # s - Statuszeile auf der Konsole, 0 = aus
+HEADLESS_RECORD_QUEUE = 65536   # Snapshots - Puffer der Aufzeichnung (> 1 min bei 1000/s)
+
+# Port-Suche
+PORT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.obd2_learning_port.json')
+DISCOVERY_MAX_WORKERS = 8       # Ports gleichzeitig prüfen
+
+# Übergabe Serial-Thread -> GUI
+HANDOFF_LOG_CAPACITY = 1000     # Zeilen - ältere fallen heraus
 
 # GUI Update-Raten
-GUI_UPDATE_RATE = 50        # ms - Hauptdisplay
-SERIAL_READ_RATE = 50       # ms - Serial lesen
-KEY_INPUT_RATE = 50         # ms - Gas kontinuierlich
+GUI_MAX_FPS = 30            # Frames/s - Obergrenze bei neuen Daten
+GUI_HEARTBEAT_MS = 500      # ms - Takt ohne neue Daten / minimiert
+GUI_IDLE_TIMEOUT = 1.0      # s - ohne Daten gilt die Verbindung als ruhig
+KEY_INPUT_RATE = 100        # ms - Gas/Bremse kontinuierlich (unter 200 ms Gas-Timeout des Sketches)
+KEY_RELEASE_DEBOUNCE_MS = 30  # ms - Release/Press-Paare der Auto-Repeat-Funktion zusammenfassen
 
 # Fahrzeug-Parameter
 ENGINE_IDLE_RPM = 850
@@ -18,6 +61,10 @@ ENGINE_MAX_RPM = 7000
 ENGINE_REDLINE_RPM = 6500
 MAX_SPEED = 200
 MAX_GEARS = 5
+HISTORY_SECONDS = 3600      # s - Verlauf bei voller Rate
+HISTORY_RATE_HZ = 100       # Status-Blöcke/s im Binärprotokoll (Text: 10)
+HISTORY_CAPACITY = HISTORY_SECONDS * HISTORY_RATE_HZ   # höchstens ca. 16 MB
+HISTORY_CHUNK = 60 * HISTORY_RATE_HZ   # erste Belegung beim ersten Snapshot, danach verdoppelt
 
 # Farben (Hex)
 COLORS = {
@@ -35,7 +82,24 @@ COLORS = {
 # GUI Dimensionen
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 1080
+CHART_HEIGHT = 120          # px - Verlaufsanzeige
+CHART_SECONDS = 60          # s - sichtbarer Zeitraum
+
+# Telemetrie-Aufzeichnung
+RECORDING_ENABLED = False
+RECORDING_DIR = 'recordings'
+RECORDING_FSYNC_INTERVAL = 1.0  # s - spätestens dann liegt alles auf der Platte
+RECORDING_BUFFER_SIZE = 65536   # Bytes - Schreibpuffer
+
+# Auswertung von Aufzeichnungen (python -m telemetry.analytics)
+RPM_BANDS = (800, 3000, 5000, 6500)  # Grenzen der RPM-Bereiche (siehe README)
+SPEED_BIN_KMH = 10              # Breite der Klassen in der Geschwindigkeitsverteilung
+SHIFT_UP_GRACE = 1.0            # s - so lange nach SHIFT_UP zählt Hochschalten noch
+ANALYTICS_MAX_GAP = 1.0         # s - längere Lücken (Verbindung weg) zählen nicht als Fahrzeit
+ANALYTICS_CACHE_FILE = '.analytics_cache.json'  # im Aufzeichnungs-Ordner
+ANALYTICS_MAX_WORKERS = None    # Prozesse - None = alle Kerne
 
 # Debug-Modus
 DEBUG_MODE = True
 LOG_SERIAL_DATA = True
+LOG_MAX_LINES = 500         # Zeilen pro Log-Fenster
@@ -1,15 +1,262 @@
 
+import importlib.util
+import os
+import threading
+import time
 import tkinter as tk
-from datetime import datetime
+from collections import deque
 
 # Lokale Imports
-from models.vehicle import Vehicle
+from models.vehicle import Vehicle, rpm_color, shift_recommendation
 from communication.serial_handler import SerialHandler
+from communication.gui_channel import GuiChannel
+from communication.obd_pids import apply_frames, carry_obd_fields
+from gui.render_cache import WidgetRenderer
+from gui.log_view import LogView
+from telemetry.recorder import TelemetryRecorder
+from telemetry.latency import LatencyTracer
 from input.keyboard_handler import KeyboardHandler
 from config.settings import *
 
+class RenderScheduler:
+    """Rendert bei neuen Daten (max. GUI_MAX_FPS), sonst nur im Heartbeat-Takt"""
+
+    def __init__(self, window, tick, max_fps=GUI_MAX_FPS,
+                 heartbeat_ms=GUI_HEARTBEAT_MS, idle_timeout=GUI_IDLE_TIMEOUT):
+        self.window = window
+        self.tick = tick                    # -> True, wenn ein Frame gerendert wurde
+        self.frame_interval = 1.0 / max_fps
+        self.heartbeat_ms = heartbeat_ms
+        self.idle_timeout = idle_timeout
+        self.minimized = False
+
+        self._after_id = None
+        self._due = 0.0                     # geplanter Zeitpunkt des nächsten Ticks
+        self._last_frame = 0.0
+        self._last_data = 0.0
+        self._frame_times = deque(maxlen=2 * max_fps)
+
+        # Weckpipe: Serial-Thread -> Tk-Eventloop (nur wo Tk Filehandler kann)
+        self._wake_pending = False
+        self._wake_r = self._wake_w = None
+        try:
+            self._wake_r, self._wake_w = os.pipe()
+            os.set_blocking(self._wake_w, False)
+            window.tk.createfilehandler(self._wake_r, tk.READABLE, self._on_wake)
+        except (AttributeError, RuntimeError, OSError, tk.TclError):
+            self._close_pipe()
+
+        window.bind('<Map>', self._on_map, add='+')
+        window.bind('<Unmap>', self._on_map, add='+')
+
+    @property
+    def event_driven(self):
+        return self._wake_r is not None
+
+    def start(self):
+        self._schedule(0)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        if self.event_driven:
+            self.window.tk.deletefilehandler(self._wake_r)
+        self._close_pipe()
+
+    def wake(self):
+        """Neue Daten - darf aus jedem Thread aufgerufen werden"""
+        self._last_data = time.monotonic()
+        if self._wake_w is not None and not self._wake_pending:
+            self._wake_pending = True
+            try:
+                os.write(self._wake_w, b'\0')
+            except OSError:
+                pass
+
+    def _on_wake(self, fd, mask):
+        self._wake_pending = False
+        try:
+            os.read(fd, 512)
+        except OSError:
+            pass
+        if not self.minimized:
+            # Frame so früh wie das FPS-Limit erlaubt
+            self._schedule(self._last_frame + self.frame_interval - time.monotonic())
+
+    def _on_map(self, event):
+        if event.widget is self.window:
+            self.minimized = event.type == tk.EventType.Unmap
+            if not self.minimized:
+                self._schedule(0)
+
+    def _run(self):
+        self._after_id = None
+        now = time.monotonic()
+        if self.tick():
+            self._last_frame = now
+            self._frame_times.append(now)
+        self._schedule(self._next_delay(now))
+
+    def _next_delay(self, now):
+        heartbeat = self.heartbeat_ms / 1000.0
+        if self.minimized or self.event_driven:
+            # Neue Daten wecken uns ohnehin über die Pipe
+            return heartbeat
+        if now - self._last_data > self.idle_timeout:
+            return heartbeat
+        return self.frame_interval
+
+    def _schedule(self, delay):
+        """Plant den nächsten Tick, ein früherer Termin gewinnt"""
+        delay = max(0.0, delay)
+        due = time.monotonic() + delay
+        if self._after_id is not None:
+            if due >= self._due:
+                return
+            self.window.after_cancel(self._after_id)
+        self._due = due
+        self._after_id = self.window.after(int(delay * 1000), self._run)
+
+    def _close_pipe(self):
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    @property
+    def fps(self):
+        """Tatsächlich erreichte Frames/s (gleitend)"""
+        times = self._frame_times
+        if len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    @property
+    def jitter_ms(self):
+        """Standardabweichung der Frame-Abstände in ms"""
+        times = list(self._frame_times)
+        if len(times) < 3:
+            return 0.0
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        mean = sum(gaps) / len(gaps)
+        return (sum((g - mean) ** 2 for g in gaps) / len(gaps)) ** 0.5 * 1000.0
+
+
+class StripChart:
+    """Laufender Verlauf von Drehzahl, Geschwindigkeit und Gas - eine Polylinie pro Signal
+
+    add() läuft im Serial-Thread für jeden Snapshot, render() im GUI-Takt.
+    """
+
+    # Signal -> (Vollausschlag, Farbe)
+    SIGNALS = {
+        'rpm': (ENGINE_MAX_RPM, COLORS['success']),
+        'speed': (MAX_SPEED, COLORS['info']),
+        'throttle': (100, COLORS['warning']),
+    }
+
+    def __init__(self, parent, renderer, history, seconds=CHART_SECONDS,
+                 width=WINDOW_WIDTH - 40, height=CHART_HEIGHT):
+        self.renderer = renderer
+        self.history = history
+        self.seconds = seconds
+        self.height = height
+        self.canvas = tk.Canvas(
+            parent, width=width, height=height,
+            bg=COLORS['background'], highlightthickness=0
+        )
+        self.lines = {
+            name: self.canvas.create_line(0, height, 1, height, fill=color)
+            for name, (_, color) in self.SIGNALS.items()
+        }
+        # Pro Pixelspalte ein Eimer: [Eimer-Nr, min, max je Signal ...]
+        self._buckets = deque()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._resize(width)
+        self.canvas.bind('<Configure>', self._on_configure)
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+    def _resize(self, width):
+        # Neu einsortieren - nur bei Größenänderung, nicht pro Frame
+        names = ('timestamp_ns',) + tuple(self.SIGNALS)
+        with self._lock:
+            # Unter der eigenen Sperre lesen: add() danach landet sicher in den neuen
+            # Eimern, doppelt Gezähltes ändert min/max nicht
+            columns = self.history.values_many(names, self.seconds)
+            self.width = max(2, width)
+            self.bucket_ns = max(1, int(self.seconds * 1e9) // self.width)
+            self._buckets.clear()
+            for values in zip(*columns):
+                self._add(values[0], values[1:])
+            self._dirty = True
+
+    def _on_configure(self, event):
+        if event.width != self.width:
+            self._resize(event.width)
+
+    def add(self, snapshot):
+        """Jeder Snapshot - auch kurze Spitzen landen im min/max ihres Eimers"""
+        with self._lock:
+            self._add(snapshot.timestamp_ns, (snapshot.rpm, snapshot.speed, snapshot.throttle))
+
+    def _add(self, timestamp_ns, values):
+        number = timestamp_ns // self.bucket_ns
+        buckets = self._buckets
+        if buckets and buckets[-1][0] == number:
+            bucket = buckets[-1]
+            for i, value in enumerate(values):
+                if value < bucket[1 + 2 * i]:
+                    bucket[1 + 2 * i] = value
+                elif value > bucket[2 + 2 * i]:
+                    bucket[2 + 2 * i] = value
+        else:
+            if buckets and buckets[-1][0] > number:
+                # Zeitsprung zurück (Wiedergabe) - neu beginnen
+                buckets.clear()
+            bucket = [number]
+            for value in values:
+                bucket += (value, value)
+            buckets.append(bucket)
+            while number - buckets[0][0] >= self.width:
+                buckets.popleft()
+        self._dirty = True
+
+    def render(self):
+        """Setzt die Koordinaten der Linien - Kosten abhängig von der Breite"""
+        with self._lock:
+            if not self._dirty or not self._buckets:
+                return
+            self._dirty = False
+            lines = self._coords()
+        # Tk-Aufrufe ohne Lock - der Serial-Thread wartet nie auf Tcl
+        for name, coords in lines.items():
+            self.renderer.coords(self.canvas, self.lines[name], *coords)
+
+    def _coords(self):
+        newest = self._buckets[-1][0]
+        right = self.width - 1
+        bottom = self.height - 2
+        lines = {}
+        for i, (name, (full_scale, _)) in enumerate(self.SIGNALS.items()):
+            scale = (self.height - 4) / full_scale
+            lo, hi = 1 + 2 * i, 2 + 2 * i
+            coords = []
+            for bucket in self._buckets:
+                x = right - (newest - bucket[0])
+                coords += (x, bottom - bucket[lo] * scale, x, bottom - bucket[hi] * scale)
+            if len(coords) < 4:
+                coords += coords
+            lines[name] = coords
+        return lines
+
+
 class CarDashboard(tk.Tk):
-    def __init__(self):
+    def __init__(self, port=SERIAL_PORT, record=RECORDING_ENABLED, source=None,
+                 latency_export=None):
         super().__init__()
 
         # Fenster-Konfiguration
@@ -20,23 +267,59 @@ class CarDashboard(tk.Tk):
         # Datenmodell
         self.vehicle = Vehicle()
 
-        # Kommunikation
-        self.serial_handler = SerialHandler()
-        self.serial_handler.on_data_received = self.process_serial_data
-        self.serial_handler.on_connection_changed = self.on_connection_changed
+        # Kommunikation (Callbacks laufen im Serial-Thread -> nur in den Kanal)
+        # source ersetzt die serielle Verbindung, z.B. durch eine Wiedergabe
+        self.channel = GuiChannel()
+        self.serial_handler = source or SerialHandler(port)
+        self.recorder = None
+        self._recorder_stop = threading.Event()
+        self._recorder_sync = None
+        if record:
+            # fsync nie im Serial-Thread - ein eigener Thread synchronisiert periodisch
+            self.recorder = TelemetryRecorder.create_session(RECORDING_DIR, fsync_interval=None)
+            self._recorder_sync = threading.Thread(target=self._sync_recording, daemon=True)
+            self._recorder_sync.start()
+        if LOG_SERIAL_DATA or self.recorder:
+            self.serial_handler.on_data_received = self._post_line
+        self.serial_handler.on_snapshot = self._post_snapshot
+        self.serial_handler.on_connection_changed = self._post_connection
+        # Weitergeleitete OBD-II-Antworten (CAN) - Massen-Dekodierung braucht NumPy
+        self._latest_snapshot = None
+        if importlib.util.find_spec('numpy') is not None:
+            self.serial_handler.on_can_frames = self._post_can_frames
+
+        # Latenz Taste -> Pixel
+        self.tracer = LatencyTracer()
+        self.latency_export = latency_export    # Pfad für die Auswertung beim Beenden
+        self._key_ns = {}
+        writer = getattr(self.serial_handler, 'writer', None)
+        if writer:
+            writer.on_written = self.tracer.commands_written
 
         # Eingaben
         self.keyboard_handler = KeyboardHandler(self)
-        self.keyboard_handler.on_gas_continuous = lambda: self.send_command("THROTTLE")
-        self.keyboard_handler.on_brake_continuous = lambda: self.send_command("BRAKE")
+        self.keyboard_handler.on_gas_continuous = lambda: self.send_command(
+            "THROTTLE", self._key_ns.pop('gas', None))
+        self.keyboard_handler.on_brake_continuous = lambda: self.send_command(
+            "BRAKE", self._key_ns.pop('brake', None))
+
+        # Logs sammeln schon vor ihren Widgets (Panels kommen erst nach dem ersten Bild)
+        self.sent_view = LogView(None)
+        self.recv_view = LogView(None, enabled=LOG_SERIAL_DATA)
+        self.chart = None
+
+        # Port-Suche (Reset + Handshake dauert) läuft, während die Widgets entstehen;
+        # der Scheduler muss dafür schon existieren - der Serial-Thread weckt ihn
+        self.scheduler = RenderScheduler(self, self.update_display)
+        self.serial_handler.start()
 
         # GUI erstellen
+        self.renderer = WidgetRenderer()
+        self._rendered_snapshot = None
         self.create_gui()
 
-        # Starten
-        self.serial_handler.start()
         self.keyboard_handler.start()
-        self.update_display()
+        self.scheduler.start()
 
         # Schließen-Handler
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -68,16 +351,39 @@ class CarDashboard(tk.Tk):
             fg=COLORS['error'], bg='#333333'
         )
         self.conn_status.pack(side='left', padx=10)
+        if DEBUG_MODE:
+            self.channel_status = tk.Label(
+                status_frame, text="",
+                font=('Arial', 10),
+                fg=COLORS['text_gray'], bg='#333333'
+            )
+            self.channel_status.pack(side='left', padx=10)
         self._create_key_indicators(status_frame)
 
         # Hauptanzeigen
         self._create_main_displays()
 
+        # Verlauf (Platz reserviert, Inhalt nach dem ersten Bild)
+        self._chart_slot = tk.Frame(self, bg=COLORS['background'])
+        self._chart_slot.pack(fill='x')
+
         # Steuer-Buttons
         self._create_controls()
 
-        # Logs
-        self._create_logs()
+        # Logs (ebenso)
+        self._log_slot = tk.Frame(self, bg=COLORS['background'])
+        self._log_slot.pack(fill='both', expand=True)
+        self.after_idle(self._create_optional_panels)
+
+        # Debug-Overlay: Latenz Taste -> Pixel, oben rechts über allem
+        if DEBUG_MODE:
+            self.latency_overlay = tk.Label(
+                self, text="", justify='left',
+                font=('Courier', 9),
+                fg=COLORS['info'], bg=COLORS['background']
+            )
+            self.latency_overlay.place(relx=1.0, x=-15, y=75, anchor='ne')
+            self._overlay_at = 0.0
 
     def _create_key_indicators(self, parent):
         keys_frame = tk.Frame(parent, bg='#333333')
@@ -167,6 +473,34 @@ class CarDashboard(tk.Tk):
             2, 2, 2, 18, fill=COLORS['warning']
         )
 
+    def _create_optional_panels(self):
+        """Verlauf und Logs - erst wenn Anzeigen und Steuerung stehen"""
+        self._create_chart()
+        self._create_logs()
+        # Nächster Tick zeichnet alles neu, inkl. Verlauf aus der Historie
+        self._rendered_snapshot = None
+
+    def _create_chart(self):
+        chart_frame = tk.Frame(self._chart_slot, bg=COLORS['panel'])
+        chart_frame.pack(fill='x', padx=10, pady=5)
+        legend = tk.Frame(chart_frame, bg=COLORS['panel'])
+        legend.pack(fill='x')
+        for text, color in [("DREHZAHL", COLORS['success']),
+                            ("GESCHWINDIGKEIT", COLORS['info']),
+                            ("GAS", COLORS['warning'])]:
+            tk.Label(
+                legend, text=text,
+                font=('Arial', 10, 'bold'),
+                fg=color, bg=COLORS['panel']
+            ).pack(side='left', padx=10)
+        tk.Label(
+            legend, text=f"letzte {CHART_SECONDS} s",
+            font=('Arial', 10),
+            fg=COLORS['text_gray'], bg=COLORS['panel']
+        ).pack(side='right', padx=10)
+        self.chart = StripChart(chart_frame, self.renderer, self.vehicle.history)
+        self.chart.pack(fill='x', padx=10, pady=5)
+
     def _create_controls(self):
         ctrl = tk.Frame(self, bg='#333333')
         ctrl.pack(fill='x', padx=10, pady=15)
@@ -219,7 +553,7 @@ class CarDashboard(tk.Tk):
         ).pack(pady=5)
 
     def _create_logs(self):
-        log_container = tk.Frame(self, bg='#444444')
+        log_container = tk.Frame(self._log_slot, bg='#444444')
         log_container.pack(fill='both', expand=True, padx=10, pady=10)
         sent_frame = tk.Frame(log_container, bg='#444444')
         sent_frame.pack(side='left', fill='both', expand=True, padx=5)
@@ -234,6 +568,7 @@ class CarDashboard(tk.Tk):
             font=('Courier', 9), state='disabled'
         )
         self.sent_log.pack(fill='both', expand=True)
+        self.sent_view.attach(self.sent_log)
         recv_frame = tk.Frame(log_container, bg='#444444')
         recv_frame.pack(side='right', fill='both', expand=True, padx=5)
         tk.Label(
@@ -247,74 +582,205 @@ class CarDashboard(tk.Tk):
             font=('Courier', 9), state='disabled'
         )
         self.recv_log.pack(fill='both', expand=True)
+        self.recv_view.attach(self.recv_log)
 
-    def send_command(self, cmd):
+    # Tastatur-Hooks (KeyboardHandler)
+
+    def toggle_engine(self):
+        self.send_command("ENGINE_TOGGLE", time.monotonic_ns())
+
+    def shift_up(self):
+        self.send_command("SHIFT_UP", time.monotonic_ns())
+
+    def shift_down(self):
+        self.send_command("SHIFT_DOWN", time.monotonic_ns())
+
+    def on_gas_press(self):
+        # Zeitpunkt für den ersten THROTTLE dieses Tastendrucks
+        self._key_ns['gas'] = time.monotonic_ns()
+        self.renderer.config(self.key_indicators['gas'], fg=COLORS['warning'])
+
+    def on_gas_release(self):
+        self.renderer.config(self.key_indicators['gas'], fg='#666666')
+
+    def on_brake_press(self):
+        self._key_ns['brake'] = time.monotonic_ns()
+        self.renderer.config(self.key_indicators['brake'], fg=COLORS['error'])
+
+    def on_brake_release(self):
+        self.renderer.config(self.key_indicators['brake'], fg='#666666')
+
+    def send_command(self, cmd, key_ns=None):
         success = self.serial_handler.send_command(cmd)
         if success:
-            self._log(self.sent_log, f"{cmd}")
+            self.tracer.command_queued(cmd, self.vehicle.snapshot, key_ns)
+        if not LOG_SERIAL_DATA:
+            return
+        if success:
+            self.sent_view.append(f"{cmd}")
         else:
-            self._log(self.sent_log, f"{cmd} (keine Verbindung)")
+            self.sent_view.append(f"{cmd} (keine Verbindung)")
 
     def process_serial_data(self, line):
         if not line.startswith("---"):
-            self._log(self.recv_log, line)
-        if ':' in line:
-            key, value = line.split(':', 1)
-            self.vehicle.update_from_data(key.strip(), value.strip())
+            self.recv_view.append(line)
+
+    def process_snapshot(self, snapshot):
+        self.vehicle.apply_snapshot(snapshot)
 
     def on_connection_changed(self, connected, message):
-        self.conn_status.config(
+        self.renderer.config(
+            self.conn_status,
             text="VERBUNDEN" if connected else "GETRENNT",
             fg=COLORS['success'] if connected else COLORS['error']
         )
-        self._log(self.sent_log, message)
+        self.sent_view.append(message)
+
+    def _post_line(self, line):
+        # Serial-Thread
+        if self.recorder:
+            self.recorder.record_line(line)
+        if LOG_SERIAL_DATA:
+            self.channel.post_line(line)
+
+    def _post_snapshot(self, snapshot):
+        # Serial-Thread
+        if self._latest_snapshot is not None:
+            snapshot = carry_obd_fields(snapshot, self._latest_snapshot)
+        self._latest_snapshot = snapshot
+        if self.recorder:
+            keys = self.keyboard_handler.keys_pressed
+            self.recorder.record(snapshot, keys['gas'], keys['brake'])
+        self.tracer.snapshot_received(snapshot)
+        # Verlauf und Diagramm-Eimer bekommen jeden Snapshot - der Kanal liefert
+        # der GUI nur den neuesten, gezeichnet wird erst im GUI-Takt
+        self.vehicle.record(snapshot)
+        chart = self.chart
+        if chart is not None:
+            chart.add(snapshot)
+        self.channel.post_snapshot(snapshot)
+        self.scheduler.wake()
+
+    def _post_can_frames(self, buffer):
+        # Serial-Thread: letzte OBD-Werte auf den aktuellen Stand -> eigener Snapshot
+        latest = self._latest_snapshot
+        if latest is None:
+            return
+        snapshot = apply_frames(latest, buffer)
+        if snapshot is not latest:
+            self._post_snapshot(snapshot.replace(timestamp_ns=time.monotonic_ns()))
+
+    def _post_connection(self, connected, message):
+        # Serial-Thread
+        self.channel.post_connection(connected, message)
+        self.scheduler.wake()
+
+    def _drain_channel(self):
+        """Übernimmt alles, was der Serial-Thread seit dem letzten Tick geliefert hat"""
+        snapshot, lines, events = self.channel.drain()
+        for connected, message in events:
+            self.on_connection_changed(connected, message)
+        for line in lines:
+            self.process_serial_data(line)
+        if snapshot is not None:
+            self.process_snapshot(snapshot)
+        self.sent_view.flush()
+        self.recv_view.flush()
+
+        if DEBUG_MODE:
+            stats = self.channel.stats()
+            text = (
+                f"Zusammengefasst: {stats['coalesced']}  "
+                f"Verworfen: {stats['dropped_lines']}  "
+                f"Frame: {self.renderer.avg_frame_ms:.1f} ms  "
+                f"FPS: {self.scheduler.fps:.0f}  "
+                f"Jitter: {self.scheduler.jitter_ms:.1f} ms"
+            )
+            writer = getattr(self.serial_handler, 'writer', None)
+            if writer:
+                text += f"  Befehle: {writer.depth}"
+            self.renderer.config(self.channel_status, text=text)
+
+            # Perzentile reichen einmal pro Sekunde
+            now = time.monotonic()
+            if now - self._overlay_at >= 1.0:
+                self._overlay_at = now
+                self.renderer.config(self.latency_overlay, text=self.tracer.overlay_text())
 
     def update_display(self):
+        """Ein Scheduler-Tick - True, wenn ein neuer Snapshot gerendert wurde"""
+        self._drain_channel()
+
+        # Ein Snapshot pro Frame - nie gemischte Werte
+        snap = self.vehicle.snapshot
+        if snap is self._rendered_snapshot:
+            return False
+        self._rendered_snapshot = snap
+        self.render_snapshot(snap)
+        self.tracer.snapshot_rendered(snap)
+        return True
+
+    def render_snapshot(self, snap):
+        r = self.renderer
+        r.begin_frame()
+
         # Motor Status
-        if self.vehicle.engine_running:
-            self.engine_label.config(text="MOTOR AN", fg=COLORS['success'])
-            self.engine_btn.config(text="MOTOR STOPPEN", bg='#e74c3c')
+        if snap.engine_running:
+            r.config(self.engine_label, text="MOTOR AN", fg=COLORS['success'])
+            r.config(self.engine_btn, text="MOTOR STOPPEN", bg='#e74c3c')
         else:
-            self.engine_label.config(text="MOTOR AUS", fg=COLORS['error'])
-            self.engine_btn.config(text="MOTOR STARTEN", bg='#27ae60')
+            r.config(self.engine_label, text="MOTOR AUS", fg=COLORS['error'])
+            r.config(self.engine_btn, text="MOTOR STARTEN", bg='#27ae60')
 
         # Werte
-        self.rpm_label.config(
-            text=str(self.vehicle.rpm),
-            fg=self.vehicle.get_rpm_color()
+        r.config(
+            self.rpm_label,
+            text=str(snap.rpm),
+            fg=rpm_color(snap.rpm)
         )
-        self.speed_label.config(text=str(self.vehicle.speed))
-        self.gear_label.config(text=str(self.vehicle.gear))
-        self.throttle_label.config(text=f"{self.vehicle.throttle}%")
-        self._update_throttle_bar()
+        r.config(self.speed_label, text=str(snap.speed))
+        r.config(self.gear_label, text=str(snap.gear))
+        r.config(self.throttle_label, text=f"{snap.throttle}%")
+        self._update_throttle_bar(snap.throttle)
 
         # Schaltempfehlung
-        self.shift_indicator.config(
-            text=self.vehicle.get_shift_recommendation()
+        r.config(
+            self.shift_indicator,
+            text=shift_recommendation(snap.rpm_status)
         )
 
-        # Next update
-        self.after(GUI_UPDATE_RATE, self.update_display)
+        if self.chart is not None:
+            self.chart.render()
+        r.end_frame()
 
-    def _update_throttle_bar(self):
-        bar_width = int((self.vehicle.throttle / 100.0) * 296)
+    def _update_throttle_bar(self, throttle):
+        bar_width = int((throttle / 100.0) * 296)
         color = (
-            COLORS['warning'] if self.vehicle.throttle < 50
-            else COLORS['error'] if self.vehicle.throttle > 50
+            COLORS['warning'] if throttle < 50
+            else COLORS['error'] if throttle > 50
             else '#333333'
         )
-        self.throttle_canvas.coords(self.throttle_bar, 2, 2, 2 + bar_width, 18)
-        self.throttle_canvas.itemconfig(self.throttle_bar, fill=color)
+        self.renderer.coords(self.throttle_canvas, self.throttle_bar, 2, 2, 2 + bar_width, 18)
+        self.renderer.itemconfig(self.throttle_canvas, self.throttle_bar, fill=color)
 
-    def _log(self, widget, msg):
-        ts = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{ts}] {msg}\n"
-        widget.config(state='normal')
-        widget.insert('end', entry)
-        widget.see('end')
-        widget.config(state='disabled')
+    def _sync_recording(self):
+        """Eigener Thread: flush + fsync der Aufzeichnung alle RECORDING_FSYNC_INTERVAL"""
+        while not self._recorder_stop.wait(RECORDING_FSYNC_INTERVAL):
+            self.recorder.sync()
 
     def on_closing(self):
+        self.scheduler.stop()
+        # stop() wartet auf den Serial-Thread - erst danach den Recorder schließen
         self.serial_handler.stop()
         self.keyboard_handler.stop()
+        if self.recorder:
+            self._recorder_stop.set()
+            self._recorder_sync.join()
+            self.recorder.close()
+        # Wiedergabe: Aufzeichnung erst nach dem Stopp des Threads ausblenden
+        close_source = getattr(self.serial_handler, 'close', None)
+        if close_source:
+            close_source()
+        if self.latency_export:
+            self.tracer.export(self.latency_export)
         self.destroy()
\ No newline at end of file
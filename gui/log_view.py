@@ -0,0 +1,67 @@
+"""
+Log-Anzeige mit Zeilenlimit
+Sammelt Einträge in einem Ringpuffer und schreibt sie einmal pro GUI-Tick
+"""
+
+from collections import deque
+from datetime import datetime
+from config.settings import LOG_MAX_LINES
+
+
+class LogView:
+    def __init__(self, text_widget, max_lines=LOG_MAX_LINES, enabled=True):
+        self.widget = text_widget
+        self.max_lines = max_lines
+        self.enabled = enabled
+
+        # Noch nicht geschriebene Einträge - bei Überlauf fallen die ältesten raus
+        self._pending = deque(maxlen=max_lines)
+        self._line_count = 0
+
+    def append(self, msg):
+        """Merkt einen Eintrag vor (thread-sicher, kein Tk-Aufruf)"""
+        if self.enabled:
+            self._pending.append(msg)
+
+    def attach(self, text_widget):
+        """Widget nachträglich setzen - bis dahin Gesammeltes erscheint beim nächsten flush()"""
+        self.widget = text_widget
+
+    def flush(self):
+        """Schreibt alle vorgemerkten Einträge in einem Rutsch ins Widget"""
+        if not self._pending or self.widget is None:
+            return
+        entries = []
+        pop = self._pending.popleft
+        try:
+            for _ in range(len(self._pending)):
+                entries.append(pop())
+        except IndexError:
+            pass
+
+        ts = datetime.now().strftime("[%H:%M:%S] ")
+        text = "".join(f"{ts}{msg}\n" for msg in entries)
+
+        widget = self.widget
+        # Autoscroll nur, wenn der Benutzer nicht hochgescrollt hat
+        follow = widget.yview()[1] >= 0.999
+        widget.config(state='normal')
+        widget.insert('end', text)
+        self._line_count += len(entries)
+        excess = self._line_count - self.max_lines
+        if excess > 0:
+            # Älteste Zeilen auf einmal löschen
+            widget.delete('1.0', f'{excess + 1}.0')
+            self._line_count -= excess
+        widget.config(state='disabled')
+        if follow:
+            widget.see('end')
+
+    def clear(self):
+        self._pending.clear()
+        if self.widget is None:
+            return
+        self.widget.config(state='normal')
+        self.widget.delete('1.0', 'end')
+        self.widget.config(state='disabled')
+        self._line_count = 0
@@ -0,0 +1,114 @@
+"""
+Render-Schicht mit Dirty-Check
+Jeder Tk-Aufruf ist ein Tcl-Roundtrip - unveränderte Werte werden übersprungen
+"""
+
+import time
+
+_MISSING = object()
+
+
+class WidgetRenderer:
+    def __init__(self):
+        # widget -> {option: zuletzt gesetzter Wert}
+        self._applied = {}
+        # (canvas, item) -> [coords|None, {option: wert}] - erst am Frame-Ende
+        self._canvas_pending = {}
+
+        # Statistik
+        self.frames = 0
+        self.calls = 0
+        self.skipped = 0
+        self.last_frame_ms = 0.0
+        self.avg_frame_ms = 0.0
+        self.max_frame_ms = 0.0
+        self.last_frame_calls = 0
+
+        self._frame_start = 0.0
+        self._calls_at_start = 0
+
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self._calls_at_start = self.calls
+
+    def end_frame(self):
+        """Schickt gesammelte Canvas-Änderungen ab und misst die Frame-Kosten"""
+        if self._canvas_pending:
+            for (canvas, item), (coords, options) in self._canvas_pending.items():
+                if coords is not None:
+                    canvas.coords(item, *coords)
+                    self.calls += 1
+                if options:
+                    canvas.itemconfig(item, **options)
+                    self.calls += 1
+            self._canvas_pending.clear()
+
+        elapsed = (time.perf_counter() - self._frame_start) * 1000.0
+        self.frames += 1
+        self.last_frame_ms = elapsed
+        self.last_frame_calls = self.calls - self._calls_at_start
+        self.avg_frame_ms += (elapsed - self.avg_frame_ms) * 0.05
+        if elapsed > self.max_frame_ms:
+            self.max_frame_ms = elapsed
+
+    def config(self, widget, **options):
+        """widget.config() nur mit den Optionen, die sich geändert haben"""
+        applied = self._applied.get(widget)
+        if applied is None:
+            applied = self._applied[widget] = {}
+        changed = {
+            key: value for key, value in options.items()
+            if applied.get(key, _MISSING) != value
+        }
+        if changed:
+            widget.config(**changed)
+            applied.update(changed)
+            self.calls += 1
+        else:
+            self.skipped += 1
+
+    def coords(self, canvas, item, *coords):
+        """Merkt neue Koordinaten für das Frame-Ende vor"""
+        key = (canvas, item, 'coords')
+        if self._applied.get(key) == coords:
+            self.skipped += 1
+            return
+        self._applied[key] = coords
+        self._pending(canvas, item)[0] = coords
+
+    def itemconfig(self, canvas, item, **options):
+        """Merkt geänderte Item-Optionen für das Frame-Ende vor"""
+        key = (canvas, item)
+        applied = self._applied.get(key)
+        if applied is None:
+            applied = self._applied[key] = {}
+        changed = {
+            name: value for name, value in options.items()
+            if applied.get(name, _MISSING) != value
+        }
+        if not changed:
+            self.skipped += 1
+            return
+        applied.update(changed)
+        self._pending(canvas, item)[1].update(changed)
+
+    def forget(self, widget):
+        """Vergisst den Cache eines Widgets (z.B. nach destroy())"""
+        self._applied.pop(widget, None)
+
+    def _pending(self, canvas, item):
+        entry = self._canvas_pending.get((canvas, item))
+        if entry is None:
+            entry = self._canvas_pending[(canvas, item)] = [None, {}]
+        return entry
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'last_frame_ms': self.last_frame_ms,
+            'avg_frame_ms': self.avg_frame_ms,
+            'max_frame_ms': self.max_frame_ms,
+            'last_frame_calls': self.last_frame_calls,
+            'calls': self.calls,
+            'skipped': self.skipped,
+        }
@@ -1,16 +1,23 @@
 """
 Tastatur-Eingaben Handler
-Verwaltet kontinuierliche Tasteneingaben
+Verwaltet kontinuierliche Tasteneingaben über Tk-Timer - ohne gehaltene Taste keine Wakeups
 """
 
-import threading
 import time
-from config.settings import KEY_INPUT_RATE
+from config.settings import KEY_INPUT_RATE, KEY_RELEASE_DEBOUNCE_MS
 
 class KeyboardHandler:
-    def __init__(self, gui_window):
+    # Dauertaste -> Callback-Attribut für die Wiederholung
+    CONTINUOUS = {
+        'gas': 'on_gas_continuous',
+        'brake': 'on_brake_continuous',
+    }
+
+    def __init__(self, gui_window, rate_ms=KEY_INPUT_RATE, debounce_ms=KEY_RELEASE_DEBOUNCE_MS):
         self.window = gui_window
         self.running = False
+        self.rate_ms = rate_ms
+        self.debounce_ms = debounce_ms
 
         # Tastenstatus
         self.keys_pressed = {
@@ -24,17 +31,32 @@ class KeyboardHandler:
         self.on_gas_continuous = None
         self.on_brake_continuous = None
 
+        # Pro Dauertaste: geplante Wiederholung, verzögertes Loslassen, nächster Termin
+        self._repeat_ids = {}
+        self._release_ids = {}
+        self._next_due = {}
+
+        # Statistik
+        self.repeats_sent = 0
+        self.releases_debounced = 0
+
         self._bind_keys()
 
     def start(self):
-        """Startet kontinuierliche Eingabe-Verarbeitung"""
+        """Gibt die Wiederholung frei - Timer laufen nur bei gehaltener Taste"""
         self.running = True
-        self.thread = threading.Thread(target=self._continuous_input_thread, daemon=True)
-        self.thread.start()
+        for key in self.CONTINUOUS:
+            if self.keys_pressed[key] and key not in self._repeat_ids:
+                self._next_due[key] = time.monotonic()
+                self._repeat(key)
 
     def stop(self):
         """Stoppt Eingabe-Verarbeitung"""
         self.running = False
+        for after_ids in (self._repeat_ids, self._release_ids):
+            for after_id in after_ids.values():
+                self.window.after_cancel(after_id)
+            after_ids.clear()
 
     def _bind_keys(self):
         """Bindet Tastatur-Events"""
@@ -61,29 +83,19 @@ class KeyboardHandler:
 
     def _on_gas_press(self, event):
         """Gas-Taste gedrückt"""
-        if not self.keys_pressed['gas']:
-            self.keys_pressed['gas'] = True
-            if hasattr(self.window, 'on_gas_press'):
-                self.window.on_gas_press()
+        self._hold('gas')
 
     def _on_gas_release(self, event):
         """Gas-Taste losgelassen"""
-        self.keys_pressed['gas'] = False
-        if hasattr(self.window, 'on_gas_release'):
-            self.window.on_gas_release()
+        self._release('gas')
 
     def _on_brake_press(self, event):
         """Bremse gedrückt"""
-        if not self.keys_pressed['brake']:
-            self.keys_pressed['brake'] = True
-            if hasattr(self.window, 'on_brake_press'):
-                self.window.on_brake_press()
+        self._hold('brake')
 
     def _on_brake_release(self, event):
         """Bremse losgelassen"""
-        self.keys_pressed['brake'] = False
-        if hasattr(self.window, 'on_brake_release'):
-            self.window.on_brake_release()
+        self._release('brake')
 
     def _on_shift_up(self, event):
         """Hochschalten"""
@@ -95,19 +107,59 @@ class KeyboardHandler:
         if hasattr(self.window, 'shift_down'):
             self.window.shift_down()
 
-    def _continuous_input_thread(self):
-        """Thread für kontinuierliche Eingaben"""
-        while self.running:
-            # Gas kontinuierlich
-            if self.keys_pressed['gas'] and self.on_gas_continuous:
-                self.on_gas_continuous()
-
-            # Bremse kontinuierlich
-            if self.keys_pressed['brake'] and self.on_brake_continuous:
-                self.on_brake_continuous()
-
-            # Pause je nach Aktivität
-            if any(self.keys_pressed.values()):
-                time.sleep(KEY_INPUT_RATE / 1000.0)  # ms zu s
-            else:
-                time.sleep(0.1)  # Längere Pause wenn keine Taste gedrückt
+    def _hold(self, key):
+        """KeyPress einer Dauertaste"""
+        release_id = self._release_ids.pop(key, None)
+        if release_id is not None:
+            # Release/Press-Paar der Auto-Repeat-Funktion - Taste war nie los
+            self.window.after_cancel(release_id)
+            self.releases_debounced += 1
+            return
+        if self.keys_pressed[key]:
+            # Auto-Repeat ohne Release (z.B. Windows)
+            return
+
+        self.keys_pressed[key] = True
+        hook = getattr(self.window, f'on_{key}_press', None)
+        if hook:
+            hook()
+        if self.running:
+            # Erster Befehl sofort, danach im festen Takt
+            self._next_due[key] = time.monotonic()
+            self._repeat(key)
+
+    def _release(self, key):
+        """KeyRelease erst nach der Entprellzeit übernehmen"""
+        if not self.keys_pressed[key] or key in self._release_ids:
+            return
+        self._release_ids[key] = self.window.after(
+            self.debounce_ms, lambda: self._confirm_release(key)
+        )
+
+    def _confirm_release(self, key):
+        del self._release_ids[key]
+        self.keys_pressed[key] = False
+        repeat_id = self._repeat_ids.pop(key, None)
+        if repeat_id is not None:
+            self.window.after_cancel(repeat_id)
+        hook = getattr(self.window, f'on_{key}_release', None)
+        if hook:
+            hook()
+
+    def _repeat(self, key):
+        """Sendet den Dauerbefehl und plant die nächste Wiederholung"""
+        self._repeat_ids.pop(key, None)
+        if not self.running or not self.keys_pressed[key]:
+            return
+        callback = getattr(self, self.CONTINUOUS[key])
+        if callback:
+            callback()
+            self.repeats_sent += 1
+
+        # Festes Raster ab dem ersten Druck - Verzögerungen addieren sich nicht auf
+        now = time.monotonic()
+        due = max(self._next_due[key] + self.rate_ms / 1000.0, now)
+        self._next_due[key] = due
+        self._repeat_ids[key] = self.window.after(
+            int((due - now) * 1000), lambda: self._repeat(key)
+        )
@@ -1,20 +1,97 @@
 """
-Hauptprogramm - Startet die Auto-Simulator GUI
+Hauptprogramm - Startet die Auto-Simulator GUI (oder mit --headless ohne GUI)
 """
 
+import argparse
 import sys
-import os
 
-# Lokale Module importieren
-from gui.dashboard import CarDashboard
+# Schwere Module (tkinter, pyserial, NumPy) erst im jeweiligen Pfad importieren -
+# --headless lädt nie tkinter, --help nichts davon
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fahrzeug-Simulator Dashboard")
+    parser.add_argument('--port', help="Serieller Port (Standard: automatisch suchen)")
+    parser.add_argument('--simulate', action='store_true',
+                        help="Virtuelles Arduino statt Hardware verwenden")
+    parser.add_argument('--record', action='store_true',
+                        help="Telemetrie nach RECORDING_DIR aufzeichnen")
+    parser.add_argument('--replay', metavar='DATEI',
+                        help="Aufzeichnung (.obd2rec) statt Live-Daten abspielen")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Wiedergabe-Faktor, 0 = so schnell wie möglich")
+    parser.add_argument('--start', type=float, default=0.0, metavar='SEKUNDEN',
+                        help="Wiedergabe ab Sekunde n der Aufzeichnung")
+    parser.add_argument('--latency-export', metavar='DATEI',
+                        help="Latenz Taste -> Pixel beim Beenden als JSON speichern")
+
+    headless = parser.add_argument_group("ohne GUI")
+    headless.add_argument('--headless', action='store_true',
+                          help="Ohne Fenster: Verbindung, Aufzeichnung, Konsole/Socket")
+    headless.add_argument('--interval', type=float, metavar='SEKUNDEN',
+                          help="Statuszeile auf der Konsole alle n Sekunden (0 = aus)")
+    headless.add_argument('--listen', metavar='HOST:PORT',
+                          help="Telemetrie zusätzlich per TCP verteilen")
+    headless.add_argument('--unix', metavar='PFAD',
+                          help="Telemetrie zusätzlich per Unix-Socket verteilen")
+
+    args = parser.parse_args(argv)
+    if args.headless and args.replay:
+        parser.error("--replay braucht die GUI (Auswertung ohne GUI: python -m telemetry.analytics)")
+    if args.headless and args.latency_export:
+        parser.error("--latency-export braucht die GUI")
+    if not args.headless and (args.interval is not None or args.listen or args.unix):
+        parser.error("--interval, --listen und --unix nur mit --headless")
+    return args
+
+def start_device(args):
+    """--simulate: virtuelles Arduino starten -> Port"""
+    if not args.simulate:
+        return args.port
+    from simulator.fake_arduino import FakeArduino
+    device = FakeArduino()
+    port = device.start()
+    print(f"Virtuelles Arduino: {port}")
+    return port
+
+def run_headless(args):
+    from config.settings import RECORDING_ENABLED, HEADLESS_PRINT_INTERVAL
+    from telemetry import headless
+
+    listen = None
+    if args.listen:
+        host, _, port = args.listen.rpartition(':')
+        listen = (host or '127.0.0.1', int(port))
+    interval = HEADLESS_PRINT_INTERVAL if args.interval is None else args.interval
+    headless.run(
+        start_device(args), record=args.record or RECORDING_ENABLED,
+        interval=interval, listen=listen, unix=args.unix
+    )
+
+def run_gui(args):
+    from config.settings import RECORDING_ENABLED
+
+    port = start_device(args)
+    source = None
+    if args.replay:
+        from telemetry.replay import ReplaySource
+        source = ReplaySource(args.replay, speed=args.speed, start=args.start)
+        print(f"Wiedergabe: {args.replay} ({len(source.recording)} Datensätze)")
+
+    from gui.dashboard import CarDashboard
+    app = CarDashboard(port=port, record=args.record or RECORDING_ENABLED, source=source,
+                       latency_export=args.latency_export)
+    app.mainloop()
 
 def main():
     """Startet die Fahrzeug-Simulator Anwendung"""
+    args = parse_args()
     print("Starte Fahrzeug-Simulator...")
 
     try:
-        app = CarDashboard()
-        app.mainloop()
+        if args.headless:
+            run_headless(args)
+        else:
+            run_gui(args)
     except KeyboardInterrupt:
         print("\nAnwendung beendet")
     except Exception as e:
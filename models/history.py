@@ -0,0 +1,172 @@
+"""
+Fahrzeug-Verlauf
+Ringpuffer mit einer Spalte pro Signal - wächst bis zur festen Kapazität, dann überschreibend
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+
+from config.settings import ENGINE_REDLINE_RPM, HISTORY_CAPACITY, HISTORY_CHUNK
+
+
+class VehicleHistory:
+    """Schreiber: Serial-Thread (jeder Snapshot), Leser: GUI - alles unter self.lock"""
+
+    # Signal-Spalten (Name -> Typcode)
+    SIGNALS = {
+        'timestamp_ns': 'q',
+        'rpm': 'H',
+        'speed': 'H',
+        'gear': 'B',
+        'throttle': 'B',
+    }
+
+    # Laufende Summen - Fensterabfragen als Differenz zweier Einträge
+    RUNNING = ('_rpm_sum', '_redline_ns', '_shifts_up', '_shifts_down')
+
+    def __init__(self, capacity=HISTORY_CAPACITY, chunk=HISTORY_CHUNK):
+        self.capacity = capacity
+        self.chunk = chunk
+        # Belegt wird erst beim ersten Snapshot - wer nie schreibt, zahlt nichts
+        for name, typecode in self.SIGNALS.items():
+            setattr(self, name, array(typecode))
+        for name in self.RUNNING:
+            setattr(self, name, array('q'))
+        self._size = 0  # belegte Plätze, bis capacity
+
+        self.head = 0   # nächster Schreibplatz
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        with self.lock:
+            self._clear()
+
+    def _clear(self):
+        self.head = 0
+        self.count = 0
+
+    def append(self, snapshot):
+        """Schreibt einen Snapshot in den nächsten Platz - O(1)"""
+        with self.lock:
+            self._append(snapshot)
+
+    def _grow(self):
+        """Mehr Plätze: erst chunk, dann verdoppeln - bis capacity (noch nicht umgebrochen)"""
+        size = min(self.capacity, max(self.chunk, 2 * self._size))
+        extra = size - self._size
+        for name in tuple(self.SIGNALS) + self.RUNNING:
+            column = getattr(self, name)
+            column.frombytes(bytes(column.itemsize * extra))
+        self._size = size
+
+    def _append(self, snapshot):
+        ts = snapshot.timestamp_ns
+        rpm = snapshot.rpm
+        gear = snapshot.gear
+
+        if self.count:
+            last = self.head - 1
+            prev_ts = self.timestamp_ns[last]
+            if ts < prev_ts:
+                # Zeitsprung zurück (z.B. Wiedergabe) - Verlauf neu beginnen
+                self._clear()
+
+        if self.head == self._size and self._size < self.capacity:
+            self._grow()
+        i = self.head
+        if self.count:
+            prev_rpm = self.rpm[last]
+            prev_gear = self.gear[last]
+            self._rpm_sum[i] = self._rpm_sum[last] + rpm
+            self._redline_ns[i] = self._redline_ns[last] + (
+                ts - prev_ts if prev_rpm > ENGINE_REDLINE_RPM else 0)
+            self._shifts_up[i] = self._shifts_up[last] + (gear > prev_gear)
+            self._shifts_down[i] = self._shifts_down[last] + (gear < prev_gear)
+        else:
+            self._rpm_sum[i] = rpm
+            self._redline_ns[i] = 0
+            self._shifts_up[i] = 0
+            self._shifts_down[i] = 0
+
+        self.timestamp_ns[i] = ts
+        self.rpm[i] = rpm
+        self.speed[i] = snapshot.speed
+        self.gear[i] = gear
+        self.throttle[i] = snapshot.throttle
+
+        # Umbrechen erst bei voller Kapazität - davor wächst der Puffer
+        self.head = i + 1 if i + 1 < self.capacity else 0
+        if self.count < self._size:
+            self.count += 1
+
+    def _slot(self, index):
+        """Logischer Index (0 = ältester Eintrag) -> Platz im Puffer"""
+        return (self.head - self.count + index) % self._size
+
+    def _window_start(self, seconds):
+        """Logischer Index des ersten Eintrags im Fenster"""
+        if seconds is None:
+            return 0
+        cutoff = self.timestamp_ns[self.head - 1] - int(seconds * 1e9)
+        first = self._slot(0)
+        if first + self.count <= self._size:
+            # zusammenhängend
+            return bisect_left(self.timestamp_ns, cutoff, first, first + self.count) - first
+        # umgebrochen: älterer Teil am Ende, neuerer Teil am Anfang
+        if cutoff <= self.timestamp_ns[self._size - 1]:
+            return bisect_left(self.timestamp_ns, cutoff, first, self._size) - first
+        return self._size - first + bisect_left(self.timestamp_ns, cutoff, 0, self.head)
+
+    def values(self, name, seconds=None):
+        """Signal der letzten seconds Sekunden als array (ältester Wert zuerst, Kopie)"""
+        with self.lock:
+            return self._values(name, seconds)
+
+    def values_many(self, names, seconds=None):
+        """Mehrere Signale aus demselben Fenster - ein Lesevorgang, gleiche Länge"""
+        with self.lock:
+            return tuple(self._values(name, seconds) for name in names)
+
+    def _values(self, name, seconds):
+        column = getattr(self, name)
+        if not self.count:
+            return column[:0]
+        start = self._slot(self._window_start(seconds))
+        if start < self.head:
+            return column[start:self.head]
+        return column[start:] + column[:self.head]
+
+    def _difference(self, running, seconds):
+        start = self._slot(self._window_start(seconds))
+        return running[self.head - 1] - running[start]
+
+    # Fensterabfragen - seconds=None bedeutet der gesamte Verlauf
+
+    def rpm_stats(self, seconds=None):
+        """(min, max, mean) der Drehzahl im Fenster"""
+        with self.lock:
+            if not self.count:
+                return (0, 0, 0.0)
+            window = self._values('rpm', seconds)
+            total = self._difference(self._rpm_sum, seconds) + window[0]
+        return (min(window), max(window), total / len(window))
+
+    def redline_seconds(self, seconds=None):
+        """Zeit über der Redline im Fenster"""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            return self._difference(self._redline_ns, seconds) / 1e9
+
+    def shift_counts(self, seconds=None):
+        """(hoch, runter) geschaltet im Fenster"""
+        with self.lock:
+            if not self.count:
+                return (0, 0)
+            return (self._difference(self._shifts_up, seconds),
+                    self._difference(self._shifts_down, seconds))
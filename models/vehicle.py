@@ -4,66 +4,148 @@ Verwaltet alle Fahrzeugdaten und Status
 """
 
 from config.settings import ENGINE_IDLE_RPM, ENGINE_MAX_RPM, ENGINE_REDLINE_RPM, MAX_SPEED, MAX_GEARS
+from models.history import VehicleHistory
+
+
+def _parse_flag(value):
+    return value == "1"
+
+
+# Status-Schlüssel des Sketches -> (Snapshot-Feld, Parser)
+STATUS_FIELDS = {
+    "ENGINE_RUNNING": ("engine_running", _parse_flag),
+    "RPM": ("rpm", int),
+    "SPEED": ("speed", int),
+    "GEAR": ("gear", int),
+    "THROTTLE": ("throttle", int),
+    "RPM_STATUS": ("rpm_status", str),
+}
+
+
+class VehicleSnapshot:
+    """Unveränderlicher Fahrzeugzustand eines vollständigen Status-Blocks"""
+
+    __slots__ = (
+        'engine_running', 'rpm', 'speed', 'gear', 'throttle',
+        'rpm_status', 'timestamp_ns', 'coolant_temp', 'engine_load'
+    )
+
+    def __init__(self, engine_running=False, rpm=0, speed=0, gear=1,
+                 throttle=0, rpm_status="OK", timestamp_ns=0,
+                 coolant_temp=None, engine_load=None):
+        init = object.__setattr__
+        init(self, 'engine_running', engine_running)
+        init(self, 'rpm', rpm)
+        init(self, 'speed', speed)
+        init(self, 'gear', gear)
+        init(self, 'throttle', throttle)
+        init(self, 'rpm_status', rpm_status)
+        init(self, 'timestamp_ns', timestamp_ns)
+        # Nur per OBD-II (CAN) bekannt, sonst None
+        init(self, 'coolant_temp', coolant_temp)
+        init(self, 'engine_load', engine_load)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("VehicleSnapshot ist unveränderlich")
+
+    def __delattr__(self, name):
+        raise AttributeError("VehicleSnapshot ist unveränderlich")
+
+    def replace(self, **changes):
+        """Gibt eine Kopie mit geänderten Feldern zurück"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return VehicleSnapshot(**values)
+
+    def __eq__(self, other):
+        if not isinstance(other, VehicleSnapshot):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, n) for n in self.__slots__))
+
+    def __repr__(self):
+        fields = ", ".join(f"{n}={getattr(self, n)!r}" for n in self.__slots__)
+        return f"VehicleSnapshot({fields})"
+
+
+def rpm_color(rpm):
+    """Gibt Farbe für RPM-Anzeige zurück"""
+    if rpm == 0:
+        return '#555555'
+    elif rpm < 3000:
+        return '#00ff00'  # Grün
+    elif rpm < 5000:
+        return '#ffaa00'  # Gelb
+    elif rpm < ENGINE_REDLINE_RPM:
+        return '#ff8800'  # Orange
+    else:
+        return '#ff0000'  # Rot
+
+
+def shift_recommendation(rpm_status):
+    """Gibt Schaltempfehlung zum RPM-Status zurück"""
+    if rpm_status == "SHIFT_UP":
+        return "HOCHSCHALTEN"
+    elif rpm_status == "SHIFT_DOWN":
+        return "⬇RUNTERSCHALTEN"
+    elif rpm_status == "REDLINE":
+        return "REDLINE!"
+    elif rpm_status == "HIGH":
+        return "HOHE DREHZAHL"
+    else:
+        return ""
+
 
 class Vehicle:
-    def __init__(self):
-        # Grunddaten
-        self.engine_running = False
-        self.rpm = 0
-        self.speed = 0
-        self.gear = 1
-        self.throttle = 0
+    def __init__(self, history=True):
+        # Grunddaten + Status als ein unveränderlicher Snapshot
+        self.snapshot = VehicleSnapshot()
 
-        # Status
-        self.rpm_status = "OK"
+        # Verlauf aller empfangenen Status-Blöcke (auch der nie angezeigten)
+        # history=False: ohne Verlauf, record() tut dann nichts
+        self.history = VehicleHistory() if history else None
 
         # Eingaben (von GUI gesteuert)
         self.gas_pressed = False
         self.brake_pressed = False
 
+    # Lesezugriff auf den aktuellen Snapshot
+    engine_running = property(lambda self: self.snapshot.engine_running)
+    rpm = property(lambda self: self.snapshot.rpm)
+    speed = property(lambda self: self.snapshot.speed)
+    gear = property(lambda self: self.snapshot.gear)
+    throttle = property(lambda self: self.snapshot.throttle)
+    rpm_status = property(lambda self: self.snapshot.rpm_status)
+
+    def apply_snapshot(self, snapshot):
+        """Übernimmt einen kompletten Status-Block als aktuellen Stand (eine Referenz-Zuweisung)"""
+        self.snapshot = snapshot
+
+    def record(self, snapshot):
+        """Jeder empfangene Snapshot in den Verlauf - auf dem I/O-Pfad, nicht im GUI-Takt"""
+        if self.history is not None:
+            self.history.append(snapshot)
+
     def update_from_data(self, key, value):
         """Aktualisiert Fahrzeugdaten von Serial-Input"""
+        entry = STATUS_FIELDS.get(key)
+        if entry is None:
+            return
+        field, parser = entry
         try:
-            if key == "ENGINE_RUNNING":
-                self.engine_running = (value == "1")
-            elif key == "RPM":
-                self.rpm = int(value)
-            elif key == "SPEED":
-                self.speed = int(value)
-            elif key == "GEAR":
-                self.gear = int(value)
-            elif key == "THROTTLE":
-                self.throttle = int(value)
-            elif key == "RPM_STATUS":
-                self.rpm_status = value
-        except (ValueError, IndexError):
+            self.snapshot = self.snapshot.replace(**{field: parser(value)})
+        except ValueError:
             pass
 
     def get_rpm_color(self):
         """Gibt Farbe für RPM-Anzeige zurück"""
-        if self.rpm == 0:
-            return '#555555'
-        elif self.rpm < 3000:
-            return '#00ff00'  # Grün
-        elif self.rpm < 5000:
-            return '#ffaa00'  # Gelb
-        elif self.rpm < ENGINE_REDLINE_RPM:
-            return '#ff8800'  # Orange
-        else:
-            return '#ff0000'  # Rot
+        return rpm_color(self.rpm)
 
     def get_shift_recommendation(self):
         """Gibt Schaltempfehlung zurück"""
-        if self.rpm_status == "SHIFT_UP":
-            return "HOCHSCHALTEN"
-        elif self.rpm_status == "SHIFT_DOWN":
-            return "⬇RUNTERSCHALTEN"
-        elif self.rpm_status == "REDLINE":
-            return "REDLINE!"
-        elif self.rpm_status == "HIGH":
-            return "HOHE DREHZAHL"
-        else:
-            return ""
+        return shift_recommendation(self.rpm_status)
 
     def can_start_engine(self):
         """Prüft ob Motor gestartet werden kann"""
@@ -0,0 +1,196 @@
+"""
+Emuliertes OBD-II-Steuergerät
+Beantwortet Mode-01-Anfragen aus dem VehicleSimulator über einen zeitdiskreten CAN-Bus
+"""
+
+import heapq
+from collections import deque
+
+from communication.isotp import IsoTpReassembler, segment, FLOW_CONTROL
+from communication.obd_pids import (
+    PIDS, MODE_CURRENT_DATA, RESPONSE_OFFSET, REQUEST_ID, RESPONSE_ID_BASE, encode_value
+)
+from communication.pid_scheduler import PidScheduler, PHYSICAL_OFFSET, frame_ms
+from simulator.vehicle_simulator import VehicleSimulator
+from config.settings import ECU_RESPONSE_MS, CAN_BITRATE
+
+
+class EmulatedEcu:
+    RESPONSE_ID = RESPONSE_ID_BASE
+    PHYSICAL_ID = RESPONSE_ID_BASE - PHYSICAL_OFFSET
+
+    def __init__(self, simulator=None, response_ms=ECU_RESPONSE_MS):
+        self.simulator = simulator or VehicleSimulator(quiet=True)
+        self.response_ms = response_ms
+        self.reassembler = IsoTpReassembler()
+
+        # Kühlmittel wird mit laufendem Motor warm (°C)
+        self.coolant_temp = 20.0
+        self._last_ms = self.simulator.millis
+
+        # Frames einer Multi-Frame-Antwort, die auf Flow Control warten
+        self._waiting = None
+        # Weitere Antworten dahinter - eine Sitzung pro Antwort-ID, der Reihe nach
+        self._queued = deque()
+        self.transmit = None   # (can_id, data, delay_ms) - vom Bus gesetzt
+
+    def supported_mask(self):
+        """Bitmaske für PID 0x00 (PIDs 0x01-0x20)"""
+        mask = 0
+        for pid in PIDS:
+            if 1 <= pid <= 0x20:
+                mask |= 1 << (32 - pid)
+        return mask
+
+    def values(self):
+        """Aktuelle Messwerte pro PID aus dem Fahrzeugmodell"""
+        sim = self.simulator
+        elapsed = (sim.millis - self._last_ms) / 1000.0
+        self._last_ms = sim.millis
+        if sim.engine_on:
+            self.coolant_temp = min(90.0, self.coolant_temp + 0.5 * elapsed)
+        return {
+            0x00: self.supported_mask(),
+            0x04: min(100.0, sim.rpm / 70.0) if sim.engine_on else 0.0,
+            0x05: self.coolant_temp,
+            0x0C: sim.rpm,
+            0x0D: sim.speed,
+            0x11: sim.throttle,
+        }
+
+    def respond(self, request):
+        """Mode-01-Anfrage -> Antwort-Nutzdaten oder None (nichts unterstützt)"""
+        if not request or request[0] != MODE_CURRENT_DATA:
+            return None
+        current = self.values()
+        response = bytearray([MODE_CURRENT_DATA + RESPONSE_OFFSET])
+        for pid in request[1:7]:
+            spec = PIDS.get(pid)
+            if spec is not None and pid in current:
+                response.append(pid)
+                response += encode_value(spec, current[pid])
+        return bytes(response) if len(response) > 1 else None
+
+    def receive(self, can_id, data):
+        if can_id not in (REQUEST_ID, self.PHYSICAL_ID):
+            return
+        if data[0] >> 4 == FLOW_CONTROL:
+            if self._waiting:
+                # Consecutive Frames ohne Pause (STmin 0)
+                for frame in self._waiting:
+                    self.transmit(self.RESPONSE_ID, frame, 0.0)
+                self._waiting = None
+                while self._queued and not self._waiting:
+                    self._send(self._queued.popleft(), 0.0)
+            return
+        request = self.reassembler.feed(can_id, data)
+        response = self.respond(request) if request else None
+        if response is None:
+            return
+        frames = segment(response)
+        if self._waiting:
+            # Ein neuer First Frame würde die offene Sitzung beim Tester abbrechen
+            self._queued.append(frames)
+        else:
+            self._send(frames, self.response_ms)
+
+    def _send(self, frames, delay):
+        self.transmit(self.RESPONSE_ID, frames[0], delay)
+        self._waiting = frames[1:] or None
+
+
+class VirtualCanBus:
+    """Zeitdiskreter Bus in ms: Frames belegen den Bus nacheinander"""
+
+    def __init__(self, ecu, bitrate=CAN_BITRATE):
+        self.ecu = ecu
+        self.frame_ms = frame_ms(bitrate)
+        self.now = 0.0
+        self.busy_until = 0.0
+        self.busy_ms = 0.0
+        self.frames = 0
+        self.tester = None          # receive(can_id, data, now_ms)
+
+        self._events = []
+        self._seq = 0
+        ecu.transmit = lambda can_id, data, delay: self._transmit(can_id, data, delay, self._to_tester)
+
+    def send(self, can_id, data):
+        """Tester -> Bus"""
+        self._transmit(can_id, data, 0.0, self._to_ecu)
+
+    def _transmit(self, can_id, data, delay, deliver):
+        start = max(self.now + delay, self.busy_until)
+        end = start + self.frame_ms
+        self.busy_until = end
+        self.busy_ms += self.frame_ms
+        self.frames += 1
+        self._seq += 1
+        heapq.heappush(self._events, (end, self._seq, deliver, can_id, data))
+
+    def _to_ecu(self, can_id, data):
+        self.ecu.receive(can_id, data)
+
+    def _to_tester(self, can_id, data):
+        if self.tester:
+            self.tester.receive(can_id, data, self.now)
+
+    def advance(self, until_ms):
+        """Liefert alle bis until_ms fertig übertragenen Frames aus"""
+        events = self._events
+        while events and events[0][0] <= until_ms:
+            self.now, _, deliver, can_id, data = heapq.heappop(events)
+            deliver(can_id, data)
+        self.now = until_ms
+
+
+def run_offline(duration_ms=10_000, tick_ms=1.0, drive=True, **scheduler_options):
+    """Fährt Abfrageplaner + emuliertes Steuergerät schneller als Echtzeit
+
+    Gibt die Zusammenfassung des Planers plus Frames/s und Buslast zurück.
+    """
+    sim = VehicleSimulator(quiet=True)
+    ecu = EmulatedEcu(sim)
+    bus = VirtualCanBus(ecu)
+    scheduler = PidScheduler(bus.send, **scheduler_options)
+    bus.tester = scheduler
+    if drive:
+        sim.send("ENGINE_TOGGLE")
+
+    start = sim.millis
+    now = 0.0
+    while now < duration_ms:
+        # Fahrzeugmodell mitlaufen lassen, Gas halten wie ein Fahrer
+        if drive and int(now) % 100 == 0:
+            sim.send("THROTTLE")
+        while sim.millis - start < now:
+            sim.loop()
+        scheduler.poll(now)
+        now += tick_ms
+        bus.advance(now)
+
+    summary = scheduler.summary(duration_ms)
+    summary['frames_per_s'] = bus.frames / (duration_ms / 1000.0)
+    summary['bus_load'] = bus.busy_ms / duration_ms
+    return summary
+
+
+def main():
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="PID-Abfrage gegen emuliertes Steuergerät (offline)")
+    parser.add_argument('--seconds', type=float, default=60.0, help="Simulierte Dauer")
+    parser.add_argument('--in-flight', type=int, help="Anfragen ohne Antwort")
+    parser.add_argument('--budget', type=float, help="Anteil der Bus-Zeit")
+    args = parser.parse_args()
+
+    options = {}
+    if args.in_flight is not None:
+        options['max_in_flight'] = args.in_flight
+    if args.budget is not None:
+        options['bus_budget'] = args.budget
+    print(json.dumps(run_offline(args.seconds * 1000, **options), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
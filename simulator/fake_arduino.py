@@ -0,0 +1,107 @@
+"""
+Virtuelles Arduino-Gerät
+Stellt den VehicleSimulator hinter einem Pseudo-Terminal bereit (nur POSIX)
+"""
+
+import os
+import select
+import threading
+import time
+import tty
+
+from simulator.vehicle_simulator import VehicleSimulator
+
+
+class FakeArduino:
+    def __init__(self, simulator=None, speed=1.0):
+        # speed: Zeitfaktor (1.0 = Echtzeit, 10 = zehnfach, None = so schnell wie möglich)
+        self.simulator = simulator or VehicleSimulator()
+        self.speed = speed
+        self.running = False
+        self.port = None
+
+        self._master = None
+        self._slave = None
+
+    def start(self):
+        """Öffnet das Pseudo-Terminal und startet den Simulations-Thread"""
+        self._master, self._slave = os.openpty()
+        # Rohmodus: kein Echo, keine Zeilenende-Umsetzung - wie ein USB-Seriell-Gerät
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        self.running = False
+        if self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _run(self):
+        sim = self.simulator
+        start = time.monotonic()
+        sim_start = sim.millis
+        while self.running:
+            # Eingaben des Hosts übernehmen
+            readable, _, _ = select.select([self._master], [], [], 0)
+            if readable:
+                try:
+                    sim.write(os.read(self._master, 4096))
+                except OSError:
+                    break
+
+            sim.loop()
+            data = sim.read_output()
+            if data and not self._write_all(data):
+                break
+
+            if self.speed:
+                due = start + (sim.millis - sim_start) / 1000.0 / self.speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+    def _write_all(self, data):
+        """Schreibt alles, wartet aber nie länger als nötig auf einen Leser"""
+        view = memoryview(data)
+        while view and self.running:
+            _, writable, _ = select.select([], [self._master], [], 0.1)
+            if not writable:
+                continue
+            try:
+                written = os.write(self._master, view)
+            except BlockingIOError:
+                continue
+            except OSError:
+                return False
+            view = view[written:]
+        return True
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Virtuelles Arduino am Pseudo-Terminal")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="Zeitfaktor (0 = so schnell wie möglich)")
+    args = parser.parse_args()
+
+    device = FakeArduino(speed=args.speed or None)
+    print(f"Virtuelles Arduino: {device.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        device.stop()
+
+
+if __name__ == "__main__":
+    main()
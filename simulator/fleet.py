@@ -0,0 +1,369 @@
+"""
+Flotten-Simulation mit NumPy
+Struct-of-Arrays: ein Array pro Größe, alle Fahrzeuge werden gemeinsam gerechnet
+"""
+
+import numpy as np
+
+from simulator.vehicle_simulator import VehicleSimulator
+
+# Ein Schritt = ein updateRPM()-Intervall des Sketches
+STEP_MS = VehicleSimulator.RPM_INTERVAL_MS
+GAS_TIMEOUT_MS = VehicleSimulator.GAS_TIMEOUT_MS
+MAX_RPM = 7000
+IDLE_RPM = 850
+
+# Fahrzeuge pro Block - Zwischenpuffer bleiben im Cache
+_BLOCK = 49152
+
+# Ganzzahl-Division (rpm - 850) / (20 + gear*5) als Multiplikation + Shift;
+# für alle vorkommenden rpm beim Import gegen echte Division geprüft
+_SPEED_SHIFT = 20
+_SPEED_MUL = np.zeros(6, dtype=np.int32)
+for _gear in range(1, 6):
+    _divisor = 20 + _gear * 5
+    _SPEED_MUL[_gear] = -(-(1 << _SPEED_SHIFT) // _divisor)
+    _x = np.arange(1001 - 850, MAX_RPM + 1 - 850, dtype=np.int64)
+    assert np.array_equal((_x * int(_SPEED_MUL[_gear])) >> _SPEED_SHIFT, _x // _divisor)
+
+
+class FleetSimulator:
+    """N Fahrzeuge mit den Regeln des Sketches; Zustand nur über die Befehle ändern"""
+
+    def __init__(self, count):
+        self.count = count
+        self.now_ms = 0
+
+        # Zustand wie im Sketch, je ein Array. Motor und Gas als int32-Masken
+        # (-1 = ja, 0 = nein), damit der Takt ohne Typumwandlung auskommt
+        self._on = np.zeros(count, dtype=np.int32)
+        self._gas = np.zeros(count, dtype=np.int32)
+        self.rpm = np.zeros(count, dtype=np.int32)
+        self.target_rpm = np.zeros(count, dtype=np.int32)
+        self.speed = np.zeros(count, dtype=np.int32)
+        self.gear = np.ones(count, dtype=np.int32)
+        self.throttle = np.zeros(count, dtype=np.int32)
+        self.brake_pressed = np.zeros(count, dtype=bool)
+        self.last_gas_command = np.zeros(count, dtype=np.int32)
+
+        # Divisions-Multiplikator pro Fahrzeug, ändert sich nur beim Schalten
+        self._speed_mul = np.full(count, _SPEED_MUL[1], dtype=np.int32)
+
+        # Zwischenpuffer für einen Block - der Schritt alloziert nichts
+        size = min(count, _BLOCK)
+        self._scratch = [np.empty(size, dtype=np.int32) for _ in range(4)]
+        self._command = np.empty(size, dtype=np.int32)
+        self._max_rpm = np.full(size, MAX_RPM, dtype=np.int32)
+        self._max_speed = np.full(size, 200, dtype=np.int32)
+
+    @property
+    def engine_on(self):
+        """Motorstatus als Bool-Array (Kopie, nur lesend)"""
+        return self._on != 0
+
+    @property
+    def gas_pressed(self):
+        """Gas-Status als Bool-Array (Kopie, nur lesend)"""
+        return self._gas != 0
+
+    # --- Befehle (Maske = betroffene Fahrzeuge) ---
+
+    def toggle_engine(self, mask):
+        on = self.engine_on
+        start = mask & ~on
+        stop = mask & on & (self.speed == 0)
+        self._on[start] = -1
+        self.rpm[start] = IDLE_RPM
+        self.target_rpm[start] = IDLE_RPM
+        self.gear[start] = 1
+        self._speed_mul[start] = _SPEED_MUL[1]
+        self._on[stop] = 0
+        self.rpm[stop] = 0
+        self.target_rpm[stop] = 0
+        self.throttle[stop] = 0
+        self._gas[stop] = 0
+
+    def handle_throttle(self, mask):
+        self._apply_blocks(self._throttle_block, mask)
+
+    def handle_brake(self, mask):
+        self._apply_blocks(self._brake_block, mask)
+
+    def shift_up(self, mask):
+        self._apply_blocks(self._shift_up_block, mask, shifts=True)
+
+    def shift_down(self, mask):
+        self._apply_blocks(self._shift_down_block, mask, shifts=True)
+
+    # --- Takt ---
+
+    def step(self, throttle=None, brake=None, shift_up=None, shift_down=None):
+        """Ein 20-ms-Schritt: Befehle, updateRPM(), Gas-Timeout"""
+        commands = [
+            (handler, np.asarray(mask, dtype=bool), shifts)
+            for handler, mask, shifts in (
+                (self._throttle_block, throttle, False), (self._brake_block, brake, False),
+                (self._shift_up_block, shift_up, True), (self._shift_down_block, shift_down, True),
+            )
+            if mask is not None
+        ]
+        now = self.now_ms + STEP_MS
+        for start in range(0, self.count, _BLOCK):
+            block = slice(start, start + _BLOCK)
+            # Befehle wirken nur auf das eigene Fahrzeug - blockweise in der
+            # Reihenfolge des Sketches, solange der Block im Cache liegt
+            shifted = False
+            for handler, mask, shifts in commands:
+                if self._command_block(handler, mask, block):
+                    shifted |= shifts
+            if shifted:
+                self._refresh_speed_mul(block)
+            self._update_rpm_block(block)
+            self._gas_timeout_block(block, now)
+        self.now_ms = now
+
+    def _apply_blocks(self, handler, mask, shifts=False):
+        mask = np.asarray(mask, dtype=bool)
+        for start in range(0, self.count, _BLOCK):
+            block = slice(start, start + _BLOCK)
+            if self._command_block(handler, mask, block) and shifts:
+                self._refresh_speed_mul(block)
+
+    def _command_block(self, handler, mask, block):
+        """Befehl auf einen Block anwenden - False, wenn kein Fahrzeug betroffen war"""
+        part = mask[block]
+        if not part.any():
+            return False
+        # Bool-Maske -> int32-Maske (-1 = ja, 0 = nein) im eigenen Puffer
+        m = self._command[:len(part)]
+        np.negative(part.view(np.int8), out=m)
+        handler(block, part, m)
+        return True
+
+    def _refresh_speed_mul(self, block):
+        # Multiplikator hängt nur vom Gang ab - nach dem Schalten einmal je Block neu,
+        # aus der 6er-Tabelle statt Auswahl pro Befehl
+        np.take(_SPEED_MUL, self.gear[block], out=self._speed_mul[block], mode='clip')
+
+    # Befehle verzweigungsfrei wie der Takt: Auswahl per x ^= (x ^ neu) & m bzw.
+    # x -= min(...) & m statt Fancy-Indexing, das bei zufälligen Masken sammelt
+    # und verteilt. m wird um die Bedingungen des Befehls eingeschränkt
+
+    def _throttle_block(self, block, part, m):
+        a = self._scratch[0][:len(m)]
+        m &= self._on[block]
+        self._gas[block] |= m
+        last = self.last_gas_command[block]
+        np.bitwise_xor(last, self.now_ms, out=a)
+        a &= m
+        last ^= a
+        # target_rpm = min(7000, 2000 + gear * 1000) - bei gear <= 5 nie über 7000
+        target = self.target_rpm[block]
+        np.multiply(self.gear[block], 1000, out=a)
+        a += 2000
+        a ^= target
+        a &= m
+        target ^= a
+
+    def _brake_block(self, block, part, m):
+        a = self._scratch[0][:len(m)]
+        brake = self.brake_pressed[block]
+        np.logical_or(brake, part, out=brake)
+        gas = self._gas[block]
+        np.bitwise_and(gas, m, out=a)
+        gas ^= a
+        # throttle = max(0, throttle - 25), speed = max(0, speed - 8)
+        throttle = self.throttle[block]
+        if np.count_nonzero(throttle):
+            np.minimum(throttle, 25, out=a)
+            a &= m
+            throttle -= a
+        speed = self.speed[block]
+        np.minimum(speed, 8, out=a)
+        a &= m
+        speed -= a
+        # Bei Motor aus setzt updateRPM() target_rpm ohnehin sofort auf 0
+        target = self.target_rpm[block]
+        np.bitwise_xor(target, IDLE_RPM, out=a)
+        a &= m
+        a &= self._on[block]
+        target ^= a
+
+    def _shift_up_block(self, block, part, m):
+        # Motor an, gear < 5 und rpm >= 1500: beide Differenzen negativ
+        gear, rpm, target = self.gear[block], self.rpm[block], self.target_rpm[block]
+        a, b = (buf[:len(m)] for buf in self._scratch[:2])
+        np.subtract(gear, 5, out=a)
+        np.subtract(1499, rpm, out=b)
+        a &= b
+        np.right_shift(a, 31, out=a)
+        m &= a
+        m &= self._on[block]
+        gear -= m
+        # rpm >= 1500, also rpm - 400 nie unter 850
+        np.bitwise_and(m, 400, out=a)
+        rpm -= a
+        # target_rpm = max(850, target_rpm - 400)
+        np.subtract(target, IDLE_RPM, out=a)
+        np.minimum(a, 400, out=a)
+        a &= m
+        target -= a
+
+    def _shift_down_block(self, block, part, m):
+        # Motor an, gear > 1 und rpm + 500 <= 6000: beide Differenzen negativ
+        gear, rpm, target = self.gear[block], self.rpm[block], self.target_rpm[block]
+        a, b = (buf[:len(m)] for buf in self._scratch[:2])
+        np.subtract(1, gear, out=a)
+        np.subtract(rpm, 5501, out=b)
+        a &= b
+        np.right_shift(a, 31, out=a)
+        m &= a
+        m &= self._on[block]
+        gear += m
+        np.bitwise_and(m, 500, out=a)
+        rpm += a
+        # target_rpm = min(target_rpm + 500, 7000)
+        np.subtract(MAX_RPM, target, out=a)
+        np.minimum(a, 500, out=a)
+        a &= m
+        target += a
+
+    def update_rpm(self):
+        """updateRPM() des Sketches für alle Fahrzeuge (blockweise, cache-freundlich)"""
+        for start in range(0, self.count, _BLOCK):
+            self._update_rpm_block(slice(start, start + _BLOCK))
+
+    def _update_rpm_block(self, block):
+        # Verzweigungsfrei mit int32-Masken (-1 = ja, 0 = nein) - where=-Zuweisungen
+        # sind bei zufälligen Mustern um ein Vielfaches langsamer.
+        # Invarianten der Befehle: Motor aus => rpm = target_rpm = speed = 0, Gas nur bei Motor an
+        rpm, target, speed = self.rpm[block], self.target_rpm[block], self.speed[block]
+        n = len(rpm)
+        accel, idle, a, b = (buf[:n] for buf in self._scratch)
+
+        on = self._on[block]
+
+        # Beschleunigen: Gas gedrückt und rpm < target_rpm, sonst Leerlauf
+        np.subtract(rpm, target, out=a)
+        np.right_shift(a, 31, out=a)
+        np.bitwise_and(self._gas[block], a, out=accel)
+        np.bitwise_xor(on, accel, out=idle)
+
+        # Leerlauf: target_rpm = 850
+        np.bitwise_xor(target, IDLE_RPM, out=a)
+        a &= idle
+        target ^= a
+
+        # delta = +80 (Gas) | -30 (über Leerlauf) | +20 (unter Leerlauf), alle auf altem rpm
+        np.subtract(IDLE_RPM, rpm, out=a)
+        np.right_shift(a, 31, out=a)
+        a &= -30
+        np.subtract(rpm, IDLE_RPM, out=b)
+        np.right_shift(b, 31, out=b)
+        b &= 20
+        a |= b
+        a &= idle
+        np.bitwise_and(accel, 80, out=b)
+        a |= b
+        rpm += a
+        np.minimum(rpm, self._max_rpm[:n], out=rpm)
+
+        # Geschwindigkeit, rpm > 1000: (rpm - 850) / (20 + gear*5), max. 200
+        np.subtract(rpm, IDLE_RPM, out=a)
+        a *= self._speed_mul[block]
+        np.right_shift(a, _SPEED_SHIFT, out=a)
+        np.minimum(a, self._max_speed[:n], out=a)
+        # sonst speed - 1, min. 0
+        np.negative(speed, out=b)
+        np.right_shift(b, 31, out=b)
+        b += speed
+        # Auswahl über rpm > 1000
+        np.subtract(1000, rpm, out=idle)
+        np.right_shift(idle, 31, out=idle)
+        a ^= b
+        a &= idle
+        np.bitwise_xor(a, b, out=speed)
+
+        # Gas-Pedal fällt ab, solange nicht gedrückt (der Sketch erhöht es nie)
+        throttle = self.throttle[block]
+        if np.count_nonzero(throttle):
+            np.bitwise_not(self._gas[block], out=a)
+            a &= on
+            np.subtract(throttle, 5, out=b)
+            np.maximum(b, 0, out=b)
+            b ^= throttle
+            b &= a
+            throttle ^= b
+
+    def _gas_timeout_block(self, block, now):
+        # gas_pressed bleibt nur, solange last_gas_command >= now - 200 ms
+        gas = self._gas[block]
+        cond = self._scratch[0][:len(gas)]
+        np.subtract(now - GAS_TIMEOUT_MS - 1, self.last_gas_command[block], out=cond)
+        np.right_shift(cond, 31, out=cond)
+        gas &= cond
+
+    # --- Abgleich mit dem skalaren Simulator ---
+
+    def vehicle(self, index):
+        """Zustand eines Fahrzeugs als Tupel (Reihenfolge wie STATE_FIELDS)"""
+        state = []
+        for name in STATE_FIELDS:
+            if name in _MASK_FIELDS:
+                state.append(bool(getattr(self, _MASK_FIELDS[name])[index]))
+            else:
+                state.append(getattr(self, name)[index].item())
+        return tuple(state)
+
+
+STATE_FIELDS = (
+    'engine_on', 'rpm', 'target_rpm', 'speed', 'gear',
+    'throttle', 'gas_pressed', 'brake_pressed'
+)
+_MASK_FIELDS = {'engine_on': '_on', 'gas_pressed': '_gas'}
+
+
+def reference_step(sim, throttle=False, brake=False, shift_up=False, shift_down=False):
+    """Skalare Referenz zu FleetSimulator.step() auf einem VehicleSimulator"""
+    now = sim.millis
+    if throttle:
+        sim.handle_throttle()
+    if brake:
+        sim.handle_brake()
+    if shift_up:
+        sim.shift_up()
+    if shift_down:
+        sim.shift_down()
+    sim.update_rpm()
+    # delay() in den Befehlen zählt hier nicht - fester Takt wie in der Flotte
+    sim.millis = now + STEP_MS
+    if sim.millis - sim.last_gas_command > GAS_TIMEOUT_MS and sim.gas_pressed:
+        sim.gas_pressed = False
+
+
+def compare_with_reference(count=200, steps=2000, seed=0):
+    """Fährt Flotte und skalare Referenz mit denselben Zufallseingaben - True bei Gleichstand"""
+    rng = np.random.default_rng(seed)
+    fleet = FleetSimulator(count)
+    sims = [VehicleSimulator(quiet=True) for _ in range(count)]
+    for sim in sims:
+        sim.millis = 0
+    start = rng.random(count) < 0.9
+    fleet.toggle_engine(start)
+    for sim, on in zip(sims, start):
+        if on:
+            sim.toggle_engine()
+        sim.millis = 0
+
+    for _ in range(steps):
+        inputs = [
+            rng.random(count) < p for p in (0.4, 0.05, 0.03, 0.02)
+        ]
+        fleet.step(*inputs)
+        for i, sim in enumerate(sims):
+            reference_step(sim, *(bool(mask[i]) for mask in inputs))
+
+    for i, sim in enumerate(sims):
+        if fleet.vehicle(i) != tuple(getattr(sim, name) for name in STATE_FIELDS):
+            return False
+    return True
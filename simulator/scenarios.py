@@ -0,0 +1,332 @@
+"""
+Szenarien und Parameter-Sweeps
+Skriptierte Fahrzyklen gegen den VehicleSimulator (schneller als Echtzeit),
+Parameter-Gitter parallel in einem Prozess-Pool, Kennzahlen je Konfiguration
+"""
+
+import bisect
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from simulator.vehicle_simulator import VehicleSimulator
+from telemetry.record_format import FLAG_ENGINE_RUNNING, FLAG_GAS, STATUS_CODES, record_dtype
+from config.settings import KEY_INPUT_RATE, ANALYTICS_MAX_WORKERS
+
+# Fahrer: Entscheidung im Takt der Tastenwiederholung, Toleranz um die Sollgeschwindigkeit
+DRIVER_STEP_MS = KEY_INPUT_RATE
+SPEED_TOLERANCE = 3             # km/h
+SHIFT_REACTION_MS = 300         # ms - von SHIFT_UP bis zum Schalten
+DOWNSHIFT_RPM = 1200            # darunter schaltet der Fahrer zurück
+MIN_SHIFT_RPM = 1500            # darunter lehnt der Sketch das Hochschalten ab
+# Auch bei HIGH/REDLINE hochschalten - im 4. Gang liegt SHIFT_UP über HIGH_RPM
+SHIFT_SIGNALS = ('SHIFT_UP', 'HIGH', 'REDLINE')
+SAMPLE_MS = VehicleSimulator.STATUS_INTERVAL_MS
+
+# Überschreibbare Schwellen des Simulators (Name im Sweep -> Klassenattribut)
+PARAMETERS = {
+    'shift_up_base': 'SHIFT_UP_BASE',
+    'shift_up_per_gear': 'SHIFT_UP_PER_GEAR',
+    'max_rpm_base': 'MAX_RPM_BASE',
+    'max_rpm_per_gear': 'MAX_RPM_PER_GEAR',
+    'high_rpm': 'HIGH_RPM',
+    'redline_rpm': 'REDLINE_RPM',
+}
+
+
+class Scenario:
+    """Fahrzyklus: Sollgeschwindigkeit über der Zeit und/oder feste Eingaben
+
+    profile: [(sekunde, km/h), ...] - linear interpoliert, ein Fahrer folgt ihr
+    events:  [(von_s, bis_s, befehl), ...] - bis_s None = einmalig, sonst alle
+             DRIVER_STEP_MS wiederholt (wie eine gehaltene Taste)
+    """
+
+    def __init__(self, name, profile=(), events=(), duration=None, follow_shift=True):
+        self.name = name
+        self.profile = [(float(t), float(v)) for t, v in profile]
+        self.events = sorted(
+            (float(start), None if end is None else float(end), command)
+            for start, end, command in events
+        )
+        self.follow_shift = follow_shift
+        ends = [t for t, _ in self.profile] + [end or start for start, end, _ in self.events]
+        self.duration = float(duration if duration is not None else max(ends, default=0.0))
+        self._times = [t for t, _ in self.profile]
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data['name'], data.get('profile', ()), data.get('events', ()),
+            data.get('duration'), data.get('follow_shift', True)
+        )
+
+    def target(self, t):
+        """Sollgeschwindigkeit zur Zeit t (s) oder None ohne Profil"""
+        if not self.profile:
+            return None
+        i = bisect.bisect_right(self._times, t)
+        if i == 0:
+            return self.profile[0][1]
+        if i == len(self.profile):
+            return self.profile[-1][1]
+        (t0, v0), (t1, v1) = self.profile[i - 1], self.profile[i]
+        return v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+
+
+def _stop_and_go(cycles, cruise, accelerate, hold, brake, wait):
+    profile = []
+    t = 0.0
+    for _ in range(cycles):
+        profile += [(t, 0), (t + wait, 0)]
+        t += wait
+        profile += [(t + accelerate, cruise), (t + accelerate + hold, cruise)]
+        t += accelerate + hold + brake
+        profile.append((t, 0))
+    return profile
+
+
+# Standard-Zyklen (vereinfacht, an die Fahrphysik des Sketches angepasst)
+SCENARIOS = {
+    'urban': Scenario('urban', _stop_and_go(6, 50, 12, 20, 10, 8)),
+    'suburban': Scenario('suburban', _stop_and_go(4, 80, 20, 40, 15, 5)),
+    'highway': Scenario('highway', [
+        (0, 0), (5, 0), (45, 120), (165, 120), (185, 90), (245, 90),
+        (265, 130), (325, 130), (355, 0), (360, 0),
+    ]),
+    # Feste Eingaben ohne Fahrer: Vollgas, Schalten nach Uhr
+    'launch': Scenario('launch', events=[
+        (0.5, 20.0, 'THROTTLE'), (4.0, None, 'SHIFT_UP'), (8.0, None, 'SHIFT_UP'),
+        (12.0, None, 'SHIFT_UP'), (16.0, None, 'SHIFT_UP'), (20.0, 28.0, 'BRAKE'),
+    ], duration=30.0, follow_shift=False),
+}
+
+
+def make_simulator(params=None):
+    """VehicleSimulator mit überschriebenen Schwellen, ohne Ausgabe"""
+    sim = VehicleSimulator(quiet=True)
+    for name, value in (params or {}).items():
+        setattr(sim, PARAMETERS[name], value)
+    return sim
+
+
+def drive(scenario, params=None):
+    """Fährt ein Szenario -> Strukturarray wie Recording.columns() + Sollgeschwindigkeit"""
+    import numpy as np
+    sim = make_simulator(params)
+    sim.send("ENGINE_TOGGLE")
+
+    events = scenario.events
+    next_event = 0
+    held = []                       # (bis_ms, befehl) - gehaltene Tasten
+    rows = []
+    targets = []
+    next_sample = sim.millis
+    next_step = sim.millis
+    start = sim.millis
+    end = start + int(scenario.duration * 1000)
+    shift_due = None
+
+    while sim.millis < end:
+        now = sim.millis
+        if now >= next_step:
+            next_step += DRIVER_STEP_MS
+            t = (now - start) / 1000.0
+
+            # Skriptierte Eingaben
+            while next_event < len(events) and events[next_event][0] <= t:
+                _, until, command = events[next_event]
+                next_event += 1
+                if until is None:
+                    sim.send(command)
+                else:
+                    held.append((start + int(until * 1000), command))
+            if held:
+                held = [(until, command) for until, command in held if until > now]
+                for _, command in held:
+                    sim.send(command)
+
+            # Fahrer folgt der Sollgeschwindigkeit
+            target = scenario.target(t)
+            if target is not None:
+                if sim.speed < target - SPEED_TOLERANCE or (target > 0 and sim.speed == 0):
+                    sim.send("THROTTLE")
+                elif sim.speed > target + SPEED_TOLERANCE:
+                    sim.send("BRAKE")
+                if sim.gear > 1 and sim.rpm < DOWNSHIFT_RPM and sim.speed > 0:
+                    sim.send("SHIFT_DOWN")
+
+            # ... und der Schaltempfehlung: einmal gesehen wird nach der Reaktionszeit
+            # geschaltet, auch wenn die Anzeige zwischendurch kurz zurückspringt
+            if scenario.follow_shift:
+                status = sim.rpm_status()
+                if shift_due is None:
+                    if sim.gear < 5 and status in SHIFT_SIGNALS:
+                        shift_due = now + SHIFT_REACTION_MS
+                elif now >= shift_due:
+                    shift_due = None
+                    braking = target is not None and sim.speed > target + SPEED_TOLERANCE
+                    if not braking and sim.rpm >= MIN_SHIFT_RPM:
+                        sim.send("SHIFT_UP")
+
+        sim.loop()
+
+        if sim.millis >= next_sample:
+            next_sample += SAMPLE_MS
+            flags = (FLAG_ENGINE_RUNNING if sim.engine_on else 0) | (FLAG_GAS if sim.gas_pressed else 0)
+            rows.append((
+                (sim.millis - start) * 1_000_000, sim.rpm, sim.speed, sim.gear,
+                sim.throttle, flags, STATUS_CODES[sim.rpm_status()]
+            ))
+            t = (sim.millis - start) / 1000.0
+            target = scenario.target(t)
+            targets.append(float('nan') if target is None else target)
+
+    return np.array(rows, dtype=record_dtype()), np.array(targets), sim
+
+
+def evaluate(scenario, params=None):
+    """Kennzahlen eines Laufs (gleiche Definitionen wie telemetry.analytics)"""
+    import numpy as np
+    from telemetry.analytics import analyze_columns
+    columns, targets, sim = drive(scenario, params)
+    stats = analyze_columns(columns, redline_rpm=sim.REDLINE_RPM)
+
+    duration = stats['duration_s'] or 1.0
+    rpm = columns['rpm'].astype(np.float64)
+    dt = SAMPLE_MS / 1000.0
+    error = np.abs(columns['speed'] - targets)
+    tracked = ~np.isnan(error)
+    return {
+        'duration_s': stats['duration_s'],
+        'distance_km': stats['distance_km'],
+        'tracking_error_kmh': float(error[tracked].mean()) if tracked.any() else 0.0,
+        'mean_rpm': float(rpm.mean()),
+        'revolutions_k': float(rpm.sum() * dt / 60.0 / 1000.0),
+        'shifts_up': stats['shifts_up'],
+        'shifts_down': stats['shifts_down'],
+        'shift_up_recommendations': stats['shift_up_recommendations'],
+        'missed_shift_up': stats['missed_shift_up'],
+        'redline_s': stats['redline_s'],
+        'high_rpm_pct': 100.0 * sum(stats['rpm_band_s'][3:]) / duration,
+        'speed_max': stats['speed_max'],
+    }
+
+
+def run_variant(job):
+    """Worker-Prozess: (params, szenario-namen oder dicts) -> {szenario: kennzahlen}"""
+    params, scenarios = job
+    result = {}
+    for scenario in scenarios:
+        if isinstance(scenario, dict):
+            scenario = Scenario.from_dict(scenario)
+        elif isinstance(scenario, str):
+            scenario = SCENARIOS[scenario]
+        result[scenario.name] = evaluate(scenario, params)
+    return result
+
+
+def grid(space):
+    """{'name': [werte], ...} -> Liste aller Kombinationen als dicts"""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def sweep(space, scenarios, workers=ANALYTICS_MAX_WORKERS):
+    """Alle Kombinationen parallel -> Liste (params, {szenario: kennzahlen})
+
+    scenarios: Namen aus SCENARIOS oder Szenario-dicts (müssen in den Worker passen).
+    """
+    variants = grid(space)
+    jobs = [(params, list(scenarios)) for params in variants]
+    # Viele kurze Aufgaben - in Paketen verschicken, sonst dominiert das Pickling
+    chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_variant, jobs, chunksize=chunksize))
+    return list(zip(variants, results))
+
+
+def _parse_values(text):
+    """'1800:2400:200' (von:bis:schritt, inkl.) oder '600,800,1000'"""
+    if ':' in text:
+        start, stop, step = (int(v) for v in text.split(':'))
+        return list(range(start, stop + 1, step))
+    return [int(v) for v in text.split(',')]
+
+
+def _totals(metrics):
+    """Kennzahlen über alle Szenarien einer Konfiguration (Summen, Fehler gemittelt)"""
+    runs = list(metrics.values())
+    total = {key: sum(run[key] for run in runs) for key in runs[0]}
+    total['tracking_error_kmh'] /= len(runs)
+    total['high_rpm_pct'] /= len(runs)
+    total['mean_rpm'] /= len(runs)
+    total['speed_max'] = max(run['speed_max'] for run in runs)
+    return total
+
+
+def main():
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Fahrzyklen und Parameter-Sweeps gegen den Simulator")
+    parser.add_argument('--scenario', default='urban,highway',
+                        help=f"Szenarien, kommagetrennt ({', '.join(SCENARIOS)})")
+    parser.add_argument('--file', metavar='DATEI', action='append', default=[],
+                        help="Szenario aus JSON (name, profile, events, duration)")
+    parser.add_argument('--sweep', metavar='NAME=WERTE', action='append', default=[],
+                        help=f"Parameter-Gitter, z.B. shift_up_base=1800:2400:200 "
+                             f"({', '.join(PARAMETERS)})")
+    parser.add_argument('--sort', default='tracking_error_kmh', help="Kennzahl für die Rangfolge")
+    parser.add_argument('--top', type=int, default=20, help="beste n Konfigurationen anzeigen")
+    parser.add_argument('--workers', type=int, default=ANALYTICS_MAX_WORKERS)
+    parser.add_argument('--json', metavar='DATEI', help="alle Ergebnisse als JSON")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenario.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unbekanntes Szenario: {', '.join(unknown)}")
+    for path in args.file:
+        with open(path) as f:
+            scenarios.append(json.load(f))
+
+    space = {}
+    for item in args.sweep:
+        name, sep, values = item.partition('=')
+        if not sep or name not in PARAMETERS:
+            parser.error(f"--sweep {item}: erwartet NAME=WERTE mit NAME aus {', '.join(PARAMETERS)}")
+        space[name] = _parse_values(values)
+
+    start = time.perf_counter()
+    results = sweep(space, scenarios, args.workers)
+    elapsed = time.perf_counter() - start
+
+    rows = [(params, _totals(metrics), metrics) for params, metrics in results]
+    if args.sort not in rows[0][1]:
+        parser.error(f"--sort: unbekannte Kennzahl {args.sort}")
+    rows.sort(key=lambda row: row[1][args.sort])
+
+    names = list(space)
+    header = "  ".join(f"{n:>{len(n)}}" for n in names)
+    print(f"{header}  {'Fehler':>7} {'U/min':>6} {'hoch':>5} {'verpasst':>8} {'Redline':>8} {'>5000':>6}")
+    for params, total, _ in rows[:args.top]:
+        values = "  ".join(f"{params[n]:>{len(n)}}" for n in names)
+        print(
+            f"{values}  {total['tracking_error_kmh']:6.2f}  {total['mean_rpm']:6.0f} "
+            f"{total['shifts_up']:5d} {total['missed_shift_up']:8d} "
+            f"{total['redline_s']:7.1f}s {total['high_rpm_pct']:5.1f}%"
+        )
+    simulated = sum(total['duration_s'] for _, total, _ in rows)
+    print(f"\n{len(rows)} Konfigurationen, {simulated / 3600:.1f} h simulierte Fahrt in {elapsed:.1f} s")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([
+                {'params': params, 'total': total, 'scenarios': metrics}
+                for params, total, metrics in rows
+            ], f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
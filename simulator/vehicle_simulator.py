@@ -0,0 +1,282 @@
+"""
+Fahrzeug-Simulator ohne Hardware
+Bildet obd2_learning.ino Schritt für Schritt nach, mit deterministischer Uhr
+"""
+
+from models.vehicle import VehicleSnapshot
+from communication.binary_protocol import BINARY_COMMAND, TEXT_COMMAND, encode_frame
+
+
+def constrain(value, low, high):
+    return max(low, min(high, value))
+
+
+class VehicleSimulator:
+    # Timing aus loop() des Sketches (ms)
+    LOOP_DELAY_MS = 10
+    RPM_INTERVAL_MS = 20
+    STATUS_INTERVAL_MS = 100
+    GAS_TIMEOUT_MS = 200
+
+    # Binärprotokoll: kürzere Schleife, Status mit 100 Hz
+    BINARY_LOOP_DELAY_MS = 2
+    BINARY_STATUS_INTERVAL_MS = 10
+
+    # Schwellen des Sketches - pro Instanz überschreibbar (simulator/scenarios.py)
+    MAX_RPM_BASE = 2000             # max_rpm_for_gear = BASE + gear * PER_GEAR
+    MAX_RPM_PER_GEAR = 1000
+    SHIFT_UP_BASE = 2000            # SHIFT_UP ab BASE + gear * PER_GEAR
+    SHIFT_UP_PER_GEAR = 800
+    HIGH_RPM = 5000
+    REDLINE_RPM = 6500
+
+    def __init__(self, quiet=False):
+        # quiet=True: keine Ausgabe erzeugen (z.B. für Parameter-Sweeps)
+        self.quiet = quiet
+
+        # Simulierte millis()
+        self.millis = 0
+
+        # Fahrzeug-Zustand
+        self.engine_on = False
+        self.rpm = 0
+        self.target_rpm = 0
+        self.speed = 0
+        self.gear = 1
+        self.throttle = 0
+        self.gas_pressed = False
+        self.brake_pressed = False
+
+        # Protokoll
+        self.binary_mode = False
+        self.frame_seq = 0
+
+        # Timing
+        self.last_rpm_update = 0
+        self.last_status_send = 0
+        self.last_gas_command = 0
+
+        # Serial-Puffer (Sicht des Arduinos)
+        self._rx = bytearray()
+        self.output = bytearray()
+
+        self.setup()
+
+    # --- Serial-Schnittstelle (Sicht des Hosts) ---
+
+    def write(self, data):
+        """Host -> Arduino"""
+        self._rx += data
+
+    def send(self, command):
+        self.write((command + "\n").encode())
+
+    def read_output(self):
+        """Arduino -> Host: alle seit dem letzten Aufruf erzeugten Bytes"""
+        data = bytes(self.output)
+        self.output.clear()
+        return data
+
+    # --- Uhr ---
+
+    def delay(self, ms):
+        self.millis += ms
+
+    def run(self, ms):
+        """Führt loop() aus, bis ms simulierte Millisekunden vergangen sind"""
+        end = self.millis + ms
+        while self.millis < end:
+            self.loop()
+
+    def snapshot(self, timestamp_ns=None):
+        """Aktueller Zustand als VehicleSnapshot (wie sendStatus() ihn meldet)"""
+        return VehicleSnapshot(
+            engine_running=self.engine_on, rpm=self.rpm, speed=self.speed,
+            gear=self.gear, throttle=self.throttle,
+            rpm_status=self.rpm_status(),
+            timestamp_ns=self.millis * 1_000_000 if timestamp_ns is None else timestamp_ns
+        )
+
+    # --- Sketch ---
+
+    def println(self, text=""):
+        if not self.quiet:
+            self.output += (text + "\r\n").encode()
+
+    def setup(self):
+        self.delay(1000)
+        self.println()
+        self.println("=== FAHRZEUG-SIMULATOR (OHNE HANDBREMSE) ===")
+        self.println("Befehle: ENGINE_TOGGLE, THROTTLE, BRAKE, SHIFT_UP, SHIFT_DOWN")
+        self.println("==========================================")
+        self.println()
+        self.send_status()
+
+    def loop(self):
+        now = self.millis
+
+        self.process_commands()
+
+        # RPM-Updates alle 20 ms
+        if now - self.last_rpm_update >= self.RPM_INTERVAL_MS:
+            self.update_rpm()
+            self.last_rpm_update = now
+
+        # Status alle 100 ms (binär alle 10 ms)
+        interval = self.BINARY_STATUS_INTERVAL_MS if self.binary_mode else self.STATUS_INTERVAL_MS
+        if now - self.last_status_send >= interval:
+            self.send_status()
+            self.last_status_send = now
+
+        # Gas-Timeout
+        if now - self.last_gas_command > self.GAS_TIMEOUT_MS and self.gas_pressed:
+            self.gas_pressed = False
+            self.println(">>> Gas losgelassen (Timeout)")
+
+        self.delay(self.BINARY_LOOP_DELAY_MS if self.binary_mode else self.LOOP_DELAY_MS)
+
+    def process_commands(self):
+        # Wie Serial.readStringUntil('\n'): ein Befehl pro loop()
+        end = self._rx.find(b'\n')
+        if end < 0:
+            return
+        cmd = self._rx[:end].decode(errors='ignore').strip()
+        del self._rx[:end + 1]
+
+        if cmd == "ENGINE_TOGGLE":
+            self.toggle_engine()
+        elif cmd == "THROTTLE":
+            self.handle_throttle()
+        elif cmd == "BRAKE":
+            self.handle_brake()
+        elif cmd == "SHIFT_UP":
+            self.shift_up()
+        elif cmd == "SHIFT_DOWN":
+            self.shift_down()
+        elif cmd == BINARY_COMMAND:
+            self.binary_mode = True
+            self.println("PROTO:BINARY:1")
+        elif cmd == TEXT_COMMAND:
+            self.binary_mode = False
+            self.println("PROTO:TEXT")
+
+    def toggle_engine(self):
+        if not self.engine_on:
+            self.engine_on = True
+            self.rpm = self.target_rpm = 850
+            self.gear = 1
+            self.println("*** MOTOR GESTARTET! RPM: 850 ***")
+            self.delay(50)
+        else:
+            if self.speed == 0:
+                self.engine_on = False
+                self.rpm = self.target_rpm = self.throttle = 0
+                self.gas_pressed = False
+                self.println("*** MOTOR GESTOPPT! ***")
+                self.delay(50)
+            else:
+                self.println(">>> Motor Stop fehlgeschlagen - Auto fährt noch!")
+
+    def handle_throttle(self):
+        if self.engine_on:
+            self.gas_pressed = True
+            self.last_gas_command = self.millis
+            max_rpm_for_gear = self.MAX_RPM_BASE + self.gear * self.MAX_RPM_PER_GEAR
+            self.target_rpm = min(7000, max_rpm_for_gear)
+            self.println(f"> GAS! target_rpm={self.target_rpm}")
+
+    def handle_brake(self):
+        self.brake_pressed = True
+        self.gas_pressed = False
+        self.throttle = max(0, self.throttle - 25)
+        self.target_rpm = 850
+        self.speed = max(0, self.speed - 8)
+        self.println(f">>> BREMSE! Throttle: {self.throttle}% | Speed: {self.speed}")
+        self.delay(20)
+
+    def shift_up(self):
+        if not self.engine_on:
+            self.println(">>> Schalten fehlgeschlagen - Motor aus!")
+            return
+        if self.gear >= 5:
+            self.println(">>> Bereits höchster Gang!")
+            return
+        if self.rpm < 1500:
+            self.println(">>> RPM zu niedrig - Min 1500!")
+            return
+        old = self.gear
+        self.gear += 1
+        self.rpm = max(850, self.rpm - 400)
+        self.target_rpm = max(850, self.target_rpm - 400)
+        self.println(f">>> HOCHGESCHALTET! {old} -> {self.gear} | RPM: {self.rpm}")
+        self.delay(20)
+
+    def shift_down(self):
+        if not self.engine_on:
+            self.println(">>> Schalten fehlgeschlagen - Motor aus!")
+            return
+        if self.gear <= 1:
+            self.println(">>> Bereits niedrigster Gang!")
+            return
+        old = self.gear
+        self.gear -= 1
+        new_r = self.rpm + 500
+        if new_r > 6000:
+            self.println(">>> Runterschalten würde überdrehen!")
+            self.gear = old
+            return
+        self.rpm = new_r
+        self.target_rpm = min(self.target_rpm + 500, 7000)
+        self.println(f">>> RUNTERGESCHALTET! {old} -> {self.gear} | RPM: {self.rpm}")
+        self.delay(20)
+
+    def update_rpm(self):
+        if not self.engine_on:
+            self.rpm = self.target_rpm = 0
+            return
+        if self.gas_pressed and self.rpm < self.target_rpm:
+            self.rpm += 80  # Beschleunigung
+        else:
+            # Leerlauf
+            self.target_rpm = 850
+            if self.rpm > self.target_rpm:
+                self.rpm -= 30
+            elif self.rpm < self.target_rpm:
+                self.rpm += 20
+        self.rpm = constrain(self.rpm, 0, 7000)
+        if self.rpm > 1000:
+            self.speed = constrain((self.rpm - 850) // (20 + self.gear * 5), 0, 200)
+        else:
+            self.speed = max(0, self.speed - 1)
+        if not self.gas_pressed:
+            self.throttle = max(0, self.throttle - 5)
+
+    def rpm_status(self):
+        """RPM_STATUS wie in sendStatus()"""
+        if self.rpm > self.REDLINE_RPM:
+            return "REDLINE"
+        elif self.rpm > self.HIGH_RPM:
+            return "HIGH"
+        elif self.gear < 5 and self.rpm > (self.SHIFT_UP_BASE + self.gear * self.SHIFT_UP_PER_GEAR):
+            return "SHIFT_UP"
+        return "OK"
+
+    def send_status(self):
+        if self.binary_mode:
+            self.send_status_frame()
+            return
+        self.println(f"ENGINE_RUNNING:{'1' if self.engine_on else '0'}")
+        self.println(f"RPM:{self.rpm}")
+        self.println(f"SPEED:{self.speed}")
+        self.println(f"GEAR:{self.gear}")
+        self.println(f"THROTTLE:{self.throttle}")
+        self.println(f"RPM_STATUS:{self.rpm_status()}")
+        self.println()
+
+    def send_status_frame(self):
+        if not self.quiet:
+            self.output += encode_frame(
+                self.frame_seq, self.millis, self.engine_on, self.rpm, self.speed,
+                self.gear, self.throttle, self.rpm_status(), gas=self.gas_pressed
+            )
+        self.frame_seq = (self.frame_seq + 1) & 0xFF
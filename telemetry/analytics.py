@@ -0,0 +1,351 @@
+"""
+Auswertung von Aufzeichnungen
+Kennzahlen je Fahrt spaltenweise mit NumPy, Dateien parallel in einem Prozess-Pool,
+Ergebnisse pro Datei nach Inhalts-Hash zwischengespeichert
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from telemetry.record_format import FLAG_ENGINE_RUNNING, RECORD_SUFFIX, STATUS_CODES
+from config.settings import (
+    RPM_BANDS, SPEED_BIN_KMH, SHIFT_UP_GRACE, ANALYTICS_MAX_GAP, ANALYTICS_CACHE_FILE,
+    ANALYTICS_MAX_WORKERS, ENGINE_REDLINE_RPM, MAX_SPEED, RECORDING_DIR
+)
+
+# Bei geänderter Berechnung hochzählen - alte Cache-Einträge werden verworfen
+ANALYTICS_VERSION = 1
+
+BAND_NAMES = ("aus/leerlauf", "normal", "sportlich", "hoch", "redline")
+
+_SHIFT_UP = STATUS_CODES['SHIFT_UP']
+_HASH_CHUNK = 1 << 20
+
+
+def _parameters():
+    """Alles, was das Ergebnis beeinflusst, außer dem Dateiinhalt"""
+    return {
+        'version': ANALYTICS_VERSION,
+        'rpm_bands': list(RPM_BANDS),
+        'speed_bin_kmh': SPEED_BIN_KMH,
+        'shift_up_grace': SHIFT_UP_GRACE,
+        'max_gap': ANALYTICS_MAX_GAP,
+        'redline_rpm': ENGINE_REDLINE_RPM,
+    }
+
+
+def _runs(mask):
+    """Zusammenhängende True-Bereiche -> (starts, ends), ends exklusiv"""
+    import numpy as np
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def analyze_columns(columns, redline_rpm=ENGINE_REDLINE_RPM):
+    """Kennzahlen einer Fahrt aus dem Strukturarray von Recording.columns()
+
+    Jeder Datensatz gilt bis zum nächsten (wie im Verlauf); Lücken über
+    ANALYTICS_MAX_GAP zählen nicht mit.
+    """
+    import numpy as np
+    count = len(columns)
+    if count < 2:
+        return {'samples': count, 'duration_s': 0.0}
+
+    ts = columns['timestamp_ns']
+    rpm = columns['rpm'].astype(np.int32)
+    speed = columns['speed'].astype(np.int32)
+    gear = columns['gear'].astype(np.int16)
+    running = (columns['flags'] & FLAG_ENGINE_RUNNING) != 0
+
+    dt = np.diff(ts) / 1e9
+    dt[(dt < 0) | (dt > ANALYTICS_MAX_GAP)] = 0.0
+    dt = np.append(dt, 0.0)
+    duration = float(dt.sum())
+
+    # Zeit je RPM-Bereich
+    band = np.searchsorted(np.asarray(RPM_BANDS), rpm, side='right')
+    band_s = np.bincount(band, weights=dt, minlength=len(RPM_BANDS) + 1)
+
+    # Schaltvorgänge nur bei laufendem Motor (Motorstart setzt den Gang auf 1)
+    step = np.diff(gear)
+    both_running = running[1:] & running[:-1]
+    up = (step > 0) & both_running
+    down = (step < 0) & both_running
+
+    # Nicht befolgte SHIFT_UP-Empfehlungen: kein Hochschalten bis Ende + Karenz
+    starts, ends = _runs(columns['status'] == _SHIFT_UP)
+    ups_before = np.concatenate(([0], np.cumsum(up)))   # Hochschaltungen vor Index i
+    # letzter Datensatz innerhalb der Karenz nach dem Ende der Empfehlung
+    grace_end = np.searchsorted(ts, ts[ends - 1] + int(SHIFT_UP_GRACE * 1e9), side='right') - 1
+    missed = int(np.count_nonzero(ups_before[grace_end] == ups_before[starts]))
+
+    # Redline wie im Verlauf: Intervall zählt, wenn es über der Grenze beginnt
+    over = rpm > redline_rpm
+    red_starts, red_ends = _runs(over)
+    red_time = np.concatenate(([0.0], np.cumsum(dt)))
+    red_dwell = red_time[red_ends] - red_time[red_starts]
+
+    # Geschwindigkeit: Zeit je Klasse, Perzentile während der Fahrt
+    bins = np.minimum(speed // SPEED_BIN_KMH, MAX_SPEED // SPEED_BIN_KMH)
+    speed_s = np.bincount(bins, weights=dt, minlength=MAX_SPEED // SPEED_BIN_KMH + 1)
+    moving = speed > 0
+    moving_speed = speed[moving]
+    p50, p95 = (np.percentile(moving_speed, (50, 95)) if moving_speed.size else (0.0, 0.0))
+
+    return {
+        'samples': count,
+        'duration_s': duration,
+        'running_s': float(dt[running].sum()),
+        'moving_s': float(dt[moving].sum()),
+        'distance_km': float((speed * dt).sum() / 3600.0),
+        'rpm_band_s': band_s.tolist(),
+        'shifts_up': int(up.sum()),
+        'shifts_down': int(down.sum()),
+        'shift_up_recommendations': int(starts.size),
+        'missed_shift_up': missed,
+        'redline_s': float(dt[over].sum()),
+        'redline_events': int(red_starts.size),
+        'redline_longest_s': float(red_dwell.max()) if red_dwell.size else 0.0,
+        'speed_bin_s': speed_s.tolist(),
+        'speed_max': int(speed.max()),
+        'speed_p50_moving': float(p50),
+        'speed_p95_moving': float(p95),
+    }
+
+
+def analyze_file(path):
+    """Worker-Prozess: eine Aufzeichnung -> Kennzahlen"""
+    from telemetry.replay import Recording
+    recording = Recording(path)
+    try:
+        columns = recording.columns()
+        stats = analyze_columns(columns)
+        del columns   # Sicht auf die mmap vor close() freigeben
+    finally:
+        recording.close()
+    return stats
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def combine(results):
+    """Kennzahlen mehrerer Fahrten zusammenfassen (Summen, Maxima)"""
+    total = {
+        'trips': 0, 'samples': 0, 'duration_s': 0.0, 'running_s': 0.0, 'moving_s': 0.0,
+        'distance_km': 0.0, 'shifts_up': 0, 'shifts_down': 0, 'shift_up_recommendations': 0,
+        'missed_shift_up': 0, 'redline_s': 0.0, 'redline_events': 0,
+        'redline_longest_s': 0.0, 'speed_max': 0,
+        'rpm_band_s': [0.0] * (len(RPM_BANDS) + 1),
+        'speed_bin_s': [0.0] * (MAX_SPEED // SPEED_BIN_KMH + 1),
+    }
+    for stats in results:
+        if not stats.get('duration_s'):
+            continue
+        total['trips'] += 1
+        for key in list(total):
+            value = total[key]
+            if key == 'trips' or key not in stats:
+                continue
+            if key in ('redline_longest_s', 'speed_max'):
+                total[key] = max(value, stats[key])
+            elif isinstance(value, list):
+                total[key] = [a + b for a, b in zip(value, stats[key])]
+            else:
+                total[key] = value + stats[key]
+    return total
+
+
+class AnalyticsCache:
+    """Ergebnisse pro Inhalts-Hash in einer JSON-Datei neben den Aufzeichnungen"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        try:
+            with open(path) as f:
+                document = json.load(f)
+        except (OSError, ValueError):
+            return
+        if document.get('parameters') == _parameters():
+            self.entries = document.get('files', {})
+
+    def get(self, digest):
+        return self.entries.get(digest)
+
+    def put(self, digest, stats):
+        self.entries[digest] = stats
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'parameters': _parameters(), 'files': self.entries}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def find_recordings(paths):
+    """Dateien und Ordner (nicht rekursiv) -> sortierte Liste von Aufzeichnungen"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found += [
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith(RECORD_SUFFIX)
+            ]
+        elif os.path.isfile(path):
+            found.append(path)
+    return sorted(found)
+
+
+def analyze_recordings(paths, cache=None, workers=ANALYTICS_MAX_WORKERS):
+    """Aufzeichnungen -> ({pfad: kennzahlen}, anzahl neu berechneter Dateien)
+
+    Nur Dateien ohne Cache-Treffer werden gerechnet.
+    """
+    # Hashen ist reines I/O + hashlib (gibt die GIL frei) - Threads reichen
+    with ThreadPoolExecutor(max_workers=min(8, len(paths) or 1)) as pool:
+        digests = dict(zip(paths, pool.map(file_hash, paths)))
+
+    results = {}
+    pending = {}
+    for path, digest in digests.items():
+        stats = cache.get(digest) if cache else None
+        if stats is not None:
+            results[path] = stats
+        else:
+            # Gleicher Inhalt unter mehreren Namen wird nur einmal gerechnet
+            pending.setdefault(digest, []).append(path)
+
+    for digest, stats in _compute(pending, workers).items():
+        if cache and 'error' not in stats:
+            cache.put(digest, stats)
+        for path in pending[digest]:
+            results[path] = stats
+    return results, sum(map(len, pending.values()))
+
+
+def _failed(error):
+    kind = type(error)
+    name = kind.__qualname__ if kind.__module__ == 'builtins' else f"{kind.__module__}.{kind.__qualname__}"
+    return {'error': f"{name}: {error}"}
+
+
+def _compute(pending, workers):
+    """{digest: [pfade]} -> {digest: kennzahlen oder {'error': ...}} - Fehler nur je Datei"""
+    outcome = {}
+    broken = []
+    if not pending:
+        return outcome
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = {digest: pool.submit(analyze_file, names[0]) for digest, names in pending.items()}
+        for digest, job in jobs.items():
+            try:
+                outcome[digest] = job.result()
+            except BrokenProcessPool:
+                broken.append(digest)
+            except Exception as e:
+                # Abgeschnittene oder kaputte Datei (struct.error, KeyError, ...)
+                outcome[digest] = _failed(e)
+    # Ein abgestürzter Worker reißt alle offenen Aufträge mit - einzeln wiederholen,
+    # damit nur die schuldige Datei als fehlerhaft gilt
+    for digest in broken:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                outcome[digest] = pool.submit(analyze_file, pending[digest][0]).result()
+            except Exception as e:
+                outcome[digest] = _failed(e)
+    return outcome
+
+
+def format_report(results, total):
+    lines = []
+    header = f"{'Fahrt':<32} {'Dauer':>8} {'km':>7} {'hoch':>5} {'runter':>6} {'verpasst':>8} {'Redline':>8}"
+    lines.append(header)
+    lines.append("-" * len(header))
+    for path, stats in results.items():
+        name = os.path.basename(path)[:32]
+        if 'error' in stats:
+            lines.append(f"{name:<32} Fehler: {stats['error']}")
+            continue
+        if not stats.get('duration_s'):
+            lines.append(f"{name:<32} (leer)")
+            continue
+        lines.append(
+            f"{name:<32} {stats['duration_s'] / 60:7.1f}m {stats['distance_km']:7.2f} "
+            f"{stats['shifts_up']:5d} {stats['shifts_down']:6d} "
+            f"{stats['missed_shift_up']:4d}/{stats['shift_up_recommendations']:<3d} "
+            f"{stats['redline_s']:7.1f}s"
+        )
+
+    duration = total['duration_s'] or 1.0
+    lines.append("")
+    lines.append(f"{total['trips']} Fahrten, {total['duration_s'] / 3600:.2f} h, "
+                 f"{total['distance_km']:.1f} km, max. {total['speed_max']} km/h")
+    edges = (0,) + tuple(RPM_BANDS)
+    for name, low, seconds in zip(BAND_NAMES, edges, total['rpm_band_s']):
+        lines.append(f"  RPM ab {low:>5} ({name:<12}): {100 * seconds / duration:5.1f} %")
+    lines.append(f"  Schaltvorgänge: {total['shifts_up']} hoch, {total['shifts_down']} runter, "
+                 f"{total['missed_shift_up']} von {total['shift_up_recommendations']} "
+                 f"SHIFT_UP-Empfehlungen nicht befolgt")
+    lines.append(f"  Redline: {total['redline_s']:.1f} s in {total['redline_events']} Phasen, "
+                 f"längste {total['redline_longest_s']:.1f} s")
+    moving = total['moving_s'] or 1.0
+    lines.append("  Geschwindigkeit (Anteil der Fahrzeit):")
+    for index, seconds in enumerate(total['speed_bin_s']):
+        if seconds:
+            low = index * SPEED_BIN_KMH
+            lines.append(f"    {low:>3}-{low + SPEED_BIN_KMH - 1:<3} km/h: {100 * seconds / moving:5.1f} %")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Kennzahlen über aufgezeichnete Fahrten")
+    parser.add_argument('paths', nargs='*', default=[RECORDING_DIR],
+                        help=f"Aufzeichnungen oder Ordner (Standard: {RECORDING_DIR})")
+    parser.add_argument('--workers', type=int, default=ANALYTICS_MAX_WORKERS,
+                        help="Prozesse (Standard: alle Kerne)")
+    parser.add_argument('--no-cache', action='store_true', help="alles neu rechnen")
+    parser.add_argument('--json', metavar='DATEI', help="Ergebnis zusätzlich als JSON")
+    args = parser.parse_args()
+
+    paths = find_recordings(args.paths)
+    if not paths:
+        parser.error("keine Aufzeichnungen gefunden")
+
+    # Cache im Ordner der ersten Aufzeichnung
+    cache = None
+    if not args.no_cache:
+        cache = AnalyticsCache(os.path.join(os.path.dirname(paths[0]), ANALYTICS_CACHE_FILE))
+
+    results, computed = analyze_recordings(paths, cache, args.workers)
+    if cache:
+        cache.save()
+    total = combine(stats for stats in results.values() if 'error' not in stats)
+
+    print(format_report(results, total))
+    failed = sum('error' in stats for stats in results.values())
+    print(f"\n{computed} neu berechnet, {len(paths) - computed} aus dem Cache"
+          + (f", {failed} fehlerhaft" if failed else ""))
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'parameters': _parameters(), 'trips': results, 'total': total},
+                      f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
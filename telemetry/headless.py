@@ -0,0 +1,136 @@
+"""
+Betrieb ohne GUI
+Serielle Verbindung, Aufzeichnung und Ausgabe auf Konsole und/oder Socket - ohne tkinter
+"""
+
+import asyncio
+
+from communication.async_link import AsyncSerialLink
+from config.settings import (
+    HEADLESS_PRINT_INTERVAL, HEADLESS_RECORD_QUEUE, RECORDING_DIR, RECORDING_FSYNC_INTERVAL,
+    TELEMETRY_HOST, TELEMETRY_PORT
+)
+
+
+def status_line(snapshot):
+    """Eine Konsolenzeile pro Snapshot"""
+    return (
+        f"{'AN ' if snapshot.engine_running else 'AUS'}  "
+        f"{snapshot.rpm:5d} U/min  {snapshot.speed:3d} km/h  Gang {snapshot.gear}  "
+        f"Gas {snapshot.throttle:3d}%  {snapshot.rpm_status}"
+    )
+
+
+class HeadlessRunner:
+    def __init__(self, link=None, record=False, interval=HEADLESS_PRINT_INTERVAL,
+                 listen=None, unix=None):
+        # listen: (host, port) für TCP, unix: Socket-Pfad - beides None = nur Konsole
+        self.link = link or AsyncSerialLink()
+        self.record = record
+        self.interval = interval
+        self.listen = listen
+        self.unix = unix
+
+        self.recorder = None
+        self.server = None
+        self._tasks = []
+        self._recording = None  # _record()-Task, endet selbst mit dem Abonnement
+        self._syncing = None    # laufendes sync() im Executor
+
+    async def start(self):
+        if self.record:
+            from telemetry.recorder import TelemetryRecorder
+            # fsync blockiert - nie in der Event-Loop, sondern in _sync() im Executor
+            self.recorder = TelemetryRecorder.create_session(RECORDING_DIR, fsync_interval=None)
+            print(f"Aufzeichnung: {self.recorder.path}")
+
+        if self.listen or self.unix:
+            # Der Server startet die Verbindung selbst und setzt deren Callbacks
+            from telemetry.server import TelemetryServer
+            host, port = self.listen or (TELEMETRY_HOST, TELEMETRY_PORT)
+            self.server = TelemetryServer(self.link, host=host, port=port, path=self.unix)
+            await self.server.start()
+            print(f"Telemetrie-Server: {self.unix or f'{host}:{self.server.port}'}")
+        else:
+            self.link.start()
+
+        # Eigene Callbacks vor die des Servers hängen
+        forward_line = self.link.on_data_received
+        forward_event = self.link.on_connection_changed
+
+        def on_line(line):
+            if self.recorder:
+                self.recorder.record_line(line)
+            if forward_line:
+                forward_line(line)
+
+        def on_connection_changed(connected, message):
+            print(message)
+            if forward_event:
+                forward_event(connected, message)
+
+        self.link.on_data_received = on_line
+        self.link.on_connection_changed = on_connection_changed
+
+        if self.recorder:
+            self._recording = asyncio.ensure_future(self._record())
+            self._tasks.append(asyncio.ensure_future(self._sync()))
+        if self.interval:
+            self._tasks.append(asyncio.ensure_future(self._print_status()))
+        return self
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.server:
+            await self.server.close()
+        else:
+            await self.link.close()
+        if self.recorder:
+            # close() der Verbindung beendet das Abonnement - _record() schreibt den Rest noch
+            await asyncio.gather(self._recording, return_exceptions=True)
+            # Ein abgebrochenes _sync() läuft im Thread weiter - erst abwarten, dann schließen
+            if self._syncing:
+                await asyncio.gather(self._syncing, return_exceptions=True)
+            await asyncio.get_running_loop().run_in_executor(None, self.recorder.close)
+
+    async def run_forever(self):
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    async def _record(self):
+        # Aufzeichnen darf nichts verlieren - großer Puffer, schreiben ist billig
+        with self.link.subscribe(maxlen=HEADLESS_RECORD_QUEUE) as snapshots:
+            async for snapshot in snapshots:
+                self.recorder.record(snapshot)
+
+    async def _sync(self):
+        """flush + fsync im Executor - die Loop empfängt währenddessen weiter"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(RECORDING_FSYNC_INTERVAL)
+            self._syncing = loop.run_in_executor(None, self.recorder.sync)
+            await asyncio.shield(self._syncing)
+
+    async def _print_status(self):
+        """Nur der jeweils neueste Stand - die Konsole bremst den Empfang nicht"""
+        shown = None
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = self.link.latest
+            if snapshot is not None and snapshot is not shown:
+                shown = snapshot
+                print(status_line(snapshot), flush=True)
+
+
+def run(port=None, record=False, interval=HEADLESS_PRINT_INTERVAL, listen=None, unix=None):
+    """Blockiert bis Strg+C"""
+    runner = HeadlessRunner(AsyncSerialLink(port), record, interval, listen, unix)
+    try:
+        asyncio.run(runner.run_forever())
+    except KeyboardInterrupt:
+        pass
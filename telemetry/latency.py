@@ -0,0 +1,207 @@
+"""
+Latenz-Messung Taste -> Pixel
+Zeitstempel je Stufe, Auswertung in vorbelegten HDR-artigen Histogrammen
+"""
+
+import json
+import threading
+import time
+from array import array
+
+# 16 Unterteilungen pro Zweierpotenz -> ca. 6 % Auflösung
+_SUB_BITS = 4
+_SUB = 1 << _SUB_BITS
+
+
+def _bucket(value):
+    """Wert (µs) -> Bucket-Index, linear bis 2*_SUB, danach logarithmisch"""
+    if value < 2 * _SUB:
+        return value
+    shift = value.bit_length() - (_SUB_BITS + 1)
+    return shift * _SUB + (value >> shift)
+
+
+def _bucket_floor(index):
+    """Kleinster Wert eines Buckets"""
+    if index < 2 * _SUB:
+        return index
+    shift, top = divmod(index, _SUB)
+    return (top + _SUB) << (shift - 1)
+
+
+class LatencyHistogram:
+    """Histogramm in µs mit fester Größe - record() ohne Allokation"""
+
+    def __init__(self, max_us=60_000_000):
+        self.max_us = max_us
+        self.counts = array('Q', bytes(8 * (_bucket(max_us) + 1)))
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_seen_us = 0
+
+    def record(self, value_us):
+        value_us = min(max(0, int(value_us)), self.max_us)
+        self.counts[_bucket(value_us)] += 1
+        self.count += 1
+        self.total_us += value_us
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_seen_us:
+            self.max_seen_us = value_us
+
+    def percentile(self, p):
+        """Untergrenze des Buckets, in dem das p-Perzentil liegt (µs)"""
+        if not self.count:
+            return 0
+        rank = max(1, int(round(p / 100.0 * self.count)))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _bucket_floor(index)
+        return self.max_seen_us
+
+    def summary(self):
+        """Kennzahlen in ms"""
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'min_ms': self.min_us / 1000.0,
+            'mean_ms': self.total_us / self.count / 1000.0,
+            'p50_ms': self.percentile(50) / 1000.0,
+            'p90_ms': self.percentile(90) / 1000.0,
+            'p99_ms': self.percentile(99) / 1000.0,
+            'max_ms': self.max_seen_us / 1000.0,
+        }
+
+
+def _reflects(command, before, after):
+    """True, wenn der neue Status die Wirkung des Befehls zeigt"""
+    if command == "ENGINE_TOGGLE":
+        return after.engine_running != before.engine_running
+    if command == "THROTTLE":
+        return after.rpm > before.rpm
+    if command == "BRAKE":
+        return after.speed < before.speed or after.rpm < before.rpm
+    if command in ("SHIFT_UP", "SHIFT_DOWN"):
+        return after.gear != before.gear
+    return False
+
+
+class _Trace:
+    __slots__ = ('command', 'before', 'key_ns', 'queued_ns', 'written_ns', 'status_ns')
+
+    def __init__(self, command, before, key_ns, queued_ns):
+        self.command = command
+        self.before = before
+        self.key_ns = key_ns
+        self.queued_ns = queued_ns
+        self.written_ns = None
+        self.status_ns = None
+
+
+class LatencyTracer:
+    # Abschnitte der Kette Taste -> Pixel
+    SEGMENTS = (
+        ('key_to_queued', "Taste -> Warteschlange"),
+        ('queued_to_written', "Warteschlange -> write()"),
+        ('written_to_status', "write() -> Status"),
+        ('status_to_rendered', "Status -> Widget"),
+        ('key_to_rendered', "Taste -> Widget"),
+    )
+
+    def __init__(self, max_open=32, timeout_s=2.0):
+        self.histograms = {name: LatencyHistogram() for name, _ in self.SEGMENTS}
+        self.max_open = max_open
+        self.timeout_ns = int(timeout_s * 1e9)
+        self.unmatched = 0
+
+        # Offene Spuren: warten auf write(), auf Status, auf das Rendern
+        self._open = []
+        self._done = []
+        self._lock = threading.Lock()
+
+    def _record(self, name, start_ns, end_ns):
+        if start_ns is not None and end_ns is not None:
+            self.histograms[name].record((end_ns - start_ns) // 1000)
+
+    # --- Stufen (jeweils aus dem Thread, in dem sie passieren) ---
+
+    def command_queued(self, command, before, key_ns=None):
+        """Tk-Thread: Befehl eingereiht, before = Snapshot zu diesem Zeitpunkt"""
+        now = time.monotonic_ns()
+        self._record('key_to_queued', key_ns, now)
+        with self._lock:
+            if len(self._open) >= self.max_open:
+                self._open.pop(0)
+                self.unmatched += 1
+            self._open.append(_Trace(command, before, key_ns, now))
+
+    def commands_written(self, commands):
+        """Writer-Thread: diese Befehle sind mit einem write() hinaus"""
+        if not self._open:
+            return
+        now = time.monotonic_ns()
+        with self._lock:
+            for trace in self._open:
+                if trace.written_ns is None and trace.command in commands:
+                    trace.written_ns = now
+                    self._record('queued_to_written', trace.queued_ns, now)
+
+    def snapshot_received(self, snapshot):
+        """Serial-Thread: erster Status, der die Wirkung zeigt, beendet die Wartezeit"""
+        if not self._open:
+            return
+        now = snapshot.timestamp_ns or time.monotonic_ns()
+        with self._lock:
+            still_open = []
+            for trace in self._open:
+                if trace.written_ns is not None and _reflects(trace.command, trace.before, snapshot):
+                    trace.status_ns = now
+                    self._record('written_to_status', trace.written_ns, now)
+                    self._done.append(trace)
+                elif now - trace.queued_ns > self.timeout_ns:
+                    self.unmatched += 1
+                else:
+                    still_open.append(trace)
+            self._open = still_open
+
+    def snapshot_rendered(self, snapshot):
+        """Tk-Thread: Widgets zeigen snapshot (oder einen neueren)"""
+        if not self._done:
+            return
+        now = time.monotonic_ns()
+        with self._lock:
+            waiting = []
+            for trace in self._done:
+                if snapshot.timestamp_ns >= trace.status_ns:
+                    self._record('status_to_rendered', trace.status_ns, now)
+                    self._record('key_to_rendered', trace.key_ns, now)
+                else:
+                    waiting.append(trace)
+            self._done = waiting
+
+    # --- Auswertung ---
+
+    def summary(self):
+        result = {name: self.histograms[name].summary() for name, _ in self.SEGMENTS}
+        result['unmatched'] = self.unmatched
+        return result
+
+    def overlay_text(self):
+        """Kurzfassung für das Debug-Overlay"""
+        lines = []
+        for name, label in self.SEGMENTS:
+            h = self.histograms[name]
+            if h.count:
+                lines.append(
+                    f"{label}: p50 {h.percentile(50) / 1000:.1f}  "
+                    f"p99 {h.percentile(99) / 1000:.1f} ms  (n={h.count})"
+                )
+        return "\n".join(lines) or "Noch keine Latenz-Messung"
+
+    def export(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
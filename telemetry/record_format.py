@@ -0,0 +1,44 @@
+"""
+Binärformat der Telemetrie-Aufzeichnung
+Header + Datensätze fester Länge, little-endian
+16 Byte pro Snapshot: ca. 5x kleiner als ein Text-Status-Block (71-81 Byte), ca. 10x
+kleiner als dessen Zeilen mit Zeitstempel - feste Länge hält seek() und mmap-Spalten einfach
+"""
+
+import struct
+
+MAGIC = b'OBD2REC\x00'
+VERSION = 1
+
+# magic, version, record_size, start wall-clock (ns), start monotonic (ns)
+HEADER = struct.Struct('<8sHHqq4x')
+
+# monotonic ns, rpm, speed, gear, throttle, flags, status
+RECORD = struct.Struct('<qHHBBBB')
+
+# Bits in flags
+FLAG_ENGINE_RUNNING = 0x01
+FLAG_GAS = 0x02
+FLAG_BRAKE = 0x04
+
+# RPM_STATUS <-> Code
+STATUS_NAMES = ('OK', 'SHIFT_UP', 'SHIFT_DOWN', 'HIGH', 'REDLINE')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+STATUS_UNKNOWN = 0xFF
+
+# Dateiendungen
+RECORD_SUFFIX = '.obd2rec'
+LINES_SUFFIX = '.lines'
+
+
+def status_name(code):
+    return STATUS_NAMES[code] if code < len(STATUS_NAMES) else "UNKNOWN"
+
+
+def record_dtype():
+    """RECORD als NumPy-dtype (Spalten-Auswertung, z.B. Recording.columns())"""
+    import numpy as np
+    return np.dtype([
+        ('timestamp_ns', '<i8'), ('rpm', '<u2'), ('speed', '<u2'),
+        ('gear', 'u1'), ('throttle', 'u1'), ('flags', 'u1'), ('status', 'u1'),
+    ])
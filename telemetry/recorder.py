@@ -0,0 +1,97 @@
+"""
+Telemetrie-Recorder
+Schreibt jeden Snapshot als Datensatz fester Länge, Rohzeilen in eine Nebendatei
+"""
+
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+
+from telemetry.record_format import (
+    HEADER, RECORD, MAGIC, VERSION, FLAG_ENGINE_RUNNING, FLAG_GAS, FLAG_BRAKE,
+    STATUS_CODES, STATUS_UNKNOWN, RECORD_SUFFIX, LINES_SUFFIX
+)
+from config.settings import RECORDING_FSYNC_INTERVAL, RECORDING_BUFFER_SIZE
+
+
+class TelemetryRecorder:
+    def __init__(self, path, fsync_interval=RECORDING_FSYNC_INTERVAL,
+                 buffer_size=RECORDING_BUFFER_SIZE):
+        # fsync_interval None: record() synchronisiert nie selbst - der Besitzer ruft sync()
+        # aus einem eigenen Thread, damit fsync den Empfang nicht aufhält
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.records = 0
+        self.dropped = 0
+
+        self._file = open(path, 'wb', buffering=buffer_size)
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, RECORD.size, time.time_ns(), time.monotonic_ns()
+        ))
+        self._lines = open(path + LINES_SUFFIX, 'w', encoding='utf-8',
+                           buffering=buffer_size)
+
+        self._pack = RECORD.pack
+        self._write = self._file.write
+        self._last_sync = time.monotonic()
+        # Schreiben und flush() - fsync selbst läuft ohne Sperre
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create_session(cls, directory, **kwargs):
+        """Legt eine neue Aufzeichnung mit Zeitstempel im Namen an"""
+        os.makedirs(directory, exist_ok=True)
+        name = datetime.now().strftime("session_%Y%m%d_%H%M%S") + RECORD_SUFFIX
+        return cls(os.path.join(directory, name), **kwargs)
+
+    def record(self, snapshot, gas=False, brake=False):
+        """Hängt einen Snapshot an (aus dem Serial-Thread)"""
+        flags = FLAG_ENGINE_RUNNING if snapshot.engine_running else 0
+        if gas:
+            flags |= FLAG_GAS
+        if brake:
+            flags |= FLAG_BRAKE
+        try:
+            data = self._pack(
+                snapshot.timestamp_ns or time.monotonic_ns(),
+                snapshot.rpm, snapshot.speed, snapshot.gear, snapshot.throttle,
+                flags, STATUS_CODES.get(snapshot.rpm_status, STATUS_UNKNOWN)
+            )
+        except struct.error:
+            # Wert außerhalb des Feldbereichs - lieber verwerfen als abbrechen
+            self.dropped += 1
+            return
+        with self._lock:
+            self._write(data)
+        self.records += 1
+        interval = self.fsync_interval
+        if interval is not None and time.monotonic() - self._last_sync >= interval:
+            self.sync()
+
+    def record_line(self, line):
+        """Rohzeile in die Nebendatei (monotonic ns + Text)"""
+        text = f"{time.monotonic_ns()} {line}\n"
+        with self._lock:
+            self._lines.write(text)
+
+    def sync(self):
+        """Puffer leeren und auf die Platte zwingen - darf aus einem anderen Thread kommen"""
+        self._last_sync = time.monotonic()
+        with self._lock:
+            if self._file.closed:
+                return
+            for f in (self._file, self._lines):
+                f.flush()
+        # fsync wartet auf die Platte - record() schreibt derweil weiter in den Puffer
+        for f in (self._file, self._lines):
+            os.fsync(f.fileno())
+
+    def close(self):
+        if self._file.closed:
+            return
+        self.sync()
+        with self._lock:
+            self._file.close()
+            self._lines.close()
@@ -0,0 +1,193 @@
+"""
+Wiedergabe von Aufzeichnungen
+Die Datei wird per mmap eingeblendet und ohne Kopie durchlaufen
+"""
+
+import bisect
+import mmap
+import struct
+import threading
+import time
+
+from models.vehicle import VehicleSnapshot
+from telemetry.record_format import (
+    HEADER, RECORD, MAGIC, VERSION, FLAG_ENGINE_RUNNING, status_name, record_dtype
+)
+
+# Jeder n-te Zeitstempel landet im dünnen Zeitindex
+INDEX_STRIDE = 4096
+
+_TIMESTAMP = struct.Struct('<q')
+
+
+class Recording:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, record_size, self.start_wall_ns, self.start_mono_ns = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"Keine gültige Aufzeichnung: {path}")
+
+        # Abgeschnittenen letzten Datensatz (Absturz beim Schreiben) ignorieren
+        self.count = (len(self._map) - HEADER.size) // RECORD.size
+        self._records = memoryview(self._map)[HEADER.size:HEADER.size + self.count * RECORD.size]
+
+        # Dünner Index: nur jeder INDEX_STRIDE-te Zeitstempel wird gelesen
+        self._index = [
+            _TIMESTAMP.unpack_from(self._records, i * RECORD.size)[0]
+            for i in range(0, self.count, INDEX_STRIDE)
+        ]
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, index):
+        """Datensatz als Tupel (ts_ns, rpm, speed, gear, throttle, flags, status)"""
+        return RECORD.unpack_from(self._records, index * RECORD.size)
+
+    def timestamp(self, index):
+        return _TIMESTAMP.unpack_from(self._records, index * RECORD.size)[0]
+
+    def iter_records(self, start=0):
+        """Iteriert ab start direkt auf dem mmap"""
+        return RECORD.iter_unpack(self._records[start * RECORD.size:])
+
+    @property
+    def first_ns(self):
+        return self.timestamp(0) if self.count else 0
+
+    @property
+    def last_ns(self):
+        return self.timestamp(self.count - 1) if self.count else 0
+
+    def seek(self, timestamp_ns):
+        """Index des ersten Datensatzes mit Zeitstempel >= timestamp_ns"""
+        block = bisect.bisect_right(self._index, timestamp_ns) - 1
+        if block < 0:
+            return 0
+        lo = block * INDEX_STRIDE
+        hi = min(lo + INDEX_STRIDE, self.count)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) < timestamp_ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def columns(self):
+        """Alle Datensätze als NumPy-Strukturarray - ohne Kopie, vor close() freigeben"""
+        import numpy as np
+        return np.frombuffer(self._records, dtype=record_dtype(), count=self.count)
+
+    @staticmethod
+    def to_snapshot(record):
+        ts, rpm, speed, gear, throttle, flags, status = record
+        return VehicleSnapshot(
+            engine_running=bool(flags & FLAG_ENGINE_RUNNING), rpm=rpm, speed=speed,
+            gear=gear, throttle=throttle, rpm_status=status_name(status),
+            timestamp_ns=ts
+        )
+
+    def close(self):
+        if self._map.closed:
+            return
+        if hasattr(self, '_records'):
+            self._records.release()
+        self._map.close()
+        self._file.close()
+
+
+class ReplaySource:
+    """Spielt eine Aufzeichnung über dieselben Callbacks wie SerialHandler ab"""
+
+    def __init__(self, path, speed=1.0, start=0.0):
+        # speed: 1.0 = Echtzeit, N = N-fach, None/0 = so schnell wie möglich
+        # start: Sekunden ab Beginn der Aufzeichnung
+        self.recording = Recording(path)
+        self.speed = speed
+        self.running = False
+        self.connected = False
+        self.position = self.recording.seek(self.recording.first_ns + int(start * 1e9)) if start else 0
+
+        self._seek_to = None
+        self.thread = None
+        # stop() weckt eine wartende Wiedergabe sofort auf
+        self._stopped = threading.Event()
+
+        # Callbacks wie SerialHandler
+        self.on_data_received = None
+        self.on_snapshot = None
+        self.on_connection_changed = None
+
+    def start(self):
+        self.running = True
+        self._stopped.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Beendet die Wiedergabe - kehrt erst zurück, wenn der Thread nichts mehr liest"""
+        self.running = False
+        self._stopped.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def send_command(self, command):
+        """Bei der Wiedergabe gibt es keinen Empfänger"""
+        return False
+
+    def seek(self, timestamp_ns):
+        """Springt zu einem Zeitpunkt (monotonic ns der Aufnahme)"""
+        self._seek_to = timestamp_ns
+
+    def _run(self):
+        self.connected = True
+        if self.on_connection_changed:
+            self.on_connection_changed(True, f"Wiedergabe: {self.recording.path}")
+
+        to_snapshot = self.recording.to_snapshot
+        restart = True
+        while self.running and restart:
+            restart = False
+            origin_ns = None
+            for record in self.recording.iter_records(self.position):
+                if not self.running:
+                    break
+                if self._seek_to is not None:
+                    self.position = self.recording.seek(self._seek_to)
+                    self._seek_to = None
+                    restart = True
+                    break
+
+                if self.speed:
+                    # Aufnahmezeit auf Wanduhr abbilden
+                    if origin_ns is None:
+                        origin_ns, origin_wall = record[0], time.monotonic()
+                    due = origin_wall + (record[0] - origin_ns) / 1e9 / self.speed
+                    delay = due - time.monotonic()
+                    if delay > 0 and self._stopped.wait(delay):
+                        break
+
+                self.position += 1
+                if self.on_snapshot:
+                    self.on_snapshot(to_snapshot(record))
+
+        self.connected = False
+        if self.on_connection_changed:
+            self.on_connection_changed(False, "Wiedergabe beendet")
+
+    def close(self):
+        # Erst wenn der Thread steht, hängt kein Ausschnitt mehr am mmap
+        self.stop()
+        self.recording.close()
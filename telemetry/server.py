@@ -0,0 +1,266 @@
+"""
+Telemetrie-Verteiler
+Ein Prozess hält den Port, beliebig viele Clients lesen lokal mit (TCP oder Unix-Socket)
+Clients sehen denselben Strom wie vom Sketch im Binärmodus: Textzeilen + Status-Frames
+"""
+
+import asyncio
+from collections import deque
+
+from communication.async_link import AsyncSerialLink
+from communication.binary_protocol import ACK_PREFIX, encode_frame
+from communication.command_writer import REPEATING_COMMANDS, VEHICLE_COMMANDS
+from communication.stream_decoder import StreamDecoder
+from config.settings import (
+    TELEMETRY_HOST, TELEMETRY_PORT, TELEMETRY_CLIENT_QUEUE, SUBSCRIBER_QUEUE_SIZE
+)
+
+GREETING = (ACK_PREFIX + "BINARY:1\n").encode()
+
+
+class ClientSession:
+    """Ein verbundener Client mit eigenem, begrenztem Sendepuffer"""
+
+    def __init__(self, reader, writer, queue_size):
+        self.reader = reader
+        self.writer = writer
+        self.name = writer.get_extra_info('peername') or "unix"
+        self._queue = deque(maxlen=queue_size)
+        self._event = asyncio.Event()
+        self.closed = False
+        self.sent = 0
+        self.dropped = 0
+
+    def push(self, data):
+        # data ist einmal pro Snapshot kodiert und wird von allen Clients geteilt
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(data)
+        self._event.set()
+
+    async def send_loop(self):
+        """Schreibt gesammelt - ein langsamer Client wartet nur auf sich selbst"""
+        try:
+            while not self.closed:
+                await self._event.wait()
+                self._event.clear()
+                batch = list(self._queue)
+                self._queue.clear()
+                self.writer.write(b"".join(batch))
+                self.sent += len(batch)
+                await self.writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self._event.set()
+            self.writer.close()
+
+
+class TelemetryServer:
+    def __init__(self, link=None, host=TELEMETRY_HOST, port=TELEMETRY_PORT, path=None,
+                 queue_size=TELEMETRY_CLIENT_QUEUE):
+        # path gesetzt -> Unix-Socket statt TCP
+        self.link = link or AsyncSerialLink()
+        self.host = host
+        self.port = port
+        self.path = path
+        self.queue_size = queue_size
+        self.clients = set()
+
+        self.server = None
+        self._commands = None
+        self._tasks = []
+        self._handlers = set()      # laufende _on_client-Tasks
+        self._seq = 0
+
+        # Statistik
+        self.forwarded = 0
+        self.coalesced = 0
+
+    async def start(self):
+        self._commands = asyncio.Queue()
+        self.link.on_data_received = self._broadcast_line
+        self.link.on_connection_changed = self._on_connection_changed
+        self.link.start()
+        if self.path:
+            self.server = await asyncio.start_unix_server(self._on_client, self.path)
+        else:
+            self.server = await asyncio.start_server(self._on_client, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+        self._tasks = [
+            asyncio.ensure_future(self._pump_snapshots()),
+            asyncio.ensure_future(self._command_writer()),
+        ]
+        return self
+
+    async def close(self):
+        # Erst die Clients: ab Python 3.12 wartet wait_closed(), bis jede Verbindung
+        # weg ist - mit verbundenem Client hinge close() sonst für immer
+        self.server.close()
+        for client in list(self.clients):
+            client.close()
+        for handler in list(self._handlers):
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.link.close()
+
+    async def serve_forever(self):
+        await self.server.serve_forever()
+
+    # --- Verteilung ---
+
+    async def _pump_snapshots(self):
+        # Großzügiger Puffer - verworfen wird pro Client, nicht hier
+        with self.link.subscribe(SUBSCRIBER_QUEUE_SIZE) as snapshots:
+            async for snapshot in snapshots:
+                self._broadcast(self._encode(snapshot))
+
+    def _encode(self, snapshot):
+        self._seq = (self._seq + 1) & 0xFF
+        return encode_frame(
+            self._seq, snapshot.timestamp_ns // 1_000_000, snapshot.engine_running,
+            snapshot.rpm, snapshot.speed, snapshot.gear, snapshot.throttle,
+            snapshot.rpm_status
+        )
+
+    def _broadcast_line(self, line):
+        # Eigene PROTO-Quittungen des Sketches nicht weiterreichen
+        if not line.startswith(ACK_PREFIX):
+            self._broadcast((line + "\n").encode())
+
+    def _on_connection_changed(self, connected, message):
+        self._broadcast_line(f">>> {message}")
+
+    def _broadcast(self, data):
+        for client in self.clients:
+            client.push(data)
+
+    # --- Clients ---
+
+    async def _on_client(self, reader, writer):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        client = ClientSession(reader, writer, self.queue_size)
+        self.clients.add(client)
+        client.push(GREETING)
+        sender = asyncio.ensure_future(client.send_loop())
+        try:
+            while not client.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(errors='ignore').strip()
+                if command in VEHICLE_COMMANDS:
+                    self._commands.put_nowait(command)
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self._handlers.discard(handler)
+            client.close()
+            await asyncio.gather(sender, return_exceptions=True)
+
+    async def _command_writer(self):
+        """Ein einziger Schreiber für alle Clients - gleiche Dauerbefehle zusammenfassen"""
+        while True:
+            batch = [await self._commands.get()]
+            while not self._commands.empty():
+                command = self._commands.get_nowait()
+                if command in REPEATING_COMMANDS and command == batch[-1]:
+                    self.coalesced += 1
+                    continue
+                batch.append(command)
+            for command in batch:
+                if await self.link.send(command):
+                    self.forwarded += 1
+
+
+class TelemetryClient:
+    """Einfacher Client - liest Snapshots über denselben StreamDecoder wie der Host"""
+
+    def __init__(self, host=TELEMETRY_HOST, port=TELEMETRY_PORT, path=None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.decoder = StreamDecoder()
+        self.decoder.on_snapshot = self._on_snapshot
+        self.lines = deque(maxlen=100)
+        self.decoder.on_line = self.lines.append
+        self._snapshots = deque()
+        self.reader = self.writer = None
+
+    async def connect(self):
+        if self.path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    def _on_snapshot(self, snapshot):
+        self._snapshots.append(snapshot)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._snapshots:
+            data = await self.reader.read(4096)
+            if not data:
+                raise StopAsyncIteration
+            self.decoder.feed(data)
+        return self._snapshots.popleft()
+
+    async def send(self, command):
+        self.writer.write((command + "\n").encode())
+        await self.writer.drain()
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Telemetrie an mehrere lokale Clients verteilen")
+    parser.add_argument('--port', help="Serieller Port (Standard: automatisch suchen)")
+    parser.add_argument('--simulate', action='store_true',
+                        help="Virtuelles Arduino statt Hardware verwenden")
+    parser.add_argument('--listen', default=f"{TELEMETRY_HOST}:{TELEMETRY_PORT}",
+                        help="TCP-Adresse host:port")
+    parser.add_argument('--unix', metavar='PFAD', help="Unix-Socket statt TCP")
+    args = parser.parse_args()
+
+    port = args.port
+    if args.simulate:
+        from simulator.fake_arduino import FakeArduino
+        port = FakeArduino().start()
+        print(f"Virtuelles Arduino: {port}")
+
+    host, _, tcp_port = args.listen.rpartition(':')
+
+    async def run():
+        server = TelemetryServer(AsyncSerialLink(port), host=host, port=int(tcp_port), path=args.unix)
+        await server.start()
+        print(f"Telemetrie-Server: {args.unix or f'{host}:{server.port}'}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Auswertung einer kleinen, erzeugten Aufzeichnung: Kennzahlen und Cache
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from models.vehicle import VehicleSnapshot  # noqa: E402
+from telemetry import analytics  # noqa: E402
+from telemetry.analytics import AnalyticsCache, analyze_file, analyze_recordings  # noqa: E402
+from telemetry.recorder import TelemetryRecorder  # noqa: E402
+
+STEP_NS = 100_000_000   # 10 Datensätze/s
+
+# (anzahl, motor an, rpm, km/h, gang, status)
+TRIP = (
+    (10, False, 0, 0, 1, 'OK'),
+    (10, True, 2000, 30, 1, 'OK'),
+    (5, True, 4000, 50, 1, 'SHIFT_UP'),      # befolgt: danach 2. Gang
+    (5, True, 2500, 50, 2, 'OK'),
+    (5, True, 7000, 80, 2, 'SHIFT_UP'),      # Redline, nicht befolgt
+    (5, True, 3000, 60, 1, 'OK'),            # zurückgeschaltet
+)
+
+
+def _write(path, trip=TRIP):
+    recorder = TelemetryRecorder(str(path))
+    ts = 1_000_000_000
+    for count, running, rpm, speed, gear, status in trip:
+        for _ in range(count):
+            recorder.record(VehicleSnapshot(running, rpm, speed, gear, 0, status, ts))
+            ts += STEP_NS
+    recorder.close()
+    return str(path)
+
+
+def test_analyze_file(tmp_path):
+    stats = analyze_file(_write(tmp_path / "trip.obd2rec"))
+
+    # Der letzte Datensatz hat keine Dauer
+    assert stats['samples'] == 40
+    assert stats['duration_s'] == pytest.approx(3.9)
+    assert stats['running_s'] == pytest.approx(2.9)
+    assert stats['moving_s'] == pytest.approx(2.9)
+    assert stats['distance_km'] == pytest.approx(144 / 3600)   # km/h * s
+    assert stats['rpm_band_s'] == pytest.approx([1.0, 1.5, 0.9, 0.0, 0.5])
+    assert (stats['shifts_up'], stats['shifts_down']) == (1, 1)
+    assert stats['shift_up_recommendations'] == 2
+    assert stats['missed_shift_up'] == 1
+    assert stats['redline_s'] == pytest.approx(0.5)
+    assert stats['redline_events'] == 1
+    assert stats['redline_longest_s'] == pytest.approx(0.5)
+    assert stats['speed_max'] == 80
+    assert sum(stats['speed_bin_s']) == pytest.approx(3.9)
+
+
+def test_cache_hit_and_invalidation(tmp_path):
+    path = _write(tmp_path / "trip.obd2rec")
+    cache_file = str(tmp_path / "cache.json")
+
+    cache = AnalyticsCache(cache_file)
+    first, computed = analyze_recordings([path], cache, workers=1)
+    assert computed == 1
+    cache.save()
+
+    # Neu geladener Cache: nichts zu rechnen, gleiches Ergebnis
+    cache = AnalyticsCache(cache_file)
+    second, computed = analyze_recordings([path], cache, workers=1)
+    assert computed == 0
+    assert second == first
+
+    # Geänderter Inhalt unter gleichem Namen -> neu gerechnet
+    _write(path, TRIP[:3])
+    third, computed = analyze_recordings([path], cache, workers=1)
+    assert computed == 1
+    assert third[path]['samples'] == 25
+    assert third[path] != first[path]
+
+
+def test_corrupt_file_fails_alone(tmp_path):
+    good = _write(tmp_path / "good.obd2rec")
+    # Header abgeschnitten -> struct.error im Worker
+    truncated = tmp_path / "truncated.obd2rec"
+    truncated.write_bytes(b"OBD2REC\x00\x01")
+    # Falsches Magic -> ValueError
+    foreign = tmp_path / "foreign.obd2rec"
+    foreign.write_bytes(b"\x00" * 64)
+
+    cache = AnalyticsCache(str(tmp_path / "cache.json"))
+    results, computed = analyze_recordings([good, str(truncated), str(foreign)], cache, workers=2)
+    assert computed == 3
+    assert results[good]['samples'] == 40
+    assert results[str(truncated)]['error'].startswith("struct.error:")
+    assert results[str(foreign)]['error'].startswith("ValueError:")
+    # Fehler landen nicht im Cache - nach einer Reparatur wird neu gerechnet
+    assert len(cache.entries) == 1
+
+
+def _crash_worker(path):
+    # Worker stirbt ohne Python-Ausnahme -> BrokenProcessPool für alle offenen Aufträge
+    if os.path.basename(path).startswith('crash'):
+        os._exit(1)
+    return analyze_file(path)
+
+
+def test_crashed_worker_fails_only_its_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, 'analyze_file', _crash_worker)
+    good = [_write(tmp_path / f"good{i}.obd2rec", TRIP[:2 + i]) for i in range(3)]
+    crash = _write(tmp_path / "crash.obd2rec", TRIP[:1])
+
+    results, computed = analyze_recordings([crash] + good, None, workers=1)
+    assert computed == 4
+    assert results[crash]['error'].startswith("concurrent.futures.process.BrokenProcessPool")
+    assert [results[path]['samples'] for path in good] == [20, 25, 30]
@@ -0,0 +1,45 @@
+"""
+AsyncSerialLink ohne nicht blockierende fds - der Weg, den Windows nimmt
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from communication.async_link import AsyncSerialLink
+from communication.port_discovery import PortDiscovery
+from simulator.fake_arduino import FakeArduino
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Pseudo-Terminal nur unter POSIX")
+
+CONNECT_TIMEOUT = 10.0
+
+
+def test_executor_fallback(tmp_path):
+    device = FakeArduino()
+    device.start()
+    discovery = PortDiscovery(cache_file=str(tmp_path / 'port.json'))
+    link = AsyncSerialLink(device.port, discovery=discovery)
+    link.nonblocking = False
+
+    async def run():
+        link.start()
+        try:
+            with link.subscribe() as snapshots:
+                first = await asyncio.wait_for(snapshots.__anext__(), CONNECT_TIMEOUT)
+                assert link.serial.timeout > 0
+                assert await link.send("ENGINE_TOGGLE")
+                while link.decoder.binary != link.binary_requested:
+                    await asyncio.wait_for(snapshots.__anext__(), CONNECT_TIMEOUT)
+                return first
+        finally:
+            await link.close()
+
+    try:
+        first = asyncio.run(run())
+    finally:
+        device.stop()
+    assert first.timestamp_ns
+    assert link.decoder.frame_errors == 0
+    assert not link.connected
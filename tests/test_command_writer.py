@@ -0,0 +1,51 @@
+"""
+Befehls-Writer: volle Warteschlange, verdrängte und abgelehnte Befehle
+"""
+
+import threading
+
+from communication.command_writer import CommandWriter
+
+
+class _Port:
+    def __init__(self):
+        self.data = b""
+        self.written = threading.Event()
+
+    def write(self, data):
+        self.data += data
+        self.written.set()
+
+
+def test_evicted_repeating_command_counts_as_dropped():
+    writer = CommandWriter(lambda: None, capacity=3)
+    assert writer.submit("THROTTLE")
+    assert writer.submit("BRAKE")
+    assert writer.submit("THROTTLE")
+
+    # Einmaliger Befehl verdrängt den ältesten Dauerbefehl - der war schon angenommen
+    assert writer.submit("SHIFT_UP")
+    stats = writer.stats()
+    assert (stats['dropped'], stats['rejected']) == (1, 0)
+    assert list(writer._pending) == ["BRAKE", "THROTTLE", "SHIFT_UP"]
+
+    # Dauerbefehl bei voller Warteschlange wird gar nicht erst angenommen
+    assert not writer.submit("BRAKE")
+    stats = writer.stats()
+    assert (stats['dropped'], stats['rejected']) == (1, 1)
+
+
+def test_counters_from_writer_thread():
+    port = _Port()
+    writer = CommandWriter(lambda: port)
+    writer.start()
+    try:
+        writer.submit("ENGINE_TOGGLE")
+        assert port.written.wait(5.0)
+    finally:
+        writer.stop()
+        writer.thread.join()
+    stats = writer.stats()
+    assert stats['written'] == 1 and stats['batches'] == 1
+    assert stats['dropped'] == stats['rejected'] == 0
+    assert port.data == b"ENGINE_TOGGLE\n"
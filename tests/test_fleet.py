@@ -0,0 +1,39 @@
+"""
+Flotten-Simulation gegen den skalaren VehicleSimulator
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from simulator.fleet import FleetSimulator, _BLOCK, compare_with_reference  # noqa: E402
+
+
+def test_matches_scalar_reference():
+    assert compare_with_reference(count=100, steps=1000, seed=1)
+
+
+def test_matches_scalar_reference_across_blocks():
+    # Letzter Block nur teilweise gefüllt
+    assert compare_with_reference(count=_BLOCK + 37, steps=5, seed=2)
+
+
+def test_commands_outside_step():
+    fleet = FleetSimulator(4)
+    fleet.toggle_engine(np.array([True, True, True, False]))
+    fleet.handle_throttle(np.array([True, False, True, True]))
+    assert fleet.target_rpm.tolist() == [3000, 850, 3000, 0]
+    assert fleet.gas_pressed.tolist() == [True, False, True, False]
+
+    fleet.rpm[:] = [2000, 1400, 5600, 0]
+    fleet.shift_up(np.array([True, True, False, True]))
+    assert fleet.gear.tolist() == [2, 1, 1, 1]
+    assert fleet.rpm.tolist() == [1600, 1400, 5600, 0]
+    fleet.shift_down(np.array([True, False, True, False]))
+    # Zurück in den 1. Gang; rpm 5600 + 500 würde überdrehen
+    assert fleet.gear.tolist() == [1, 1, 1, 1]
+    assert fleet.rpm.tolist() == [2100, 1400, 5600, 0]
+
+    fleet.handle_brake(np.array([False, True, True, True]))
+    assert fleet.target_rpm.tolist() == [3100, 850, 850, 0]
+    assert fleet.brake_pressed.tolist() == [False, True, True, True]
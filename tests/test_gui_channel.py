@@ -0,0 +1,24 @@
+"""
+Übergabekanal Serial-Thread -> GUI
+"""
+
+from communication.gui_channel import GuiChannel
+
+
+def test_connection_events_are_never_dropped():
+    channel = GuiChannel()
+    for i in range(1000):
+        channel.post_connection(i % 2 == 0, f"Ereignis {i}")
+    _, _, events = channel.drain()
+    assert len(events) == 1000
+    # Der zuletzt gemeldete Zustand kommt an
+    assert events[-1] == (False, "Ereignis 999")
+
+
+def test_log_lines_ring_buffer_counts_drops():
+    channel = GuiChannel(log_capacity=10)
+    for i in range(25):
+        channel.post_line(str(i))
+    _, lines, _ = channel.drain()
+    assert lines == [str(i) for i in range(15, 25)]
+    assert channel.dropped_lines == 15
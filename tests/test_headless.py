@@ -0,0 +1,76 @@
+"""
+Betrieb ohne GUI: Startzeit, kein tkinter, Aufzeichnung ohne Verlust und fsync außerhalb der Event-Loop
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from benchmarks.startup import (
+    BUDGET_HEADLESS_READY, BUDGET_IMPORT_HEADLESS, _HEADLESS_CHILD, _run_child
+)
+from communication.async_link import AsyncSerialLink
+from communication.port_discovery import PortDiscovery
+from config.settings import HEADLESS_RECORD_QUEUE, SUBSCRIBER_QUEUE_SIZE
+from models.vehicle import VehicleSnapshot
+from simulator.fake_arduino import FakeArduino
+from telemetry import headless
+from telemetry.record_format import HEADER, RECORD
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Pseudo-Terminal nur unter POSIX")
+
+BURST = 4 * SUBSCRIBER_QUEUE_SIZE
+
+
+def test_startup_budget_without_tkinter():
+    # Frischer Interpreter wie im Benchmark: main + Headless-Pfad bis zum ersten Snapshot
+    times, last = _run_child(_HEADLESS_CHILD, ('READY',))
+    info = json.loads(last)
+    assert not info['tkinter']
+    assert info['import_s'] < BUDGET_IMPORT_HEADLESS
+    assert times['READY'] < BUDGET_HEADLESS_READY
+
+
+def test_record_burst_and_sync_in_executor(tmp_path, monkeypatch):
+    monkeypatch.setattr(headless, 'RECORDING_DIR', str(tmp_path))
+    monkeypatch.setattr(headless, 'RECORDING_FSYNC_INTERVAL', 0.05)
+    device = FakeArduino()
+    device.start()
+    discovery = PortDiscovery(cache_file=str(tmp_path / 'port.json'))
+    link = AsyncSerialLink(device.port, discovery=discovery)
+    sync_threads = []
+
+    async def run():
+        runner = await headless.HeadlessRunner(link, record=True, interval=0).start()
+        recorder = runner.recorder
+        sync = recorder.sync
+
+        def traced_sync():
+            sync_threads.append(threading.current_thread())
+            sync()
+        recorder.sync = traced_sync
+
+        await asyncio.sleep(0)
+        assert [s._queue.maxlen for s in link._subscribers] == [HEADLESS_RECORD_QUEUE]
+
+        # Rückstand weit über dem Standardpuffer, ohne dass _record() dazwischen läuft
+        for i in range(BURST):
+            link._on_snapshot(VehicleSnapshot(rpm=i, timestamp_ns=i + 1))
+        await asyncio.sleep(0.2)
+        await runner.close()
+        return recorder
+
+    try:
+        recorder = asyncio.run(run())
+    finally:
+        device.stop()
+
+    assert recorder.dropped == 0
+    assert recorder.records >= BURST
+    assert sync_threads and threading.main_thread() not in sync_threads
+
+    size = os.path.getsize(recorder.path)
+    assert (size - HEADER.size) // RECORD.size == recorder.records
@@ -0,0 +1,129 @@
+"""
+Fahrzeug-Verlauf: Fensterabfragen und gleichzeitiges Schreiben/Lesen
+"""
+
+import threading
+
+from config.settings import HISTORY_CAPACITY, HISTORY_RATE_HZ, HISTORY_SECONDS
+from models.history import VehicleHistory
+from models.vehicle import Vehicle, VehicleSnapshot
+
+STEP_NS = 10_000_000    # 100 Hz wie im Binärprotokoll
+
+
+def _drive(count):
+    """Jede 100. Meldung ein Gangwechsel, rpm 6600 (über Redline) in jeder 4."""
+    for i in range(count):
+        yield VehicleSnapshot(
+            engine_running=True, rpm=6600 if i % 4 == 0 else 3000,
+            speed=50, gear=1 + (i // 100) % 2, timestamp_ns=i * STEP_NS
+        )
+
+
+def test_capacity_covers_history_seconds_at_full_rate():
+    assert HISTORY_CAPACITY >= HISTORY_SECONDS * HISTORY_RATE_HZ
+
+
+def test_every_recorded_snapshot_counts():
+    vehicle = Vehicle()
+    for snapshot in _drive(1000):
+        vehicle.record(snapshot)
+    history = vehicle.history
+    assert len(history) == 1000
+    # Gangwechsel bei 100, 200, ... 900: abwechselnd hoch und runter
+    assert history.shift_counts() == (5, 4)
+    # 250 Intervalle beginnen über der Redline
+    assert history.redline_seconds() == 250 * STEP_NS / 1e9
+    low, high, mean = history.rpm_stats()
+    assert (low, high) == (3000, 6600)
+    assert mean == (250 * 6600 + 750 * 3000) / 1000
+    # Fenster: letzte Sekunde = 101 Einträge
+    assert len(history.values('rpm', 1.0)) == 101
+
+
+def test_record_is_independent_of_the_displayed_snapshot():
+    vehicle = Vehicle()
+    snapshots = list(_drive(300))
+    for snapshot in snapshots:
+        vehicle.record(snapshot)
+    # Die GUI übernimmt nur den neuesten - der Verlauf bleibt vollständig
+    vehicle.apply_snapshot(snapshots[-1])
+    assert vehicle.snapshot is snapshots[-1]
+    assert len(vehicle.history) == 300
+
+
+def test_concurrent_append_and_queries():
+    history = VehicleHistory(capacity=5000)
+    count = 20000
+    errors = []
+
+    def writer():
+        for snapshot in _drive(count):
+            history.append(snapshot)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        try:
+            timestamps = history.values('timestamp_ns', 2.0)
+            # Ein konsistenter Ausschnitt: lückenlos aufsteigend
+            if any(b - a != STEP_NS for a, b in zip(timestamps, timestamps[1:])):
+                errors.append(list(timestamps[:3]))
+            history.rpm_stats(1.0)
+            history.shift_counts(1.0)
+        except Exception as e:
+            errors.append(e)
+    thread.join()
+    assert not errors
+    assert len(history) == 5000
+
+
+def test_values_many_reads_one_consistent_window():
+    history = VehicleHistory(capacity=5000)
+    count = 20000
+    errors = []
+
+    def writer():
+        # rpm aus dem Zeitstempel ableitbar - so fällt jede Verschiebung auf
+        for i in range(count):
+            history.append(VehicleSnapshot(rpm=i % 60000, speed=i % 200,
+                                           timestamp_ns=i * STEP_NS))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        timestamps, rpm, speed = history.values_many(('timestamp_ns', 'rpm', 'speed'), 2.0)
+        if not len(timestamps) == len(rpm) == len(speed):
+            errors.append((len(timestamps), len(rpm), len(speed)))
+        elif any(r != (t // STEP_NS) % 60000 for t, r in zip(timestamps, rpm)):
+            errors.append(timestamps[0])
+    thread.join()
+    assert not errors
+
+
+def test_allocates_lazily_and_grows_in_chunks():
+    history = VehicleHistory(capacity=1000, chunk=64)
+    assert len(history.rpm) == 0 and len(history._rpm_sum) == 0
+
+    snapshots = list(_drive(2500))
+    for n, snapshot in enumerate(snapshots, 1):
+        history.append(snapshot)
+        if n in (1, 64, 65, 129, 600, 1000):
+            # chunk, dann verdoppelt, höchstens capacity
+            expected = {1: 64, 64: 64, 65: 128, 129: 256, 600: 1000, 1000: 1000}[n]
+            assert len(history.rpm) == expected
+        if n in (63, 64, 65, 1000, 1001, 2500):
+            tail = snapshots[max(0, n - 1000):n]
+            assert list(history.values('rpm')) == [s.rpm for s in tail]
+            assert list(history.values('timestamp_ns', 1.0)) == \
+                [s.timestamp_ns for s in tail if s.timestamp_ns >= tail[-1].timestamp_ns - 10**9]
+            assert history.shift_counts() == (
+                sum(b.gear > a.gear for a, b in zip(tail, tail[1:])),
+                sum(b.gear < a.gear for a, b in zip(tail, tail[1:])))
+    assert len(history.rpm) == 1000
+
+
+def test_vehicle_without_history():
+    vehicle = Vehicle(history=False)
+    vehicle.record(VehicleSnapshot(rpm=1000, timestamp_ns=1))
+    assert vehicle.history is None
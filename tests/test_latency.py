@@ -0,0 +1,88 @@
+"""
+Latenz-Histogramm: Perzentile gegen exakt sortierte Werte
+"""
+
+import json
+import random
+import time
+
+import pytest
+
+from models.vehicle import VehicleSnapshot
+from telemetry.latency import LatencyHistogram, LatencyTracer, _SUB, _bucket, _bucket_floor
+
+
+def _exact(values, p):
+    # Gleiche Rangdefinition wie LatencyHistogram.percentile
+    ordered = sorted(values)
+    rank = max(1, int(round(p / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def test_bucket_floor_is_lower_bound():
+    for value in list(range(2000)) + [10**k + d for k in range(3, 8) for d in (-1, 0, 1)]:
+        floor = _bucket_floor(_bucket(value))
+        assert floor <= value
+        assert value - floor <= value / _SUB
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    values = list(range(2 * _SUB))
+    for value in values:
+        histogram.record(value)
+    for p in (1, 25, 50, 90, 99, 100):
+        assert histogram.percentile(p) == _exact(values, p)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_percentiles_match_exact(seed):
+    rng = random.Random(seed)
+    values = [int(rng.lognormvariate(9, 1.2)) for _ in range(5000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for p in (50, 90, 99, 99.9):
+        exact = _exact(values, p)
+        # Ergebnis ist die Untergrenze des Buckets mit dem exakten Wert
+        assert histogram.percentile(p) == _bucket_floor(_bucket(exact))
+        assert exact * (1 - 1 / _SUB) <= histogram.percentile(p) <= exact
+
+    summary = histogram.summary()
+    assert summary['count'] == len(values)
+    assert summary['min_ms'] == min(values) / 1000.0
+    assert summary['max_ms'] == max(values) / 1000.0
+    assert summary['mean_ms'] == pytest.approx(sum(values) / len(values) / 1000.0)
+
+
+def test_out_of_range_is_clamped():
+    histogram = LatencyHistogram(max_us=1000)
+    histogram.record(-5)
+    histogram.record(10**9)
+    assert (histogram.min_us, histogram.max_seen_us) == (0, 1000)
+    assert histogram.percentile(100) == _bucket_floor(_bucket(1000))
+    assert LatencyHistogram().percentile(50) == 0
+
+
+def test_tracer_chain_and_export(tmp_path):
+    tracer = LatencyTracer()
+    before = VehicleSnapshot(rpm=800, timestamp_ns=time.monotonic_ns())
+    key_ns = time.monotonic_ns()
+    tracer.command_queued("THROTTLE", before, key_ns)
+    tracer.commands_written(["THROTTLE"])
+
+    # Status ohne Wirkung beendet nichts
+    tracer.snapshot_received(VehicleSnapshot(rpm=800, timestamp_ns=time.monotonic_ns()))
+    after = VehicleSnapshot(rpm=1200, timestamp_ns=time.monotonic_ns())
+    tracer.snapshot_received(after)
+    tracer.snapshot_rendered(after)
+
+    summary = tracer.summary()
+    for name, _ in LatencyTracer.SEGMENTS:
+        assert summary[name]['count'] == 1
+    assert summary['unmatched'] == 0
+
+    path = tmp_path / "latency.json"
+    tracer.export(path)
+    assert json.loads(path.read_text()) == summary
@@ -0,0 +1,64 @@
+"""
+OBD-II Mode 01: Einzel- und Massen-Dekodierung liefern dieselben Werte
+"""
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from communication.binary_protocol import encode_can_frame  # noqa: E402
+from communication.obd_pids import (  # noqa: E402
+    PIDS, RESPONSE_ID_BASE, apply_frames, carry_obd_fields, decode_frames,
+    decode_response, frames_from_buffer
+)
+from models.vehicle import VehicleSnapshot  # noqa: E402
+
+
+def _response_frame(pid, raw):
+    payload = bytes([0x41, pid]) + raw
+    data = bytes([len(payload)]) + payload
+    return encode_can_frame(RESPONSE_ID_BASE, data.ljust(8, b'\x00'))
+
+
+def _raw_values(spec):
+    if spec.size == 1:
+        return [bytes([v]) for v in range(256)]
+    # Mehrbyte-PIDs: Randwerte plus ein Raster über den Wertebereich
+    values = set(range(0, 1 << (8 * spec.size), max(1, (1 << (8 * spec.size)) // 4099)))
+    values.update({0, 1, 2, 3, (1 << (8 * spec.size)) - 1})
+    return [v.to_bytes(spec.size, 'big') for v in sorted(values)]
+
+
+@pytest.mark.parametrize('pid', sorted(PIDS))
+def test_decode_frames_matches_decode(pid):
+    spec = PIDS[pid]
+    raws = _raw_values(spec)
+    buffer = b''.join(_response_frame(pid, raw) for raw in raws)
+    index, values = decode_frames(frames_from_buffer(buffer))[pid]
+    assert index.tolist() == list(range(len(raws)))
+    expected = [spec.decode(raw) for raw in raws]
+    bulk = values.tolist()
+    assert bulk == expected
+    # Auch der Typ stimmt: int bleibt int, float bleibt float
+    assert [type(v) for v in bulk] == [type(v) for v in expected]
+
+
+def test_multi_pid_frame_matches_decode_response():
+    payload = bytes([0x41, 0x0C, 0x1A, 0xF9, 0x0D, 0x42, 0x05, 0x7B])[:7]
+    data = bytes([len(payload)]) + payload
+    frames = frames_from_buffer(encode_can_frame(RESPONSE_ID_BASE, data.ljust(8, b'\x00')))
+    bulk = {pid: values[0].item() for pid, (_, values) in decode_frames(frames).items()}
+    assert bulk == decode_response(payload)
+
+
+def test_apply_frames_and_carry():
+    status = VehicleSnapshot(rpm=2000, speed=40)
+    buffer = _response_frame(0x05, bytes([130])) + _response_frame(0x04, bytes([255]))
+    merged = apply_frames(status, buffer)
+    assert merged.coolant_temp == 90
+    assert merged.engine_load == 100.0
+    assert merged.rpm == 2000
+
+    # Nächster Status-Block des Sketches kennt keine OBD-Werte - sie bleiben stehen
+    following = carry_obd_fields(VehicleSnapshot(rpm=2100), merged)
+    assert (following.rpm, following.coolant_temp, following.engine_load) == (2100, 90, 100.0)
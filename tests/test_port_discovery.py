@@ -0,0 +1,57 @@
+"""
+Portsuche: zuletzt erfolgreicher Port und Erkennung der Status-Zeile
+"""
+
+import json
+import os
+import threading
+import time
+import tty
+
+import pytest
+from serial.tools.list_ports_common import ListPortInfo
+
+from communication.port_discovery import PortDiscovery, is_status_line
+
+BOOT_DELAY = 1.5       # s - Arduino nach dem Reset durch open()
+
+
+def test_is_status_line():
+    assert is_status_line(b"RPM:850\r\n")
+    assert is_status_line(b"RPM_STATUS:OK\n")
+    assert not is_status_line(b"RPM:viel\n")
+    assert not is_status_line(b"Befehle: ENGINE_TOGGLE\n")
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="Pseudo-Terminal nur unter POSIX")
+def test_cached_port_waits_for_boot(tmp_path, monkeypatch):
+    """Der gemerkte Port bekommt die volle Handshake-Zeit - kein Rückfall auf die Suche"""
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    device = os.ttyname(slave)
+    stop = threading.Event()
+
+    def booting_arduino():
+        if not stop.wait(BOOT_DELAY):
+            os.write(master, b"RPM:850\n")
+
+    cache = tmp_path / 'port.json'
+    cache.write_text(json.dumps({'device': device}))
+    discovery = PortDiscovery(cache_file=str(cache))
+    monkeypatch.setattr(discovery, '_probe_parallel', lambda ports: pytest.fail("volle Suche"))
+
+    thread = threading.Thread(target=booting_arduino, daemon=True)
+    thread.start()
+    start = time.monotonic()
+    try:
+        found = discovery.find([ListPortInfo(device)])
+        assert found is not None
+        ser, port = found
+        assert port.device == device
+        assert time.monotonic() - start >= BOOT_DELAY
+        ser.close()
+    finally:
+        stop.set()
+        thread.join()
+        os.close(master)
+        os.close(slave)
@@ -0,0 +1,47 @@
+"""
+Recorder: fsync nur im Sync-Thread, Schreiben läuft währenddessen weiter
+"""
+
+import os
+import threading
+
+from models.vehicle import VehicleSnapshot
+from telemetry import recorder as recorder_module
+from telemetry.record_format import HEADER, RECORD, LINES_SUFFIX
+from telemetry.recorder import TelemetryRecorder
+
+COUNT = 20_000
+
+
+def test_sync_from_other_thread(tmp_path, monkeypatch):
+    fsync_threads = []
+    fsync = os.fsync
+
+    def traced_fsync(fd):
+        fsync_threads.append(threading.current_thread())
+        fsync(fd)
+    monkeypatch.setattr(recorder_module.os, 'fsync', traced_fsync)
+
+    recorder = TelemetryRecorder(str(tmp_path / 'trip.obd2rec'), fsync_interval=None)
+    stop = threading.Event()
+
+    def sync_loop():
+        while not stop.wait(0.001):
+            recorder.sync()
+    syncer = threading.Thread(target=sync_loop)
+    syncer.start()
+
+    for i in range(COUNT):
+        recorder.record(VehicleSnapshot(rpm=i % 8000, timestamp_ns=i + 1))
+        if i % 100 == 0:
+            recorder.record_line(f"RPM:{i}")
+    stop.set()
+    syncer.join()
+
+    # Schreibender Thread hat nie selbst fsync aufgerufen
+    assert fsync_threads and threading.current_thread() not in fsync_threads
+    recorder.close()
+
+    assert (os.path.getsize(recorder.path) - HEADER.size) == COUNT * RECORD.size
+    with open(recorder.path + LINES_SUFFIX) as f:
+        assert len(f.readlines()) == COUNT // 100
@@ -0,0 +1,39 @@
+"""
+Wiedergabe: close() mitten in einer Echtzeit-Pause
+"""
+
+import threading
+import time
+
+from models.vehicle import VehicleSnapshot
+from telemetry.recorder import TelemetryRecorder
+from telemetry.replay import ReplaySource
+
+STEP_NS = 10_000_000_000   # 10 s zwischen zwei Datensätzen
+
+
+def test_close_during_realtime_wait(tmp_path):
+    path = str(tmp_path / 'trip.obd2rec')
+    recorder = TelemetryRecorder(path)
+    for i in range(5):
+        recorder.record(VehicleSnapshot(rpm=1000 + i, timestamp_ns=(i + 1) * STEP_NS))
+    recorder.close()
+
+    source = ReplaySource(path, speed=1.0)
+    received = []
+    first = threading.Event()
+
+    def on_snapshot(snapshot):
+        received.append(snapshot)
+        first.set()
+
+    source.on_snapshot = on_snapshot
+    source.start()
+    assert first.wait(5.0)
+
+    # Der Thread wartet jetzt 10 s auf den nächsten Datensatz
+    start = time.perf_counter()
+    source.close()
+    assert time.perf_counter() - start < 1.0
+    assert not source.thread.is_alive()
+    assert [s.rpm for s in received] == [1000]
@@ -0,0 +1,43 @@
+"""
+Fahrzyklen: ein Szenario und ein kleiner Parameter-Sweep
+"""
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from simulator.scenarios import (  # noqa: E402
+    SAMPLE_MS, SCENARIOS, Scenario, evaluate, sweep
+)
+
+SHORT = {'name': 'kurz', 'profile': [(0, 0), (3, 0), (20, 60), (40, 60), (50, 0)]}
+
+
+def test_launch_scenario():
+    scenario = SCENARIOS['launch']
+    metrics = evaluate(scenario)
+
+    assert metrics['duration_s'] == pytest.approx(scenario.duration, abs=SAMPLE_MS / 1000.0)
+    # Vier SHIFT_UP-Befehle nach Uhr, kein Fahrer, der zurückschaltet
+    assert metrics['shifts_up'] == 4
+    assert metrics['shifts_down'] == 0
+    assert metrics['tracking_error_kmh'] == 0.0
+    assert metrics['speed_max'] > 0
+    assert metrics['distance_km'] > 0
+    assert 0.0 <= metrics['high_rpm_pct'] <= 100.0
+
+
+def test_two_point_sweep():
+    space = {'shift_up_base': [1800, 2600]}
+    rows = sweep(space, [SHORT], workers=1)
+
+    assert [params for params, _ in rows] == [{'shift_up_base': 1800}, {'shift_up_base': 2600}]
+    for params, results in rows:
+        assert list(results) == ['kurz']
+        # Worker-Ergebnis = direkter Lauf mit denselben Parametern (deterministisch)
+        assert results['kurz'] == evaluate(Scenario.from_dict(SHORT), params)
+
+    low, high = (results['kurz'] for _, results in rows)
+    # Spätere Schaltempfehlung -> nicht mehr Hochschaltungen
+    assert low['shift_up_recommendations'] >= high['shift_up_recommendations']
+    assert low['shifts_up'] >= high['shifts_up']
@@ -0,0 +1,89 @@
+"""
+Durchsatz des SerialHandlers am virtuellen Arduino (Pseudo-Terminal)
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from communication.serial_handler import SerialHandler
+from simulator.fake_arduino import FakeArduino
+from telemetry.recorder import TelemetryRecorder
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Pseudo-Terminal nur unter POSIX")
+
+CONNECT_TIMEOUT = 10.0
+MEASURE_S = 1.0
+
+
+def _measure(tmp_path, binary):
+    """Verbindet SerialHandler mit einem ungebremsten FakeArduino -> (Snapshots/s, Decoder)"""
+    device = FakeArduino(speed=None)
+    port = device.start()
+    handler = SerialHandler(port=port, binary=binary)
+    handler.discovery.cache_file = str(tmp_path / 'port.json')
+
+    count = [0]
+    ready = threading.Event()
+
+    def on_snapshot(snapshot):
+        count[0] += 1
+
+    def on_connection_changed(connected, message):
+        if connected and handler.binary == binary:
+            ready.set()
+
+    handler.on_snapshot = on_snapshot
+    handler.on_connection_changed = on_connection_changed
+    handler.start()
+    try:
+        assert ready.wait(CONNECT_TIMEOUT), "keine Verbindung zum virtuellen Arduino"
+        before = count[0]
+        start = time.perf_counter()
+        time.sleep(MEASURE_S)
+        rate = (count[0] - before) / (time.perf_counter() - start)
+    finally:
+        handler.stop()
+        device.stop()
+    return rate, handler.decoder
+
+
+def test_text_protocol_throughput(tmp_path):
+    # Echte Hardware liefert 10 Blöcke/s - ungebremst muss ein Vielfaches durchgehen
+    rate, decoder = _measure(tmp_path, binary=False)
+    assert rate > 1000
+    assert decoder.frame_errors == 0
+
+
+def test_binary_protocol_throughput(tmp_path):
+    rate, decoder = _measure(tmp_path, binary=True)
+    assert rate > 2000
+    assert decoder.frame_errors == 0
+    assert decoder.frames_lost == 0
+
+
+def test_stop_joins_serial_thread(tmp_path):
+    # Nach stop() darf kein Callback mehr laufen - der Recorder wird direkt danach geschlossen
+    device = FakeArduino(speed=None)
+    handler = SerialHandler(port=device.start(), binary=True)
+    handler.discovery.cache_file = str(tmp_path / 'port.json')
+    recorder = TelemetryRecorder(str(tmp_path / 'trip.obd2rec'))
+    first = threading.Event()
+
+    def on_snapshot(snapshot):
+        recorder.record(snapshot)
+        first.set()
+
+    handler.on_snapshot = on_snapshot
+    handler.start()
+    try:
+        assert first.wait(CONNECT_TIMEOUT), "keine Verbindung zum virtuellen Arduino"
+        time.sleep(0.1)
+    finally:
+        handler.stop()
+        device.stop()
+    assert not handler.thread.is_alive()
+    recorder.close()
+    assert recorder.records > 0
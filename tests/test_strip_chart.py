@@ -0,0 +1,74 @@
+"""
+Verlaufsanzeige: jeder Snapshot landet in den min/max-Eimern, gezeichnet wird im GUI-Takt
+"""
+
+import pytest
+
+dashboard = pytest.importorskip('gui.dashboard')
+
+from models.history import VehicleHistory  # noqa: E402
+from models.vehicle import VehicleSnapshot  # noqa: E402
+
+STEP_NS = 10_000_000    # 100 Hz
+
+
+class _Canvas:
+    """Ersatz für tk.Canvas - das Diagramm braucht nur Linien-IDs"""
+
+    def __init__(self, *args, **options):
+        self._items = 0
+
+    def create_line(self, *coords, **options):
+        self._items += 1
+        return self._items
+
+    def bind(self, *args):
+        pass
+
+
+class _Renderer:
+    def __init__(self):
+        self.coords_calls = {}
+
+    def coords(self, canvas, item, *coords):
+        self.coords_calls[item] = coords
+
+
+@pytest.fixture
+def chart(monkeypatch):
+    monkeypatch.setattr(dashboard.tk, 'Canvas', _Canvas)
+    renderer = _Renderer()
+    chart = dashboard.StripChart(None, renderer, VehicleHistory(capacity=1000),
+                                 seconds=10, width=100, height=104)
+    return chart, renderer
+
+
+def _line_values(chart, renderer, name):
+    """Koordinaten einer Linie -> Signalwerte (aus y zurückgerechnet)"""
+    full_scale, _ = chart.SIGNALS[name]
+    scale = (chart.height - 4) / full_scale
+    ys = renderer.coords_calls[chart.lines[name]][1::2]
+    return [round((chart.height - 2 - y) / scale) for y in ys]
+
+
+def test_short_spike_survives_between_renders(chart):
+    chart, renderer = chart
+    # 2 s mit 100 Hz, ein einzelner Ausreißer - gezeichnet wird nur einmal am Ende
+    for i in range(200):
+        rpm = 6900 if i == 123 else 2000
+        chart.add(VehicleSnapshot(rpm=rpm, timestamp_ns=i * STEP_NS))
+    chart.render()
+    values = _line_values(chart, renderer, 'rpm')
+    assert max(values) == 6900
+    assert min(values) == 2000
+    # 10 s auf 100 px: ein Eimer pro 100 ms -> 20 Eimer für 2 s, je min und max
+    assert len(values) == 20 * 2
+
+
+def test_render_only_when_new_data(chart):
+    chart, renderer = chart
+    chart.add(VehicleSnapshot(rpm=1000, timestamp_ns=0))
+    chart.render()
+    renderer.coords_calls.clear()
+    chart.render()
+    assert not renderer.coords_calls
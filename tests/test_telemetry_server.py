@@ -0,0 +1,51 @@
+"""
+Telemetrie-Verteiler am virtuellen Arduino
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from communication.async_link import AsyncSerialLink
+from communication.port_discovery import PortDiscovery
+from simulator.fake_arduino import FakeArduino
+from telemetry.server import TelemetryClient, TelemetryServer
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="Pseudo-Terminal nur unter POSIX")
+
+TIMEOUT = 10.0
+
+
+@pytest.fixture
+def device():
+    device = FakeArduino()
+    device.start()
+    yield device
+    device.stop()
+
+
+def _server(device, tmp_path):
+    discovery = PortDiscovery(cache_file=str(tmp_path / 'port.json'))
+    return TelemetryServer(AsyncSerialLink(device.port, discovery=discovery), host='127.0.0.1', port=0)
+
+
+def test_close_with_connected_client(device, tmp_path):
+    async def run():
+        server = await _server(device, tmp_path).start()
+        client = await TelemetryClient(port=server.port).connect()
+        # Verbindung steht und Daten fließen
+        snapshot = await asyncio.wait_for(client.__anext__(), TIMEOUT)
+        assert snapshot.rpm >= 0
+        assert len(server.clients) == 1
+
+        # Darf nicht auf den noch verbundenen Client warten (Python >= 3.12)
+        await asyncio.wait_for(server.close(), TIMEOUT)
+        assert not server.clients
+        assert not server._handlers
+        # Der Client sieht das Verbindungsende
+        await asyncio.wait_for(client.reader.read(), TIMEOUT)
+        assert client.reader.at_eof()
+        await client.close()
+
+    asyncio.run(run())